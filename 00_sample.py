@@ -7,8 +7,10 @@
 import streamlit as st  # pip install streamlit
 import pandas as pd  # pip install pandas
 import base64  # Standard Python Module
-import numpy as np
+import hashlib  # Standard Python Module
+import os  # Standard Python Module
 from io import StringIO, BytesIO  # Standard Python Module
+from grade_cut import compute_cut_table, read_admissions_excel
 
 
 
@@ -25,11 +27,31 @@ def generate_excel_download_link(df):
     return st.markdown(href, unsafe_allow_html=True)
 
 
-def percentile(n):
-    def percentile_(x):
-        return np.percentile(x, n)
-    percentile_.__name__ = '상위_%s' % n
-    return percentile_
+PREVIEW_ROWS = 100
+UPLOAD_CACHE_DIR = os.path.join('.cache', 'uploads')
+# 읽는 방식이 바뀌면 값을 올려서 이전 Parquet 캐시를 쓰지 않게 함 (v2: 빈 칸을 'nan' 대신 결측으로 저장)
+UPLOAD_CACHE_VERSION = 2
+
+
+@st.cache_resource(show_spinner='엑셀 파일을 읽는 중...')
+def load_upload(file_hash, _data):
+    # 같은 파일은 한 번만 파싱: 메모리 캐시 → Parquet 캐시 → 엑셀 순서로 읽음
+    # cache_resource는 재실행마다 프레임 전체를 복사(역직렬화)하지 않고 같은 객체를 돌려줌 (읽기 전용으로 사용)
+    path = os.path.join(UPLOAD_CACHE_DIR, f'{file_hash}_v{UPLOAD_CACHE_VERSION}.parquet')
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+
+    df = read_admissions_excel(BytesIO(_data))
+    os.makedirs(UPLOAD_CACHE_DIR, exist_ok=True)
+    df.to_parquet(f'{path}.tmp', index=False)
+    os.replace(f'{path}.tmp', path)
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def load_cut_table(file_hash, _df):
+    # 업로드 파일 해시가 같으면 다시 계산하지 않음 (_df는 해시 대상에서 제외)
+    return compute_cut_table(_df)
 
 
 
@@ -40,24 +62,28 @@ st.subheader('Feed me with your Excel file')
 uploaded_file = st.file_uploader('XLSX 형식의 파일을 올려주세요', type='xlsx')
 if uploaded_file:
     st.markdown('전형명, 모집단위(코드포함), 등록여부, 산출등급')
-    df = pd.read_excel(uploaded_file, engine='openpyxl')
-    st.dataframe(df)
-    
-    df.columns=['전형명','모집단위','등록여부','산출등급']
+    data = uploaded_file.getvalue()
+    file_hash = hashlib.sha256(data).hexdigest()
+    df = load_upload(file_hash, data)
+
+    # 미리보기는 앞부분만 표시
+    st.dataframe(df.head(PREVIEW_ROWS))
+    st.caption(f'전체 {len(df):,}행 중 {min(len(df), PREVIEW_ROWS):,}행 미리보기')
     
-    choice = df['전형명'].unique()
+    # 전형명이 빈 칸인 행은 선택지에서 뺌
+    choice = df['전형명'].dropna().unique()
     
     
     choice_column = st.selectbox('선택해주세요',choice, )
     
-    df0 = df[df['등록여부'] == '입학자']
-    
-    
-    df1 = df0[df0['전형명'] == choice_column]
-    
+    cut_table = load_cut_table(file_hash, df)
     
     
-    dfc = df1.groupby(['모집단위'])['산출등급'].agg([np.min,np.mean,percentile(50),percentile(70),percentile(80),percentile(90),np.max])
+    # 선택이 바뀌면 미리 계산한 표에서 꺼내기만 함
+    if choice_column in cut_table.index.get_level_values('전형명'):
+        dfc = cut_table.loc[choice_column]
+    else:
+        dfc = cut_table.iloc[0:0].droplevel('전형명')
     
     dfc1 = dfc.reset_index()
     
@@ -0,0 +1,108 @@
+from typing import Any, Dict, List, Optional, Union, get_args, get_origin
+
+from pydantic import BaseModel, Field
+
+# API 요청/응답 모델
+# 응답 모델은 문서(OpenAPI)와 타입 정의용입니다. 핸들러는 직렬화된 Response를 직접 반환하므로
+# 큰 목록을 응답할 때 FastAPI의 검증/변환 단계를 거치지 않습니다.
+
+
+class SchoolInfo(BaseModel):
+    """학교 한 곳의 기본 정보"""
+    schoolName: str = Field(..., description="학교명")
+    schoolType: str = Field(..., description="학교 종류")
+    location: str = Field(..., description="소재지와 시도교육청")
+    foundation: str = Field(..., description="설립 구분")
+    studentCount: str = Field(..., description="남녀공학 구분")
+    teacherCount: str = Field(..., description="주야 구분")
+
+
+# Arrow IPC 컬럼 타입 (그 밖의 타입은 문자열)
+ARROW_TYPES = {float: "double", int: "int64", bool: "bool"}
+
+
+def arrow_columns(model) -> dict:
+    """모델 필드 순서대로 {필드명: Arrow 타입 이름}을 만듭니다. Optional 필드는 내부 타입을 사용합니다."""
+    columns = {}
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        if get_origin(annotation) is Union:
+            annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+        columns[name] = ARROW_TYPES.get(annotation, "string")
+    return columns
+
+
+# Arrow IPC 응답의 컬럼 순서와 타입
+SCHOOL_INFO_COLUMNS = arrow_columns(SchoolInfo)
+
+
+class OfficeError(BaseModel):
+    """교육청별 분할 조회에서 실패한 교육청"""
+    office: str
+    error: str
+
+
+class SchoolInfoResponse(BaseModel):
+    """학교 정보 조회 결과"""
+    schools: List[SchoolInfo]
+    totalCount: int
+    page: Optional[int] = None
+    pageSize: Optional[int] = None
+    source: Optional[str] = Field(None, description="스냅샷에서 응답했으면 snapshot")
+    syncedAt: Optional[float] = Field(None, description="스냅샷 동기화 시각 (Unix time)")
+    errors: Optional[List[OfficeError]] = None
+    stale: Optional[bool] = Field(None, description="업스트림 장애로 만료된 캐시를 응답했으면 true")
+
+
+class BatchItemError(BaseModel):
+    """일괄 조회에서 실패한 이름의 오류"""
+    error: str
+    status: int
+
+
+class SchoolBatchRequest(BaseModel):
+    """여러 학교 이름 일괄 조회 요청"""
+    names: List[str] = Field(..., min_length=1, description="조회할 학교 이름 목록 (최대 BATCH_MAX_NAMES개)")
+    offices: Optional[List[str]] = Field(None, description="시도교육청 코드 목록 (all 또는 B10 등)")
+    match: str = Field("contains", pattern="^(contains|prefix)$", description="이름 검색 방식 (스냅샷 조회 시 적용)")
+    live: bool = Field(False, description="스냅샷 대신 NEIS를 직접 조회")
+
+
+class SchoolBatchResponse(BaseModel):
+    """여러 학교 이름 일괄 조회 결과"""
+    results: Dict[str, Union[SchoolInfoResponse, BatchItemError]]
+    count: int = Field(..., description="실제로 조회한 (중복 제거된) 이름 수")
+    failed: int = Field(..., description="조회에 실패한 이름 수")
+
+
+class NearbySchool(BaseModel):
+    """위치 기반 검색으로 찾은 학교"""
+    schoolCode: str = Field(..., description="학교알리미 학교 코드")
+    schoolName: str = Field(..., description="학교명")
+    schoolType: str = Field(..., description="학교급")
+    office: str = Field(..., description="시도교육청")
+    address: str = Field(..., description="도로명 주소")
+    lat: float = Field(..., description="위도")
+    lon: float = Field(..., description="경도")
+    distanceKm: float = Field(..., description="검색 지점까지의 거리(km)")
+
+
+NEARBY_SCHOOL_COLUMNS = arrow_columns(NearbySchool)
+
+
+class NearbyResponse(BaseModel):
+    """위치 기반 학교 검색 결과 (가까운 순서)"""
+    schools: List[NearbySchool]
+    count: int
+    syncedAt: Optional[float] = Field(None, description="위치 색인 동기화 시각 (Unix time)")
+
+
+class SchoolProfileResponse(BaseModel):
+    """학교 한 곳의 공시 데이터 (학교알리미 데이터셋 12종을 학교코드로 조인한 결과)"""
+    schoolCode: str = Field(..., description="학교알리미 학교 코드")
+    year: str = Field(..., description="공시 연도")
+    school: Dict[str, Any] = Field(..., description="학교 식별 정보 (시도교육청, 학교명, 설립구분 등)")
+    datasets: Dict[str, Optional[Dict[str, Any]]] = Field(
+        ..., description="데이터셋 이름별 공시 값 (해당 공시에 학교가 없으면 null)"
+    )
+    syncedAt: Optional[float] = Field(None, description="프로필 테이블을 만든 시각 (Unix time)")
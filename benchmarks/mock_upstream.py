@@ -0,0 +1,224 @@
+import asyncio
+import argparse
+import json
+import os
+import random
+import sys
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from school_schemas import COORD, DATE, FLOAT, INT, get_schema  # noqa: E402
+
+# NEIS schoolInfo와 학교알리미 apiType 엔드포인트를 흉내 내는 로컬 서버
+# benchmarks/fixtures/ 에 기록된 응답이 있으면 그대로 재생하고, 없으면 합성 데이터를 만듭니다.
+#
+#   python benchmarks/mock_upstream.py serve --port 9000 --latency-ms 80 --error-rate 0.01
+#   python benchmarks/mock_upstream.py record      # 실제 API 응답을 fixtures/에 기록 (API_KEY, BASE_URL 필요)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+NEIS_FIXTURE = 'neis_schoolInfo.json'
+
+OFFICES = {
+    'B10': '서울특별시교육청', 'C10': '부산광역시교육청', 'D10': '대구광역시교육청', 'E10': '인천광역시교육청',
+    'F10': '광주광역시교육청', 'G10': '대전광역시교육청', 'H10': '울산광역시교육청', 'I10': '세종특별자치시교육청',
+    'J10': '경기도교육청', 'K10': '강원도교육청', 'M10': '충청북도교육청', 'N10': '충청남도교육청',
+    'P10': '전라북도교육청', 'Q10': '전라남도교육청', 'R10': '경상북도교육청', 'S10': '경상남도교육청',
+    'T10': '제주특별자치도교육청',
+}
+NAME_PARTS = ['한국', '서울', '부산', '대한', '중앙', '미래', '한빛', '새솔', '푸른', '동산']
+
+
+def load_fixture(name, fixtures_dir=FIXTURES_DIR):
+    path = os.path.join(fixtures_dir, name)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def synthetic_neis_rows(count, seed=0):
+    """NEIS schoolInfo 형식의 합성 고등학교 목록을 만듭니다."""
+    rng = random.Random(seed)
+    codes = list(OFFICES)
+    rows = []
+    for i in range(count):
+        code = codes[i % len(codes)]
+        rows.append({
+            'ATPT_OFCDC_SC_CODE': code,
+            'ATPT_OFCDC_SC_NM': OFFICES[code],
+            'SD_SCHUL_CODE': f'{7000000 + i}',
+            'SCHUL_NM': f'{rng.choice(NAME_PARTS)}{rng.choice(NAME_PARTS)}고등학교',
+            'SCHUL_KND_SC_NM': '고등학교',
+            'LCTN_SC_NM': OFFICES[code][:2],
+            'FOND_SC_NM': rng.choice(['공립', '사립', '국립']),
+            'COEDU_SC_NM': rng.choice(['남여공학', '남', '여']),
+            'HGHT_SC_NM': '주간',
+        })
+    return rows
+
+
+def synthetic_alimi_rows(api_type, school_type, count, seed=0):
+    """학교알리미 apiType 응답 형식의 합성 데이터를 스키마에 맞춰 만듭니다."""
+    rng = random.Random(f'{seed}-{api_type}-{school_type}')
+    schema = get_schema(api_type)
+    codes = list(OFFICES)
+    rows = []
+    for i in range(count):
+        code = codes[i % len(codes)]
+        row = {}
+        for column, (_, dtype) in schema.items():
+            if dtype == INT:
+                value = str(rng.randint(0, 400))
+            elif dtype == FLOAT:
+                value = f'{rng.uniform(0, 40):.1f}'
+            elif dtype == COORD:
+                value = f'{rng.uniform(33.2, 38.5):.6f}' if column == 'LTTUD' else f'{rng.uniform(126.0, 129.5):.6f}'
+            elif dtype == DATE:
+                value = f'{rng.randint(1950, 2020)}0301'
+            else:
+                value = f'{column}_{rng.randint(0, 20)}'
+            row[column] = value
+        row.update({
+            'ATPT_OFCDC_ORG_CODE': code,
+            'ATPT_OFCDC_ORG_NM': OFFICES[code],
+            'JU_ORG_NM': f'{OFFICES[code][:2]}{i % 9}교육지원청',
+            'ADRCD_NM': f'{OFFICES[code][:2]} {i % 25}구',
+            'FOND_SC_CODE': rng.choice(['공립', '사립', '국립']),
+            'SCHUL_CODE': f'S{school_type}{i:06d}',
+            'SCHUL_NM': f'{rng.choice(NAME_PARTS)}학교{i}',
+            'SCHUL_KND_SC_CODE': school_type,
+        })
+        rows.append(row)
+    return rows
+
+
+def create_app(latency_ms=50.0, jitter_ms=10.0, error_rate=0.0, school_count=2500,
+               alimi_rows=2000, fixtures_dir=FIXTURES_DIR):
+    """지연 시간, 오류율, 데이터 크기를 설정할 수 있는 모의 업스트림 앱을 만듭니다."""
+    app = FastAPI(title='Mock NEIS / 학교알리미')
+    rng = random.Random(0)
+    neis_rows = load_fixture(NEIS_FIXTURE, fixtures_dir) or synthetic_neis_rows(school_count)
+    alimi_cache = {}
+
+    async def simulate():
+        # 설정한 지연 시간만큼 기다리고, error_rate 확률로 503을 돌려줍니다.
+        delay = max(0.0, latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000
+        if delay:
+            await asyncio.sleep(delay)
+        if error_rate and rng.random() < error_rate:
+            return JSONResponse({'message': 'mock upstream error'}, status_code=503)
+        return None
+
+    @app.get('/hub/schoolInfo')
+    async def neis_school_info(request: Request):
+        error = await simulate()
+        if error is not None:
+            return error
+
+        params = request.query_params
+        rows = neis_rows
+        if params.get('ATPT_OFCDC_SC_CODE'):
+            rows = [row for row in rows if row['ATPT_OFCDC_SC_CODE'] == params['ATPT_OFCDC_SC_CODE']]
+        if params.get('SCHUL_NM'):
+            rows = [row for row in rows if params['SCHUL_NM'] in row['SCHUL_NM']]
+        if not rows:
+            return {'RESULT': {'CODE': 'INFO-200', 'MESSAGE': '해당하는 데이터가 없습니다.'}}
+
+        page_index = int(params.get('pIndex', 1))
+        page_size = int(params.get('pSize', 100))
+        page = rows[(page_index - 1) * page_size:page_index * page_size]
+        return {'schoolInfo': [
+            {'head': [{'list_total_count': len(rows)}, {'RESULT': {'CODE': 'INFO-000', 'MESSAGE': '정상 처리되었습니다.'}}]},
+            {'row': page},
+        ]}
+
+    @app.get('/api')
+    async def alimi(apiType: str, schulKndCode: str, pbanYr: str = '2024'):
+        error = await simulate()
+        if error is not None:
+            return error
+
+        key = (apiType, schulKndCode)
+        if key not in alimi_cache:
+            alimi_cache[key] = (
+                load_fixture(f'alimi_{apiType}_{schulKndCode}.json', fixtures_dir)
+                or synthetic_alimi_rows(apiType, schulKndCode, alimi_rows)
+            )
+        return {'resultCode': 'success', 'list': alimi_cache[key]}
+
+    return app
+
+
+def record_fixtures(fixtures_dir=FIXTURES_DIR):
+    """실제 API 응답을 fixtures/에 기록합니다."""
+    import httpx
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    api_key = os.getenv('API_KEY')
+    base_url = os.getenv('BASE_URL')
+    os.makedirs(fixtures_dir, exist_ok=True)
+
+    with httpx.Client(verify=False, timeout=120) as client:
+        rows, page_index = [], 1
+        while True:
+            response = client.get('https://open.neis.go.kr/hub/schoolInfo', params={
+                'KEY': api_key, 'Type': 'json', 'pIndex': page_index, 'pSize': 1000, 'SCHUL_KND_SC_NM': '고등학교'
+            })
+            data = response.json()
+            if 'schoolInfo' not in data:
+                break
+            rows.extend(data['schoolInfo'][1]['row'])
+            if len(rows) >= data['schoolInfo'][0]['head'][0]['list_total_count']:
+                break
+            page_index += 1
+        with open(os.path.join(fixtures_dir, NEIS_FIXTURE), 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False)
+        print(f'{NEIS_FIXTURE}: {len(rows)}행')
+
+        from test_api import API_TYPES, SCHOOL_TYPES
+        for api_type in API_TYPES.values():
+            for school_type in SCHOOL_TYPES.values():
+                url = f'{base_url}?apiKey={api_key}&apiType={api_type}&pbanYr=2024&schulKndCode={school_type}'
+                data = client.get(url).json()
+                if data.get('resultCode') != 'success':
+                    print(f'alimi_{api_type}_{school_type}: 데이터 없음')
+                    continue
+                name = f'alimi_{api_type}_{school_type}.json'
+                with open(os.path.join(fixtures_dir, name), 'w', encoding='utf-8') as f:
+                    json.dump(data['list'], f, ensure_ascii=False)
+                print(f"{name}: {len(data['list'])}행")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NEIS / 학교알리미 모의 업스트림 서버')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve = subparsers.add_parser('serve', help='모의 서버 실행')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=9000)
+    serve.add_argument('--latency-ms', type=float, default=50.0)
+    serve.add_argument('--jitter-ms', type=float, default=10.0)
+    serve.add_argument('--error-rate', type=float, default=0.0)
+    serve.add_argument('--school-count', type=int, default=2500, help='합성 NEIS 학교 수 (페이지 수 결정)')
+    serve.add_argument('--alimi-rows', type=int, default=2000, help='합성 학교알리미 응답 행 수')
+
+    subparsers.add_parser('record', help='실제 API 응답을 fixtures/에 기록')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record_fixtures()
+        return
+
+    import uvicorn
+    uvicorn.run(create_app(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        school_count=args.school_count, alimi_rows=args.alimi_rows
+    ), host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
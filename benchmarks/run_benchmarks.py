@@ -0,0 +1,318 @@
+import asyncio
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import httpx
+import numpy as np
+import pandas as pd
+import uvicorn
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from mock_upstream import NAME_PARTS, create_app  # noqa: E402
+
+# 모의 업스트림(mock_upstream.py)을 띄워 놓고 API 서버, 대시보드 데이터 처리, 등급컷 계산의
+# 처리량과 지연 시간, 메모리를 측정합니다. 실제 API 키나 네트워크 없이 실행됩니다.
+#
+#   python benchmarks/run_benchmarks.py
+#   python benchmarks/run_benchmarks.py --only api --requests 2000 --concurrency 100 -o before.json
+
+SUITES = ['api', 'dashboard', 'grade_cut']
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app, port):
+    """uvicorn 서버를 백그라운드 스레드에서 실행하고 준비될 때까지 기다립니다."""
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning', access_log=False))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError(f'서버 시작 실패 (port {port})')
+        time.sleep(0.05)
+    return server, thread
+
+
+def stop_server(server, thread):
+    server.should_exit = True
+    thread.join(timeout=10)
+
+
+def summarize_latencies(latencies, elapsed, errors):
+    values = np.array(latencies) * 1000 if latencies else np.array([0.0])
+    return {
+        'requests': len(latencies) + errors,
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'p50Ms': round(float(np.percentile(values, 50)), 2),
+        'p90Ms': round(float(np.percentile(values, 90)), 2),
+        'p99Ms': round(float(np.percentile(values, 99)), 2),
+        'maxMs': round(float(values.max()), 2),
+    }
+
+
+async def run_load(base_url, paths, concurrency):
+    """paths를 concurrency개의 동시 요청으로 보내고 지연 시간 분포를 구합니다."""
+    latencies = []
+    errors = 0
+    queue = iter(paths)
+
+    async def worker(client):
+        nonlocal errors
+        for path in queue:
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return summarize_latencies(latencies, elapsed, errors)
+
+
+def school_name_queries(count):
+    names = [f'{a}{b}' for a in NAME_PARTS for b in NAME_PARTS]
+    return [names[i % len(names)] for i in range(count)]
+
+
+def bench_api(args):
+    """/api/school-info를 스냅샷, 캐시 적중, 캐시 미사용 경로로 나누어 측정하고 /api/schools/nearby도 측정합니다."""
+    import main
+
+    logging.getLogger('main').setLevel(logging.WARNING)
+    port = free_port()
+    server, thread = start_server(main.app, port)
+    base_url = f'http://127.0.0.1:{port}'
+    results = {}
+    try:
+        deadline = time.monotonic() + 60
+        while main.app.state.school_index is None:
+            if time.monotonic() > deadline:
+                raise RuntimeError('스냅샷 동기화가 60초 안에 끝나지 않았습니다.')
+            time.sleep(0.1)
+
+        queries = school_name_queries(args.requests)
+        snapshot_paths = [f'/api/school-info?school_name={name}' for name in queries]
+        live_paths = [f'{path}&live=true' for path in snapshot_paths]
+
+        results['snapshot'] = asyncio.run(run_load(base_url, snapshot_paths, args.concurrency))
+
+        # 위치 기반 검색 (학교알리미 학교기본정보로 만든 격자 색인)
+        while main.app.state.geo_index is None:
+            if time.monotonic() > deadline:
+                raise RuntimeError('위치 색인 동기화가 60초 안에 끝나지 않았습니다.')
+            time.sleep(0.1)
+        rng = random.Random(0)
+        nearby_paths = [
+            f'/api/schools/nearby?lat={rng.uniform(33.2, 38.5):.5f}&lon={rng.uniform(126.0, 129.5):.5f}&k=20'
+            for _ in range(args.requests)
+        ]
+        results['nearby'] = asyncio.run(run_load(base_url, nearby_paths, args.concurrency))
+
+        # 캐시를 미리 채운 뒤 같은 질의를 반복
+        main.response_cache.clear()
+        asyncio.run(run_load(base_url, sorted(set(live_paths)), args.concurrency))
+        results['cached'] = asyncio.run(run_load(base_url, live_paths, args.concurrency))
+
+        # TTL 0: 모든 요청이 업스트림까지 감 (동시에 들어온 같은 질의는 싱글 플라이트로 합쳐짐)
+        main.response_cache.clear()
+        ttl, negative_ttl = main.response_cache.ttl, main.response_cache.negative_ttl
+        main.response_cache.ttl = main.response_cache.negative_ttl = 0
+        try:
+            results['uncached'] = asyncio.run(run_load(base_url, live_paths, args.concurrency))
+        finally:
+            main.response_cache.ttl, main.response_cache.negative_ttl = ttl, negative_ttl
+
+        # 전체 목록 조회 (NEIS 페이지를 모두 받아 합치는 경로)
+        main.response_cache.clear()
+        main.response_cache.ttl = main.response_cache.negative_ttl = 0
+        try:
+            full_paths = ['/api/school-info?live=true'] * max(1, args.requests // 20)
+            results['uncachedFullList'] = asyncio.run(run_load(base_url, full_paths, 1))
+        finally:
+            main.response_cache.ttl, main.response_cache.negative_ttl = ttl, negative_ttl
+
+        results['cacheStats'] = main.response_cache.stats()
+    finally:
+        stop_server(server, thread)
+    return results
+
+
+def bench_dashboard(args):
+    """API 타입별로 다운로드 + 타입 변환 시간과 변환 전후 메모리를 측정합니다."""
+    import requests
+    import dashboard
+
+    # streamlit을 import하면 로깅 설정이 바뀌어 모의 서버 접근 로그가 출력되므로 다시 끔
+    for name in ('uvicorn', 'uvicorn.access', 'uvicorn.error'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    results = {}
+    with requests.Session() as session:
+        for api_name, api_type in dashboard.API_TYPES.items():
+            started = time.perf_counter()
+            raw = dashboard.download_school_data(api_type, '04', 2024, session=session)
+            downloaded = time.perf_counter()
+            typed = dashboard.translate_columns(raw.copy(), api_type)
+            finished = time.perf_counter()
+
+            # 시간 측정과 분리하여 타입 변환 중 최대 메모리 사용량만 따로 추적
+            tracemalloc.start()
+            dashboard.translate_columns(raw.copy(), api_type)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            raw_bytes = int(raw.memory_usage(deep=True).sum())
+            typed_bytes = int(typed.memory_usage(deep=True).sum())
+            results[api_type] = {
+                'name': api_name,
+                'rows': len(raw),
+                'downloadMs': round((downloaded - started) * 1000, 1),
+                'translateMs': round((finished - downloaded) * 1000, 1),
+                'rawBytes': raw_bytes,
+                'typedBytes': typed_bytes,
+                'memoryRatio': round(raw_bytes / typed_bytes, 2) if typed_bytes else None,
+                'translatePeakBytes': peak,
+            }
+    return results
+
+
+def make_admissions_frame(rows, seed=0):
+    """등급컷 계산용 합성 입시결과 (전형 10개 × 모집단위 200개)"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        '전형명': pd.Series(rng.integers(0, 10, rows)).map(lambda i: f'전형{i}').astype('string'),
+        '모집단위': pd.Series(rng.integers(0, 200, rows)).map(lambda i: f'학과{i:03d}').astype('string'),
+        '등록여부': pd.Series(np.where(rng.random(rows) < 0.6, '입학자', '미등록')).astype('string'),
+        '산출등급': rng.uniform(1, 9, rows).round(2),
+    })
+
+
+def bench_grade_cut(args):
+    """합성 데이터로 등급컷 계산 시간과 엑셀 읽기 시간을 측정합니다."""
+    from grade_cut import compute_cut_table, excel_engine, read_admissions_excel
+
+    results = {'compute': {}}
+    for rows in args.grade_rows:
+        df = make_admissions_frame(rows)
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            table = compute_cut_table(df)
+            timings.append(time.perf_counter() - started)
+        results['compute'][str(rows)] = {
+            'groups': len(table),
+            'bestMs': round(min(timings) * 1000, 1),
+            'meanMs': round(sum(timings) / len(timings) * 1000, 1),
+        }
+
+    if args.xlsx_rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'admissions.xlsx')
+            make_admissions_frame(args.xlsx_rows).to_excel(path, index=False)
+            started = time.perf_counter()
+            df = read_admissions_excel(path)
+            results['readXlsx'] = {
+                'rows': len(df),
+                'engine': excel_engine(),
+                'ms': round((time.perf_counter() - started) * 1000, 1),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='모의 업스트림을 이용한 오프라인 벤치마크')
+    parser.add_argument('--only', default=','.join(SUITES), help=f"실행할 항목 (쉼표로 구분: {', '.join(SUITES)})")
+    parser.add_argument('--requests', type=int, default=500, help='시나리오별 API 요청 수')
+    parser.add_argument('--concurrency', type=int, default=50, help='동시 요청 수')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='모의 업스트림 응답 지연')
+    parser.add_argument('--jitter-ms', type=float, default=10.0, help='모의 업스트림 지연 편차')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='모의 업스트림 503 비율')
+    parser.add_argument('--school-count', type=int, default=2500, help='합성 NEIS 학교 수')
+    parser.add_argument('--alimi-rows', type=int, default=2000, help='합성 학교알리미 응답 행 수')
+    parser.add_argument('--grade-rows', default='100000,500000', help='등급컷 계산에 사용할 행 수 목록')
+    parser.add_argument('--xlsx-rows', type=int, default=20000, help='엑셀 읽기 측정 행 수 (0이면 생략)')
+    parser.add_argument('--repeat', type=int, default=3, help='등급컷 계산 반복 횟수')
+    parser.add_argument('-o', '--output', help='결과 JSON 파일 (생략 시 표준 출력)')
+    args = parser.parse_args()
+    args.grade_rows = [int(rows) for rows in args.grade_rows.split(',') if rows]
+
+    suites = [suite for suite in args.only.split(',') if suite]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"알 수 없는 항목: {', '.join(sorted(unknown))}")
+
+    mock_port = free_port()
+    mock = start_server(create_app(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        school_count=args.school_count, alimi_rows=args.alimi_rows
+    ), mock_port)
+
+    # main.py, dashboard.py는 import 시점에 설정을 읽으므로 먼저 모의 업스트림 주소로 바꿔 둡니다.
+    snapshot_dir = tempfile.TemporaryDirectory()
+    os.environ.update({
+        'API_KEY': 'benchmark',
+        'NEIS_BASE_URL': f'http://127.0.0.1:{mock_port}/hub/schoolInfo',
+        'BASE_URL': f'http://127.0.0.1:{mock_port}/api',
+        'SNAPSHOT_DB_PATH': os.path.join(snapshot_dir.name, 'school_snapshot.db'),
+        'SNAPSHOT_SHARED_PATH': os.path.join(snapshot_dir.name, 'school_snapshot.arrow'),
+        'SYNC_LEADER_LOCK_PATH': os.path.join(snapshot_dir.name, 'sync_leader.lock'),
+        'GEO_STORE_PATH': os.path.join(snapshot_dir.name, 'school_locations.json'),
+        'PROFILE_STORE_DIR': os.path.join(snapshot_dir.name, 'profiles'),
+        'DASHBOARD_CACHE_DIR': os.path.join(snapshot_dir.name, 'dashboard'),
+    })
+    # 모의 서버에는 호출 한도가 없으므로 따로 지정하지 않으면 토큰 버킷 제한을 끕니다.
+    os.environ.setdefault('UPSTREAM_RATE_LIMIT', '0')
+    # 학교 프로필 테이블(데이터셋 36건 조회)을 미리 만들면 측정 중에 모의 서버 부하가 섞이므로 끕니다.
+    os.environ.setdefault('PROFILE_PREFETCH', 'false')
+
+    report = {
+        'startedAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'only')},
+    }
+    runners = {'api': bench_api, 'dashboard': bench_dashboard, 'grade_cut': bench_grade_cut}
+    try:
+        for suite in suites:
+            print(f'[{suite}] 측정 중...', file=sys.stderr)
+            started = time.perf_counter()
+            report[suite] = runners[suite](args)
+            print(f'[{suite}] 완료 ({time.perf_counter() - started:.1f}초)', file=sys.stderr)
+    finally:
+        stop_server(*mock)
+        snapshot_dir.cleanup()
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f'결과 저장: {args.output}', file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,25 @@
 import streamlit as st
 import requests
 import pandas as pd
-import plotly.express as px
 from dotenv import load_dotenv
 import os
 import json
 import urllib3
-import io
+import time
+import logging
+import threading
+import tempfile
+import math
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from geo_index import GeoIndex
+from rollups import compute_rollups, filter_rows, summarize
+from rollups import EXCLUDED_COLUMNS, ROLLUP_LEVELS
+from school_schemas import API_TYPES, FLOAT, INT, apply_schema, get_schema, load_registry
+from trend_cube import DELTA_SUFFIX, RATE_SUFFIX, SCHOOL_KEY, YEAR_COLUMN, TrendCube, region_trend, school_trend
+
+logger = logging.getLogger(__name__)
 
 # SSL 경고 메시지 비활성화
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -14,26 +27,71 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # .env 파일 로드
 load_dotenv()
 
+def get_setting(name):
+    """Streamlit secrets에 값이 있으면 사용하고, 없으면 환경 변수를 사용합니다."""
+    try:
+        if name in st.secrets:
+            return st.secrets[name]
+    except Exception:
+        # secrets.toml이 없는 환경(벤치마크, 스크립트 실행 등)
+        pass
+    return os.getenv(name)
+
+
 # API 설정
-API_KEY = st.secrets["API_KEY"] if "API_KEY" in st.secrets else os.getenv('API_KEY')
-BASE_URL = st.secrets["BASE_URL"] if "BASE_URL" in st.secrets else os.getenv('BASE_URL')
-
-# API 타입 정의
-API_TYPES = {
-    '학교기본정보': '0',               # 학교기본정보
-    '수업일수 및 수업시수 현황': '08',  # 수업일수 및 수업시수 현황
-    '자유학기제 운영': '04',          # 자유학기제 운영에 관한 사항
-    '학교 현황': '62',               # 학교 현황
-    '성별 학생수': '63',             # 성별 학생수
-    '학년별·학급별 학생수': '09',     # 학년별·학급별 학생수
-    '전·출입 및 학업중단 학생 수': '10', # 전·출입 및 학업중단 학생 수
-    '직위별 교원 현황': '22',         # 직위별 교원 현황
-    '자격종별 교원 현황': '64',       # 자격종별 교원 현황
-    '표시과목별 교원 현황': '24',      # 표시과목별 교원 현황
-    '학교폭력 예방교육 실적': '94',    # 대상별 학교폭력 예방교육 실적
-    '입학생 현황': '51'              # 입학생 현황
+API_KEY = get_setting('API_KEY')
+BASE_URL = get_setting('BASE_URL')
+
+# 캐시 설정 (지난 연도 데이터는 바뀌지 않으므로 만료 없이 보관, 올해 데이터만 TTL 적용)
+CACHE_DIR = os.getenv('DASHBOARD_CACHE_DIR', os.path.join('.cache', 'dashboard'))
+CURRENT_YEAR_TTL = int(os.getenv('DASHBOARD_CURRENT_YEAR_TTL', '3600'))
+
+# 원본 Parquet 캐시는 데이터셋별 공시 연도 파티션으로 쌓이며 추세 조회도 같은 파일을 읽습니다.
+TREND_CUBE = TrendCube(CACHE_DIR, CURRENT_YEAR_TTL)
+
+# 일괄 조회 시 동시에 실행할 최대 요청 수
+BULK_MAX_WORKERS = int(os.getenv('DASHBOARD_BULK_MAX_WORKERS', '8'))
+
+# 조회 가능한 연도
+YEARS = list(range(2024, 2019, -1))
+
+# 시작할 때 미리 받아 둘 데이터셋 (apiType, 쉼표로 구분, 비우면 예열하지 않음)
+# 가장 최근 조회 연도 × 모든 학교급을 백그라운드에서 받아 두므로 첫 사용자가 업스트림 조회를 기다리지 않습니다.
+WARMUP_API_TYPES = [
+    api_type.strip() for api_type in os.getenv('DASHBOARD_WARMUP_API_TYPES', '0').split(',') if api_type.strip()
+]
+
+# 지도 조회 기본 위치 (서울특별시청)
+MAP_DEFAULT_CENTER = (37.5665, 126.9780)
+
+# 위치 색인에 담을 학교기본정보 컬럼
+MAP_COLUMNS = ['정보공시 학교코드', '학교명', '학교급', '시도교육청', '학교도로명 주소', '위도', '경도']
+
+# 내보내기 형식: (확장자, MIME 타입)
+EXPORT_FORMATS = {
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'CSV': ('csv', 'text/csv'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
 }
 
+# 메모리에 올려 둘 (데이터셋, 학교급, 연도) 데이터프레임 수 (가장 오래 쓰지 않은 것부터 뺌)
+MEMORY_CACHE_SIZE = int(os.getenv('DASHBOARD_MEMORY_CACHE_SIZE', '32'))
+
+# 형식별로 만들어 둔 내보내기 파일을 몇 개까지 보관할지
+EXPORT_CACHE_SIZE = int(os.getenv('DASHBOARD_EXPORT_CACHE_SIZE', '8'))
+
+# 파일로 내보낼 때 한 번에 변환해 기록하는 행 수
+EXPORT_CHUNK_ROWS = int(os.getenv('DASHBOARD_EXPORT_CHUNK_ROWS', '5000'))
+
+# 데이터셋별로 만들어 둔 지역별 집계를 몇 개까지 보관할지
+ROLLUP_CACHE_SIZE = int(os.getenv('DASHBOARD_ROLLUP_CACHE_SIZE', '8'))
+
+# 표 한 페이지에 보낼 행 수 선택지 (화면에는 현재 페이지만 전송)
+TABLE_PAGE_SIZES = [25, 50, 100, 200]
+
+# 차트에 표시할 최대 그룹 수 (값이 큰 순서)
+CHART_MAX_GROUPS = 30
+
 # 학교급 코드 정의
 SCHOOL_TYPES = {
     '초등학교': '02',
@@ -41,268 +99,366 @@ SCHOOL_TYPES = {
     '고등학교': '04'
 }
 
-# 컬럼 헤더 한글 매핑
-COLUMN_MAPPINGS = {
-    # 학교기본정보 (0)
-    'ATPT_OFCDC_ORG_NM': '시도교육청',
-    'ATPT_OFCDC_ORG_CODE': '시도교육청코드',
-    'JU_ORG_NM': '교육지원청',
-    'JU_ORG_CODE': '교육지원청코드',
-    'ADRCD_NM': '지역',
-    'ADRCD_CD': '지역코드',
-    'LCTN_SC_CODE': '소재지구분코드',
-    'SCHUL_CODE': '정보공시 학교코드',
-    'SCHUL_NM': '학교명',
-    'SCHUL_KND_SC_CODE': '학교급코드',
-    'FOND_SC_CODE': '설립구분',
-    'HS_KND_SC_NM': '학교특성',
-    'BNHH_YN': '분교여부',
-    'SCHUL_FOND_TYP_CODE': '설립유형',
-    'DGHT_SC_CODE': '주야구분',
-    'FOAS_MEMRD': '개교기념일',
-    'FOND_YMD': '설립일',
-    'ADRCD_ID': '법정동코드',
-    'ADRES_BRKDN': '주소내역',
-    'DTLAD_BRKDN': '상세주소내역',
-    'ZIP_CODE': '우편번호',
-    'SCHUL_RDNZC': '학교도로명 우편번호',
-    'SCHUL_RDNMA': '학교도로명 주소',
-    'SCHUL_RDNDA': '학교도로명 상세주소',
-    'LTTUD': '위도',
-    'LGTUD': '경도',
-    'USER_TELNO': '전화번호',
-    'USER_TELNO_SW': '전화번호(교무실)',
-    'USER_TELNO_GA': '전화번호(행정실)',
-    'PERC_FAXNO': '팩스번호',
-    'HMPG_ADRES': '홈페이지 주소',
-    'COEDU_SC_CODE': '남녀공학 구분',
-    'ABSCH_YN': '폐교여부',
-    'ABSCH_YMD': '폐교일자',
-    'CLOSE_YN': '휴교여부',
-    'SCHUL_CRSE_SC_VALUE': '학교과정구분값(2-3-4)',
-    'SCHUL_CRSE_SC_VALUE_NM': '학교과정구분명(초-중-고)',
-
-    # 수업일수 및 수업시수 현황 (08)
-    'COL_1': '1학년',
-    'COL_2': '2학년',
-    'COL_3': '3학년',
-    'COL_4': '4학년',
-    'COL_5': '5학년',
-    'COL_6': '6학년',
-    'PER_STUDAY_DAY': '주당평균수업시수(교사 1인당)',
-    'WEEK_TOT_ITRT_HR_FGR': '주당수업시수',
-    'ITRT_TCR_TOT_FGR': '수업교원수',
-    'SCHUL_CRSE_SC_CODE_P': '학교과정구분(초등)',
-    'COL_1_P': '1학년(초등)',
-    'COL_2_P': '2학년(초등)',
-    'COL_3_P': '3학년(초등)',
-    'COL_4_P': '4학년(초등)',
-    'COL_5_P': '5학년(초등)',
-    'COL_6_P': '6학년(초등)',
-    'SCHUL_CRSE_SC_CODE_M': '학교과정구분(중등)',
-    'COL_1_M': '1학년(중등)',
-    'COL_2_M': '2학년(중등)',
-    'COL_3_M': '3학년(중등)',
-    'SCHUL_CRSE_SC_CODE_H': '학교과정구분(고등)',
-    'COL_1_H': '1학년(고등)',
-    'COL_2_H': '2학년(고등)',
-    'COL_3_H': '3학년(고등)',
-
-    # 자유학기제 운영 (04)
-    'SCHUL_CRSE_SC_CODE': '학교과정구분코드',
-    'FREE_SEM_DGST': '자유학기 요약',
-    'FREE_SEM_DETAIL': '자유학기 상세내용',
-    
-    # 학교 현황 (62)
-    'COL_1': '1학년',
-    'COL_2': '2학년',
-    'COL_3': '3학년',
-    'COL_4': '4학년',
-    'COL_5': '5학년',
-    'COL_6': '6학년',
-    'COL_7': '7학년',
-    'COL_8': '8학년',
-    'COL_SUM': '학년별 합계',
-    'COL_FGR_SUM': '전체 합계',
-    'AVG_FGR_SUM': '평균',
-    'SP_SUM': '특수학급 합계',
-    'SP_FGR_SUM': '특수학급 전체 합계',
-    
-    # 성별 학생수 (63)
-    'COL_M1': '1학년 남학생수',
-    'COL_M2': '2학년 남학생수',
-    'COL_M3': '3학년 남학생수',
-    'COL_M4': '4학년 남학생수',
-    'COL_M5': '5학년 남학생수',
-    'COL_M6': '6학년 남학생수',
-    'COL_M7': '7학년 남학생수',
-    'COL_M8': '8학년 남학생수',
-    'COL_MSUM': '남학생 총계',
-    'COL_W1': '1학년 여학생수',
-    'COL_W2': '2학년 여학생수',
-    'COL_W3': '3학년 여학생수',
-    'COL_W4': '4학년 여학생수',
-    'COL_W5': '5학년 여학생수',
-    'COL_W6': '6학년 여학생수',
-    'COL_W7': '7학년 여학생수',
-    'COL_W8': '8학년 여학생수',
-    'COL_WSUM': '여학생 총계',
-    'SUM': '전체 학생수',
-    
-    # 학년별·학급별 학생수 (09)
-    'COL_1': '1학년 학생수',
-    'COL_2': '2학년 학생수',
-    'COL_3': '3학년 학생수',
-    'COL_4': '4학년 학생수',
-    'COL_5': '5학년 학생수',
-    'COL_6': '6학년 학생수',
-    'COL_7': '7학년 학생수',
-    'COL_8': '8학년 학생수',
-    'COL_SUM': '전체 학생수',
-    'COL_C1': '1학년 학급수',
-    'COL_C2': '2학년 학급수',
-    'COL_C3': '3학년 학급수',
-    'COL_C4': '4학년 학급수',
-    'COL_C5': '5학년 학급수',
-    'COL_C6': '6학년 학급수',
-    'COL_C7': '7학년 학급수',
-    'COL_C8': '8학년 학급수',
-    'COL_C_SUM': '전체 학급수',
-    'TEACH_CNT': '교원수',
-    'TEACH_CAL': '교원 1인당 학생수',
-    
-    # 전·출입 및 학업중단 학생 수 (10)
-    'COL_211': '초등부1학년 전입학생수',
-    'COL_212': '초등부1학년 전출학생수',
-    'COL_221': '초등부2학년 전입학생수',
-    'COL_222': '초등부2학년 전출학생수',
-    'COL_231': '초등부3학년 전입학생수',
-    'COL_232': '초등부3학년 전출학생수',
-    'COL_241': '초등부4학년 전입학생수',
-    'COL_242': '초등부4학년 전출학생수',
-    'COL_251': '초등부5학년 전입학생수',
-    'COL_252': '초등부5학년 전출학생수',
-    'COL_261': '초등부6학년 전입학생수',
-    'COL_262': '초등부6학년 전출학생수',
-    'MVIN_SUM': '전입학생수(계)',
-    'MVT_SUM': '전출학생수(계)',
-    'STDNT_SUM': '전체학생수(계)',
-    
-    # 직위별 교원 현황 (22)
-    'COL_1': '교장',
-    'COL_2': '교감',
-    'COL_3': '수석교사',
-    'COL_4': '보직교사',
-    'COL_5': '교사',
-    'COL_6': '특수교사',
-    'COL_7': '전문상담교사',
-    'COL_8': '사서교사',
-    'COL_9': '실기교사',
-    'COL_10': '보건교사',
-    'COL_11': '영양교사',
-    'COL_13': '기간제교사',
-    'COL_14': '강사',
-    'COL_15': '기타',
-    
-    # 자격종별 교원 현황 (64)
-    'COL_1': '정교사(1급)',
-    'COL_2': '정교사(2급)',
-    'COL_3': '준교사',
-    'COL_4': '전문상담교사(1급)',
-    'COL_5': '전문상담교사(2급)',
-    'COL_6': '사서교사(1급)',
-    'COL_7': '사서교사(2급)',
-    'COL_8': '실기교사',
-    'COL_9': '보건교사(1급)',
-    'COL_10': '보건교사(2급)',
-    'COL_11': '영양교사(1급)',
-    'COL_19': '영양교사(2급)',
-    'COL_20': '특수학교(1급)',
-    'COL_21': '특수학교(2급)',
-    
-    # 학교폭력 예방교육 실적 (94)
-    'SEM_SC_CODE': '학기구분코드',
-    'SEM_SC_NM': '학기구분명',
-    'TOT_AVG_TM': '총 평균시간',
-    'FRL_CURR_ITRT_TM': '정규교과 시간',
-    'NN_FRL_CURR_ITRT_TM': '비정규교과 시간',
-    'PTPT_NMPR_FGR1': '1학기 참여인원',
-    'PTPT_NMPR_FGR2': '2학기 참여인원',
-    'PTPT_NMPR_PER1': '1학기 참여율',
-    'PTPT_NMPR_PER2': '2학기 참여율',
-    
-    # 입학생 현황 (51)
-    'BEAGE_BOY_FGR': '적정연령 남학생수',
-    'BEAGE_GIR_FGR': '적정연령 여학생수',
-    'ELPD_ETRC_BOY_FGR': '조기입학 남학생수',
-    'ELPD_ETRC_GIR_FGR': '조기입학 여학생수',
-    'HEST_AWA_LTAGE_BOY_FGR': '취학유예 남학생수',
-    'HEST_AWA_LTAGE_GIR_FGR': '취학유예 여학생수',
-    'TOT_SUM': '전체 합계',
-    'TOTAL_1': '1학기 전체',
-    'TOTAL_2': '2학기 전체',
-    
-    # 공통 필드 (여러 API에서 사용)
-    'PBAN_EXCP_YN': '제외여부',
-    'PBAN_EXCP_RSN': '제외사유'
-}
-
-def fetch_school_data(api_type, school_type, year):
-    """API를 통해 학교 데이터를 가져옵니다."""
+def download_school_data(api_type, school_type, year, session=None):
+    """
+    API를 통해 학교 데이터를 가져옵니다. 컬럼명은 변환하지 않은 원본 그대로 반환합니다.
+    화면 출력 없이 실패 시 RuntimeError를 발생시키므로 작업 스레드에서도 사용할 수 있습니다.
+    """
     url = f"{BASE_URL}?apiKey={API_KEY}&apiType={api_type}&pbanYr={year}&schulKndCode={school_type}"
-    
+
+    try:
+        response = (session or requests).get(url, verify=False)
+    except Exception as e:
+        raise RuntimeError(f"데이터 조회 중 오류가 발생했습니다: {str(e)}") from e
+
+    if response.status_code != 200:
+        raise RuntimeError(f"API 응답 오류: {response.status_code}")
+
+    try:
+        # JSON 데이터 가져오기
+        data = response.json()
+    except Exception as e:
+        raise RuntimeError(f"데이터 파싱 중 오류 발생: {str(e)}") from e
+
+    # 실제 데이터는 'list' 키에 있음
+    if data.get('resultCode') == 'success' and 'list' in data:
+        return pd.DataFrame(data['list'])
+
+    raise RuntimeError("데이터를 찾을 수 없습니다.")
+
+@st.cache_resource
+def init_schema_registry():
+    """test_api.py가 저장한 최신 스키마 레지스트리를 한 번만 읽어 반영합니다."""
+    return load_registry()
+
+@st.cache_resource
+def get_memory_cache():
+    """
+    Streamlit 재실행 사이에도 유지되는 프로세스 내 캐시(LRU)와 그 잠금을 반환합니다.
+    일괄 조회의 작업 스레드들이 함께 쓰므로 잠금 안에서만 읽고 씁니다.
+    """
+    return OrderedDict(), threading.Lock()
+
+def remember_school_data(key, saved_at, df):
+    """메모리 캐시에 넣고 MEMORY_CACHE_SIZE를 넘으면 가장 오래 쓰지 않은 항목을 뺍니다."""
+    memory_cache, lock = get_memory_cache()
+    with lock:
+        memory_cache[key] = (saved_at, df)
+        memory_cache.move_to_end(key)
+        while len(memory_cache) > MEMORY_CACHE_SIZE:
+            memory_cache.popitem(last=False)
+
+@st.cache_resource
+def get_http_session():
+    """일괄 조회 작업들이 함께 쓰는 커넥션 풀 세션을 반환합니다."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=BULK_MAX_WORKERS, pool_maxsize=BULK_MAX_WORKERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def save_parquet_cache(api_type, school_type, year, df):
+    """원본 데이터를 추세 큐브의 파티션 파일로 저장합니다. 실패해도 조회는 계속합니다."""
     try:
-        response = requests.get(url, verify=False)
-        if response.status_code == 200:
+        TREND_CUBE.write(api_type, school_type, year, df)
+    except Exception as e:
+        logger.warning(f"캐시 파일을 저장하지 못했습니다: {str(e)}")
+
+def load_school_data(api_type, school_type, year, refresh=False, session=None):
+    """
+    메모리 캐시 → Parquet 캐시 → API 순서로 학교 데이터를 가져옵니다.
+    refresh가 True이면 캐시를 무시하고 API에서 다시 받습니다. 실패 시 RuntimeError를 발생시킵니다.
+    """
+    key = (api_type, school_type, str(year))
+    memory_cache, lock = get_memory_cache()
+    path = TREND_CUBE.path(api_type, school_type, year)
+
+    if not refresh:
+        with lock:
+            entry = memory_cache.get(key)
+            if entry is not None:
+                memory_cache.move_to_end(key)
+        if entry is not None and TREND_CUBE.is_fresh(year, entry[0]):
+            return entry[1]
+
+        if TREND_CUBE.has_fresh(api_type, school_type, year):
             try:
-                # JSON 데이터 가져오기
-                data = response.json()
-                
-                # 실제 데이터는 'list' 키에 있음
-                if data.get('resultCode') == 'success' and 'list' in data:
-                    df = pd.DataFrame(data['list'])
-                    # 컬럼명을 한글로 변환
-                    df = translate_columns(df)
-                    return df
-                
-                st.error("데이터를 찾을 수 없습니다.")
-                return None
-                
+                df = translate_columns(pd.read_parquet(path), api_type)
+                remember_school_data(key, os.path.getmtime(path), df)
+                return df
             except Exception as e:
-                st.error(f"데이터 파싱 중 오류 발생: {str(e)}")
-                return None
-        else:
-            st.error(f"API 응답 오류: {response.status_code}")
-            return None
-    except Exception as e:
-        st.error(f"데이터 조회 중 오류가 발생했습니다: {str(e)}")
+                logger.warning(f"캐시 파일을 읽지 못해 다시 조회합니다: {str(e)}")
+
+    raw_df = download_school_data(api_type, school_type, year, session=session)
+    save_parquet_cache(api_type, school_type, year, raw_df)
+    # 컬럼명을 한글로 변환
+    df = translate_columns(raw_df, api_type)
+    remember_school_data(key, time.time(), df)
+    return df
+
+def fetch_school_data(api_type, school_type, year, refresh=False):
+    """학교 데이터를 가져오고, 실패하면 화면에 오류를 표시한 뒤 None을 반환합니다."""
+    try:
+        return load_school_data(api_type, school_type, year, refresh=refresh)
+    except RuntimeError as e:
+        st.error(str(e))
         return None
 
-def translate_columns(df):
-    """데이터프레임의 컬럼명을 한글로 변환합니다."""
-    if df is None or df.empty:
-        return df
-    
-    # 컬럼명 변환
-    new_columns = {}
-    for col in df.columns:
-        if col in COLUMN_MAPPINGS:
-            new_columns[col] = COLUMN_MAPPINGS[col]
-        else:
-            new_columns[col] = col  # 매핑이 없는 경우 원래 이름 유지
-    
-    return df.rename(columns=new_columns)
+def fetch_bulk_school_data(api_type, school_type_names, years, refresh=False, on_progress=None):
+    """
+    여러 연도 × 학교급 조합을 스레드 풀로 동시에 가져와 하나의 데이터프레임으로 합칩니다.
+    각 결과에는 '연도', '학교급' 컬럼이 붙습니다. (합친 데이터프레임, 작업별 결과 목록)을 반환합니다.
+    """
+    session = get_http_session()
+    jobs = [(year, name) for year in years for name in school_type_names]
+    results = []
+    frames = {}
 
-def main():
-    st.title("🏫 전국 학교 정보 대시보드")
-    
-    # 사이드바 설정
-    st.sidebar.header("검색 조건")
-    
+    def fetch(year, name):
+        """작업 하나를 실행하고 (데이터프레임, 오류, 소요 시간)을 반환합니다. 풀에서 차례를 기다린 시간은 빼고 잽니다."""
+        started = time.perf_counter()
+        try:
+            df, error = load_school_data(api_type, SCHOOL_TYPES[name], year, refresh, session), None
+        except RuntimeError as e:
+            df, error = None, e
+        return df, error, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=BULK_MAX_WORKERS) as executor:
+        futures = {executor.submit(fetch, year, name): (year, name) for year, name in jobs}
+
+        for future in as_completed(futures):
+            year, name = futures[future]
+            df, error, elapsed = future.result()
+            result = {'연도': year, '학교급': name, '상태': '완료', '건수': 0,
+                      '소요시간(초)': round(elapsed, 2)}
+            if error is None:
+                frames[(year, name)] = df.assign(연도=year, 학교급=name)
+                result['건수'] = len(df)
+            else:
+                result['상태'] = f"실패: {str(error)}"
+            results.append(result)
+            if on_progress is not None:
+                on_progress(len(results), len(jobs), result)
+
+    # 완료 순서와 관계없이 선택한 연도/학교급 순서로 합칩니다.
+    ordered = [frames[job] for job in jobs if job in frames]
+    if not ordered:
+        return None, results
+
+    combined = pd.concat(ordered, ignore_index=True)
+    # 범주가 서로 다른 category 컬럼은 합치면 object가 되므로 다시 category로 맞춥니다.
+    for col in ordered[0].select_dtypes('category').columns:
+        if col in combined and combined[col].dtype != 'category':
+            combined[col] = combined[col].astype('category')
+    combined['학교급'] = combined['학교급'].astype('category')
+    return combined, results
+
+@st.cache_resource
+def get_export_cache():
+    """데이터셋·형식별로 만들어 둔 내보내기 파일(임시 파일 경로)을 보관합니다."""
+    return OrderedDict()
+
+@st.cache_resource
+def get_export_lock():
+    """다운로드 요청은 세션마다 다른 스레드에서 실행되므로 내보내기 캐시를 이 잠금으로 보호합니다."""
+    return threading.Lock()
+
+def iter_chunks(df):
+    """데이터프레임을 EXPORT_CHUNK_ROWS행씩 나눠 돌려줍니다."""
+    for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+        yield df.iloc[start:start + EXPORT_CHUNK_ROWS]
+
+def write_csv(df, path):
+    """조각마다 CSV로 이어 씁니다. 엑셀에서 한글이 깨지지 않도록 BOM을 붙입니다."""
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        f.write(df.iloc[:0].to_csv(index=False))
+        for chunk in iter_chunks(df):
+            chunk.to_csv(f, index=False, header=False)
+
+def write_parquet(df, path):
+    """전체 프레임의 스키마로 ParquetWriter를 열고 조각마다 행 그룹으로 기록합니다."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in iter_chunks(df):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+def write_xlsx(df, path):
+    """
+    openpyxl 쓰기 전용 모드로 조각마다 결측을 None으로 바꿔 기록합니다.
+    object 사본도 조각 크기만큼만 만들므로 워크북이나 전체 사본을 메모리에 올리지 않습니다.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('학교정보')
+    sheet.append([str(col) for col in df.columns])
+    for chunk in iter_chunks(df):
+        for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(path)
+
+EXPORT_WRITERS = {'Excel': write_xlsx, 'CSV': write_csv, 'Parquet': write_parquet}
+
+def export_dataframe(df, export_format):
+    """데이터프레임을 지정한 형식의 임시 파일로 조각씩 기록하고 그 경로를 반환합니다."""
+    fd, path = tempfile.mkstemp(suffix=f".{EXPORT_FORMATS[export_format][0]}")
+    os.close(fd)
+    try:
+        EXPORT_WRITERS[export_format](df, path)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+def discard_export(path):
+    """캐시에서 밀려난 내보내기 임시 파일을 지웁니다."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def read_export(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def get_export(df, dataset_key, export_format):
+    """
+    내보내기 파일 내용을 반환합니다. 같은 데이터셋·형식은 다시 직렬화하지 않고 캐시의 임시 파일을 읽습니다.
+    데이터가 새로 조회되면 데이터프레임 객체가 바뀌므로 파일을 새로 만듭니다.
+    캐시에는 디스크의 파일 경로만 두고, Streamlit은 내려받을 내용을 bytes로 받으므로 버튼을 눌렀을 때만 읽습니다.
+    파일을 읽고 지우는 일은 잠금 안에서만 하므로 읽는 도중 다른 스레드가 파일을 지우지 않습니다.
+    """
+    cache, lock = get_export_cache(), get_export_lock()
+    key = (dataset_key, export_format)
+    with lock:
+        entry = cache.get(key)
+        if entry is not None and entry[0] is df:
+            cache.move_to_end(key)
+            return read_export(entry[1])
+
+    # 파일을 만드는 동안에는 잠그지 않아 다른 세션의 다운로드를 막지 않습니다.
+    path = export_dataframe(df, export_format)
+    with lock:
+        entry = cache.get(key)
+        if entry is not None:
+            discard_export(entry[1])
+        cache[key] = (df, path)
+        data = read_export(path)
+        while len(cache) > EXPORT_CACHE_SIZE:
+            discard_export(cache.popitem(last=False)[1][1])
+    return data
+
+def render_download_buttons(df, dataset_key, file_stem):
+    """형식별 다운로드 버튼을 표시합니다. 파일은 버튼을 눌렀을 때만 만들어집니다."""
+    columns = st.columns(len(EXPORT_FORMATS))
+    for column, (export_format, (extension, mime)) in zip(columns, EXPORT_FORMATS.items()):
+        with column:
+            st.download_button(
+                label=f"📥 {export_format}",
+                data=lambda export_format=export_format: get_export(df, dataset_key, export_format),
+                file_name=f"{file_stem}.{extension}",
+                mime=mime,
+                on_click="ignore",
+                key=f"download_{export_format}"
+            )
+
+@st.cache_resource
+def get_rollup_cache():
+    """데이터셋별로 계산해 둔 지역별 집계를 보관합니다."""
+    return OrderedDict()
+
+def get_rollups(df, dataset_key, extra_keys=()):
+    """
+    지역별 집계표와 기본 통계를 데이터셋마다 한 번만 계산합니다.
+    데이터가 새로 조회되면 데이터프레임 객체가 바뀌므로 다시 계산합니다.
+    """
+    cache = get_rollup_cache()
+    entry = cache.get(dataset_key)
+    if entry is not None and entry[0] is df:
+        cache.move_to_end(dataset_key)
+        return entry[1]
+
+    rollups = {
+        'levels': compute_rollups(df, extra_keys=extra_keys),
+        'summary': summarize(df),
+    }
+    cache[dataset_key] = (df, rollups)
+    while len(cache) > ROLLUP_CACHE_SIZE:
+        cache.popitem(last=False)
+    return rollups
+
+def render_paginated_table(df, key, search_columns=()):
+    """검색과 페이지 나누기를 서버에서 처리하고 현재 페이지의 행만 화면에 보냅니다."""
+    search_col, size_col, page_col = st.columns([3, 1, 1])
+    query = search_col.text_input(
+        "검색", key=f"{key}_query", placeholder=f"{', '.join(search_columns)}에서 검색"
+    ) if search_columns else ''
+    page_size = size_col.selectbox("페이지당 행 수", options=TABLE_PAGE_SIZES, key=f"{key}_page_size")
+
+    filtered = filter_rows(df, query.strip(), search_columns)
+    pages = max(1, math.ceil(len(filtered) / page_size))
+    # 검색 결과가 줄어 현재 페이지가 범위를 벗어나면 마지막 페이지로 옮깁니다.
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    # 현재 페이지는 session_state가 갖고 있으므로 value를 함께 주지 않습니다. (처음에는 min_value)
+    page = page_col.number_input("페이지", min_value=1, max_value=pages, key=f"{key}_page")
+
+    start = (page - 1) * page_size
+    st.dataframe(filtered.iloc[start:start + page_size], hide_index=True)
+    st.caption(f"{len(filtered):,}행 중 {min(start + 1, len(filtered)):,}–{min(start + page_size, len(filtered)):,}행 ({page} / {pages} 페이지)")
+
+def render_rollups(df, dataset_key, key, extra_keys=()):
+    """지역별 집계 차트와 표, 기본 통계를 표시합니다. 원본 행은 페이지 단위로만 보여줍니다."""
+    rollups = get_rollups(df, dataset_key, extra_keys)
+    levels = rollups['levels']
+
+    if not levels:
+        st.info("집계 기준 컬럼(시도교육청, 교육지원청, 지역, 설립구분)이 없어 지역별 집계를 표시할 수 없습니다.")
+    else:
+        st.subheader("📊 지역별 집계")
+        level = st.radio("집계 기준", options=list(levels), horizontal=True, key=f"{key}_level")
+        table = levels[level]
+        group_keys = [col for col in extra_keys if col in table] + [level]
+        metric = st.selectbox(
+            "차트 항목", options=[col for col in table.columns if col not in group_keys], key=f"{key}_metric"
+        )
+
+        # plotly는 불러오는 데 시간이 걸리므로 차트를 처음 그릴 때 불러옵니다.
+        import plotly.express as px
+
+        # 항목 값이 큰 그룹만 차트에 그립니다.
+        top_groups = table.groupby(level, observed=True)[metric].sum().nlargest(CHART_MAX_GROUPS).index
+        chart_df = table[table[level].isin(top_groups)]
+        color = '학교급' if '학교급' in group_keys else None
+        facet = '연도' if '연도' in group_keys and chart_df['연도'].nunique() > 1 else None
+        fig = px.bar(
+            chart_df, x=level, y=metric, color=color, facet_row=facet, barmode='group',
+            category_orders={level: list(top_groups)}
+        )
+        st.plotly_chart(fig, width='stretch')
+
+        render_paginated_table(table, key=f"{key}_{level}", search_columns=[level])
+
+    if rollups['summary'] is not None:
+        st.subheader("📈 기본 통계")
+        st.dataframe(rollups['summary'])
+
+    with st.expander(f"원본 데이터 ({len(df):,}행, 페이지 단위로 보기)"):
+        render_paginated_table(df, key=f"{key}_raw", search_columns=[col for col in ('학교명',) if col in df])
+
+def translate_columns(df, api_type):
+    """API 타입별 스키마에 맞춰 컬럼 타입을 변환하고 컬럼명을 한글로 바꿉니다."""
+    return apply_schema(df, api_type)
+
+def render_single_mode():
+    """연도·학교급·조회 정보를 하나씩 골라 조회하는 화면"""
     # 조회 연도 선택
     year = st.sidebar.selectbox(
         "조회 연도",
-        options=list(range(2024, 2019, -1))
+        options=YEARS
     )
     
     # 학교급 선택
@@ -317,41 +473,316 @@ def main():
         options=list(API_TYPES.keys())
     )
     
-    # 데이터 조회 버튼
-    if st.sidebar.button("데이터 조회"):
-        with st.spinner("데이터를 불러오는 중..."):
-            df = fetch_school_data(
-                API_TYPES[selected_api_type],
-                SCHOOL_TYPES[selected_school_type],
-                year
-            )
-            
-            if df is not None and not df.empty:
-                st.success("데이터를 성공적으로 불러왔습니다!")
-                
-                # 데이터프레임 표시
-                st.subheader("📊 조회 결과")
-                st.dataframe(df)
-                
-                # 엑셀 다운로드 버튼
-                excel_buffer = io.BytesIO()
-                with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='학교정보')
-                
-                excel_buffer.seek(0)
-                st.download_button(
-                    label="📥 엑셀 파일로 다운로드",
-                    data=excel_buffer,
-                    file_name=f"school_data_{year}_{selected_school_type}_{selected_api_type}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    # 데이터 조회 버튼 (새로고침은 캐시를 무시하고 API에서 다시 받음)
+    search_clicked = st.sidebar.button("데이터 조회")
+    refresh_clicked = st.sidebar.button("🔄 새로고침 (캐시 무시)")
+    # 표 페이지를 넘기는 등 다시 실행될 때도 결과를 유지하도록 마지막 조회 조건을 기억합니다.
+    if search_clicked or refresh_clicked:
+        st.session_state['single_query'] = (selected_api_type, selected_school_type, year)
+    query = st.session_state.get('single_query')
+    if query is None:
+        return
+
+    api_name, school_type_name, query_year = query
+    with st.spinner("데이터를 불러오는 중..."):
+        df = fetch_school_data(
+            API_TYPES[api_name],
+            SCHOOL_TYPES[school_type_name],
+            query_year,
+            refresh=refresh_clicked
+        )
+
+    if df is None or df.empty:
+        st.error("데이터를 불러오지 못했습니다.")
+        return
+    if search_clicked or refresh_clicked:
+        st.success("데이터를 성공적으로 불러왔습니다!")
+
+    dataset_key = (API_TYPES[api_name], SCHOOL_TYPES[school_type_name], query_year)
+    st.caption(f"{query_year}년 {school_type_name} · {api_name} · {len(df):,}개 학교")
+
+    # 다운로드 버튼 (누를 때만 파일 생성)
+    render_download_buttons(df, dataset_key, f"school_data_{query_year}_{school_type_name}_{api_name}")
+
+    render_rollups(df, dataset_key, key="single")
+
+@st.cache_resource(ttl=CURRENT_YEAR_TTL, max_entries=4)
+def get_geo_index(year, school_type_names):
+    """
+    선택한 연도·학교급의 학교기본정보로 위치 색인을 만듭니다. 같은 조건은 재실행 사이에 다시 만들지 않습니다.
+    일부 학교급을 불러오지 못하면 RuntimeError를 발생시킵니다. (불완전한 색인을 캐시하지 않음)
+    """
+    combined, results = fetch_bulk_school_data(API_TYPES['학교기본정보'], list(school_type_names), [year])
+    failed = [f"{r['학교급']}: {r['상태']}" for r in results if r['상태'] != '완료']
+    if failed or combined is None:
+        raise RuntimeError(f"학교기본정보를 불러오지 못했습니다. ({', '.join(failed)})")
+
+    columns = [col for col in MAP_COLUMNS if col in combined]
+    records = combined[columns].astype(object).where(combined[columns].notna(), None).to_dict('records')
+    return GeoIndex(records, lat_key='위도', lon_key='경도')
+
+def render_map_mode():
+    """학교 또는 좌표를 골라 가까운 학교를 지도에 표시하는 화면"""
+    year = st.sidebar.selectbox("조회 연도", options=YEARS)
+    school_type_names = st.sidebar.multiselect(
+        "학교급", options=list(SCHOOL_TYPES.keys()), default=list(SCHOOL_TYPES.keys())
+    )
+    k = st.sidebar.slider("표시할 학교 수", min_value=1, max_value=200, value=20)
+    radius_km = st.sidebar.number_input("검색 반경(km, 0이면 제한 없음)", min_value=0.0, max_value=500.0, value=0.0, step=1.0)
+    if not school_type_names:
+        st.warning("학교급을 하나 이상 선택해주세요.")
+        return
+
+    try:
+        with st.spinner("학교 위치를 불러오는 중..."):
+            index = get_geo_index(year, tuple(school_type_names))
+    except RuntimeError as e:
+        st.error(str(e))
+        return
+    if not len(index):
+        st.error("위치 정보가 있는 학교가 없습니다.")
+        return
+
+    st.subheader("📍 가까운 학교 찾기")
+    center_mode = st.radio("기준 위치", options=["학교 선택", "좌표 입력"], horizontal=True)
+    if center_mode == "학교 선택":
+        position = st.selectbox(
+            "기준 학교",
+            options=range(len(index)),
+            format_func=lambda i: f"{index.records[i].get('학교명')} ({index.records[i].get('시도교육청')})"
+        )
+        lat, lon = float(index.lats[position]), float(index.lons[position])
+    else:
+        left, right = st.columns(2)
+        lat = left.number_input("위도", min_value=-90.0, max_value=90.0, value=MAP_DEFAULT_CENTER[0], format="%.6f")
+        lon = right.number_input("경도", min_value=-180.0, max_value=180.0, value=MAP_DEFAULT_CENTER[1], format="%.6f")
+
+    # 색인에서 가까운 학교만 꺼내므로 지도에는 결과 학교만 그립니다.
+    started = time.perf_counter()
+    nearby = index.nearby(lat, lon, k=k, radius_km=radius_km or None)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if not nearby:
+        st.info("조건에 맞는 학교가 없습니다.")
+        return
+
+    result = pd.DataFrame([{**record, '거리(km)': round(distance, 3)} for record, distance in nearby])
+    st.caption(f"전체 {len(index):,}개 학교 중 {len(result)}개 (검색 {elapsed_ms:.2f}ms)")
+    points = pd.concat([
+        pd.DataFrame({'위도': [lat], '경도': [lon], 'color': ['#e4572e'], 'size': [60]}),
+        result[['위도', '경도']].assign(color='#1f77b4', size=30)
+    ], ignore_index=True)
+    st.map(points, latitude='위도', longitude='경도', color='color', size='size')
+    st.dataframe(result, hide_index=True)
+
+def render_bulk_mode():
+    """여러 연도와 학교급을 골라 한 번에 조회하는 화면"""
+    years = st.sidebar.multiselect("조회 연도", options=YEARS, default=YEARS[:1])
+    school_type_names = st.sidebar.multiselect(
+        "학교급", options=list(SCHOOL_TYPES.keys()), default=list(SCHOOL_TYPES.keys())
+    )
+    selected_api_type = st.sidebar.selectbox("조회할 정보", options=list(API_TYPES.keys()))
+
+    search_clicked = st.sidebar.button("일괄 조회")
+    refresh_clicked = st.sidebar.button("🔄 새로고침 (캐시 무시)")
+    if search_clicked or refresh_clicked:
+        if not years or not school_type_names:
+            st.warning("연도와 학교급을 하나 이상 선택해주세요.")
+            return
+
+        total = len(years) * len(school_type_names)
+        progress_bar = st.progress(0.0, text=f"0 / {total} 작업 완료")
+        status_table = st.empty()
+        finished = []
+
+        def on_progress(done, total, result):
+            finished.append(result)
+            progress_bar.progress(done / total, text=f"{done} / {total} 작업 완료")
+            status_table.dataframe(pd.DataFrame(finished), hide_index=True)
+
+        combined, results = fetch_bulk_school_data(
+            API_TYPES[selected_api_type], school_type_names, years,
+            refresh=refresh_clicked, on_progress=on_progress
+        )
+        # 합친 데이터프레임을 세션에 두어 다시 실행될 때 합치기와 집계를 반복하지 않습니다.
+        st.session_state['bulk_result'] = (selected_api_type, list(years), list(school_type_names), combined, results)
+
+    if 'bulk_result' not in st.session_state:
+        return
+    selected_api_type, years, school_type_names, combined, results = st.session_state['bulk_result']
+
+    failed = [r for r in results if r['상태'] != '완료']
+    if failed:
+        st.warning(f"{len(failed)}개 작업이 실패했습니다.")
+    if combined is None:
+        st.error("데이터를 불러오지 못했습니다.")
+        return
+
+    st.success(f"{len(results) - len(failed)}개 작업의 데이터를 합쳤습니다. (총 {len(combined):,}행)")
+    st.subheader("📊 연도·학교급별 학교 수")
+    st.dataframe(combined.groupby(['연도', '학교급']).size().unstack(fill_value=0).reindex(columns=school_type_names, fill_value=0))
+
+    dataset_key = ('bulk', API_TYPES[selected_api_type], tuple(years), tuple(school_type_names))
+    render_download_buttons(
+        combined, dataset_key, f"school_data_{'_'.join(map(str, years))}_{selected_api_type}"
+    )
+
+    render_rollups(combined, dataset_key, key="bulk", extra_keys=('연도', '학교급'))
+
+def trend_metric_columns(api_type):
+    """추세를 볼 수 있는 숫자 항목(한글 컬럼명) 목록"""
+    return [
+        name for name, dtype in get_schema(api_type).values()
+        if dtype in (INT, FLOAT) and name not in EXCLUDED_COLUMNS
+    ]
+
+def update_trend_cube(api_type, school_type_names, years, refresh=False, on_progress=None):
+    """추세 큐브에서 없는 연도와 만료된 올해 파티션만 API에서 받아 채웁니다."""
+    session = get_http_session()
+    return TREND_CUBE.update(
+        api_type,
+        [SCHOOL_TYPES[name] for name in school_type_names],
+        years,
+        lambda api_type, school_type, year: download_school_data(api_type, school_type, year, session=session),
+        max_workers=BULK_MAX_WORKERS,
+        refresh=refresh,
+        on_progress=on_progress
+    )
+
+def render_trend_mode():
+    """여러 해의 공시를 쌓아 둔 큐브에서 학교·지역별 전년 대비 증감을 보여주는 화면"""
+    years = st.sidebar.multiselect("조회 연도", options=YEARS, default=YEARS)
+    school_type_names = st.sidebar.multiselect(
+        "학교급", options=list(SCHOOL_TYPES.keys()), default=list(SCHOOL_TYPES.keys())
+    )
+    selected_api_type = st.sidebar.selectbox("조회할 정보", options=list(API_TYPES.keys()))
+
+    search_clicked = st.sidebar.button("추세 조회")
+    refresh_clicked = st.sidebar.button("🔄 전체 다시 받기")
+    if search_clicked or refresh_clicked:
+        if len(years) < 2 or not school_type_names:
+            st.warning("연도를 두 개 이상, 학교급을 하나 이상 선택해주세요.")
+            return
+
+        api_type = API_TYPES[selected_api_type]
+        school_types = [SCHOOL_TYPES[name] for name in school_type_names]
+        stale = len(school_types) * len(years) if refresh_clicked else len(TREND_CUBE.stale_partitions(api_type, school_types, years))
+        progress_bar = st.progress(0.0, text=f"받을 파티션 {stale}개")
+
+        def on_progress(done, total, result):
+            progress_bar.progress(done / total, text=f"{done} / {total} 파티션 저장")
+
+        results = update_trend_cube(api_type, school_type_names, years, refresh=refresh_clicked, on_progress=on_progress)
+        progress_bar.empty()
+        # 추세에 필요한 식별·집계 기준·숫자 컬럼만 파일에서 읽습니다.
+        metrics = trend_metric_columns(api_type)
+        cube = TREND_CUBE.read(
+            api_type, school_types, sorted(years), columns=[SCHOOL_KEY, '학교명'] + ROLLUP_LEVELS + metrics
+        )
+        st.session_state['trend_result'] = (selected_api_type, sorted(years), list(school_type_names), cube, results, stale)
+
+    if 'trend_result' not in st.session_state:
+        return
+    selected_api_type, years, school_type_names, cube, results, stale = st.session_state['trend_result']
+
+    failed = [r for r in results if r['상태'] != '완료']
+    if failed:
+        st.warning(f"{len(failed)}개 파티션을 받지 못했습니다: " + ", ".join(f"{r[YEAR_COLUMN]}년 {r['학교급코드']}" for r in failed))
+    if cube.empty:
+        st.error("저장된 데이터가 없습니다.")
+        return
+    st.caption(
+        f"{selected_api_type} · {years[0]}–{years[-1]}년 · {len(cube):,}행 "
+        f"(새로 받은 파티션 {stale - len(failed)}개, 나머지는 저장된 파티션 사용)"
+    )
+
+    metrics = [col for col in trend_metric_columns(API_TYPES[selected_api_type]) if col in cube]
+    levels = [level for level in ROLLUP_LEVELS if level in cube]
+    if not metrics or not levels:
+        st.info("추세를 계산할 숫자 항목이나 집계 기준 컬럼이 없습니다.")
+        return
+    metric = st.selectbox("항목", options=metrics, key="trend_metric")
+    level = st.radio("집계 기준", options=levels, horizontal=True, key="trend_level")
+    latest_year = cube[YEAR_COLUMN].max()
+
+    import plotly.express as px
+
+    st.subheader(f"📈 {level}별 {metric} 추이")
+    regions = region_trend(cube, level, [metric])
+    top_groups = regions[regions[YEAR_COLUMN] == latest_year].nlargest(CHART_MAX_GROUPS, metric)[level]
+    chart_df = regions[regions[level].isin(top_groups)]
+    fig = px.line(chart_df, x=YEAR_COLUMN, y=metric, color=level, markers=True)
+    fig.update_xaxes(dtick=1)
+    st.plotly_chart(fig, width='stretch')
+    render_paginated_table(
+        regions.sort_values([YEAR_COLUMN, level], ascending=[False, True]),
+        key=f"trend_{level}", search_columns=[level]
+    )
+
+    st.subheader(f"🏫 학교별 {metric} 전년 대비 증감")
+    schools = school_trend(cube, [metric], labels=['학교명', level])
+    schools = schools[schools[YEAR_COLUMN] == latest_year].sort_values(metric + DELTA_SUFFIX, ascending=False, na_position='last')
+    st.caption(f"{latest_year}년 기준, 증감이 큰 순서 ({metric + RATE_SUFFIX}는 전년 값이 0이면 비어 있음)")
+    render_paginated_table(schools, key="trend_schools", search_columns=['학교명'])
+
+@st.cache_resource
+def start_warmup():
+    """
+    프로세스마다 한 번, WARMUP_API_TYPES 데이터셋의 가장 최근 연도 × 모든 학교급을 백그라운드 스레드에서 받습니다.
+    스레드는 스크립트 실행 밖에서 돌기 때문에 st.cache_* 함수를 부르지 않고 추세 큐브에 Parquet 파티션만 채우며,
+    화면의 조회는 load_school_data가 그 파일을 읽어 메모리 캐시에 올립니다. 진행 상태 dict를 반환합니다.
+    """
+    status = {'total': len(WARMUP_API_TYPES) * len(SCHOOL_TYPES), 'done': 0, 'failed': []}
+    if not status['total'] or not API_KEY or not BASE_URL:
+        status['total'] = 0
+        return status
+
+    def run():
+        started = time.perf_counter()
+        with requests.Session() as session:
+            for api_type in WARMUP_API_TYPES:
+                def on_progress(done, total, result):
+                    status['done'] += 1
+                    if result['상태'] != '완료':
+                        status['failed'].append(f"{api_type}/{result['학교급코드']}: {result['상태']}")
+
+                results = TREND_CUBE.update(
+                    api_type,
+                    list(SCHOOL_TYPES.values()),
+                    [YEARS[0]],
+                    lambda api_type, school_type, year: download_school_data(api_type, school_type, year, session=session),
+                    max_workers=BULK_MAX_WORKERS,
+                    on_progress=on_progress
                 )
-                
-                # 기본 통계 정보 표시
-                st.subheader("📈 기본 통계")
-                st.write(df.describe())
-                
-            else:
-                st.error("데이터를 불러오지 못했습니다.")
+                # 이미 받아 둔 파티션은 건너뛰므로 완료로 셉니다.
+                status['done'] += len(SCHOOL_TYPES) - len(results)
+        logger.info(f"대시보드 예열 완료: {status['done']}개 중 실패 {len(status['failed'])}개, {time.perf_counter() - started:.1f}초")
+
+    threading.Thread(target=run, name='dashboard-warmup', daemon=True).start()
+    return status
+
+def main():
+    st.title("🏫 전국 학교 정보 대시보드")
+    
+    # 사이드바 설정
+    st.sidebar.header("검색 조건")
+
+    schema_version = init_schema_registry()
+    if schema_version is not None:
+        st.sidebar.caption(f"스키마 레지스트리 v{schema_version}")
+
+    warmup = start_warmup()
+    if warmup['done'] < warmup['total']:
+        st.sidebar.caption(f"⏳ 자주 쓰는 데이터를 미리 불러오는 중 ({warmup['done']} / {warmup['total']})")
+
+    mode = st.sidebar.radio("조회 방식", options=["단일 조회", "일괄 조회", "추세", "지도"], horizontal=True)
+    if mode == "일괄 조회":
+        render_bulk_mode()
+    elif mode == "추세":
+        render_trend_mode()
+    elif mode == "지도":
+        render_map_mode()
+    else:
+        render_single_mode()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,207 @@
+import bisect
+import json
+import math
+import os
+import time
+from typing import Optional
+
+import numpy as np
+
+# 학교 위치(위도/경도) 격자 색인
+# 위경도를 cell_deg 간격의 격자로 나누고, 질의 지점이 속한 칸에서 바깥쪽 고리(ring) 순서로
+# 후보를 모은 뒤 실제 거리(하버사인)로 정렬합니다. 전국 학교 수 규모에서는 칸 몇 개만 보면 되므로
+# k-최근접 / 반경 질의가 1ms 안에 끝납니다.
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """한 지점에서 여러 지점까지의 대원 거리(km)"""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def parse_coordinate(value, low: float, high: float) -> Optional[float]:
+    """좌표 문자열/숫자를 float으로 변환합니다. 비어 있거나 범위를 벗어나거나 0이면 None"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(number) or number == 0 or not low <= number <= high:
+        return None
+    return number
+
+
+class GeoIndex:
+    """
+    위경도 격자 색인
+    records의 각 항목에서 lat_key/lon_key 값을 좌표로 사용하며, 좌표가 없는 항목은 제외합니다.
+    nearby()는 (항목, 거리 km) 목록을 가까운 순서로 반환합니다.
+    """
+
+    def __init__(self, records: list, lat_key: str = "lat", lon_key: str = "lon", cell_deg: float = 0.05):
+        self.cell_deg = cell_deg
+        self.records = []
+        lats, lons = [], []
+        for record in records:
+            lat = parse_coordinate(record.get(lat_key), -90, 90)
+            lon = parse_coordinate(record.get(lon_key), -180, 180)
+            if lat is None or lon is None:
+                continue
+            self.records.append(record)
+            lats.append(lat)
+            lons.append(lon)
+
+        self.lats = np.array(lats, dtype=np.float64)
+        self.lons = np.array(lons, dtype=np.float64)
+        # 경도 방향 칸은 날짜변경선에서 이어지도록 0..ncols-1로 감쌉니다.
+        # 360이 cell_deg로 나누어떨어지지 않으면 마지막 칸이 좁아지므로 그 차이(seam_gap)만큼 거리 하한을 줄입니다.
+        self._ncols = max(math.ceil(360 / cell_deg - 1e-9), 1)
+        self._seam_gap = self._ncols * cell_deg - 360
+        self._min_offset = -(self._ncols // 2)
+        self._max_offset = self._ncols - self._ncols // 2 - 1
+        self._cells = {}
+        if not self.records:
+            self._max_abs_lat = 0.0
+            self._rows = []
+            self._cols = np.empty(0, dtype=np.int64)
+            return
+
+        rows = np.floor(self.lats / cell_deg).astype(np.int64)
+        cols = self._column(self.lons)
+        order = np.lexsort((cols, rows))
+        keys = np.stack([rows[order], cols[order]], axis=1)
+        starts = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+        for group in np.split(order, starts):
+            self._cells[(int(rows[group[0]]), int(cols[group[0]]))] = group
+
+        self._max_abs_lat = float(np.max(np.abs(self.lats)))
+        # 항목이 있는 행만 따라가면 극지방처럼 고리를 넓게 봐야 할 때도 빈 칸 조회가 줄어듭니다.
+        self._rows = [int(r) for r in np.unique(rows)]
+        self._row_set = set(self._rows)
+        self._cols = np.unique(cols)
+
+    def __len__(self):
+        return len(self.records)
+
+    def _column(self, lon):
+        """경도의 격자 열 번호 (-180과 180은 같은 열)"""
+        return np.floor((np.asarray(lon) + 180) / self.cell_deg).astype(np.int64) % self._ncols
+
+    def _offset(self, col: int, cols):
+        """col에서 cols까지 날짜변경선을 감안한 열 차이 (_min_offset..._max_offset)"""
+        return (cols - col - self._min_offset) % self._ncols + self._min_offset
+
+    def _unseen_km(self, lat: float, row: int, ring: int, row_span: int, col_span: int) -> float:
+        """
+        ring번째 고리까지 본 뒤 남은 항목까지 거리의 하한(km)
+        남은 항목은 위도 차이나 경도 차이가 ring × cell_deg보다 큽니다. 위도 차이는 대원 거리의
+        하한 그대로이고, 경도 차이만 큰 항목은 고리 안쪽 행에 있으므로 하버사인 식의 cos(위도)를
+        질의 지점, 고리, 색인 중 가장 높은 위도로 바꾼 값이 하한입니다.
+        (극 근처에서는 경도 방향 하한이 0에 가까워 고리를 더 넓게 봅니다)
+        """
+        lat_km = math.inf if ring >= row_span else EARTH_RADIUS_KM * math.radians(ring * self.cell_deg)
+        if ring >= col_span:
+            lon_km = math.inf
+        else:
+            dlon = min(max(ring * self.cell_deg - self._seam_gap, 0.0), 180.0)
+            ring_lat = max(abs(row - ring), abs(row + ring + 1)) * self.cell_deg
+            highest = min(max(abs(lat), min(ring_lat, self._max_abs_lat)), 90.0)
+            a = math.cos(math.radians(highest)) * math.sin(math.radians(dlon) / 2)
+            lon_km = 2 * EARTH_RADIUS_KM * math.asin(min(a, 1.0))
+        return min(lat_km, lon_km)
+
+    def _ring(self, row: int, col: int, radius: int) -> list:
+        """(row, col)을 중심으로 한 radius번째 고리에 속한 칸들의 항목 번호 배열"""
+        if radius == 0:
+            cell = self._cells.get((row, col))
+            return [] if cell is None else [cell]
+        # 고리가 지구를 한 바퀴 돌면 같은 열을 두 번 세지 않도록 열 차이를 감싼 범위로 자릅니다.
+        low, high = max(-radius, self._min_offset), min(radius, self._max_offset)
+        found = []
+        for r in (row - radius, row + radius):
+            if r not in self._row_set:
+                continue
+            for offset in range(low, high + 1):
+                cell = self._cells.get((r, (col + offset) % self._ncols))
+                if cell is not None:
+                    found.append(cell)
+        inner = self._rows[bisect.bisect_right(self._rows, row - radius):bisect.bisect_left(self._rows, row + radius)]
+        for offset in (-radius, radius):
+            if not low <= offset <= high:
+                continue
+            c = (col + offset) % self._ncols
+            for r in inner:
+                cell = self._cells.get((r, c))
+                if cell is not None:
+                    found.append(cell)
+        return found
+
+    def nearby(self, lat: float, lon: float, k: Optional[int] = 10, radius_km: Optional[float] = None) -> list:
+        """
+        (lat, lon)에서 가까운 항목을 최대 k개 반환합니다. radius_km가 있으면 그 안의 항목만 반환합니다.
+        k가 None이면 반경 안의 모든 항목을 반환합니다. (이 경우 radius_km가 필요합니다)
+        """
+        if not self.records or (k is not None and k <= 0):
+            return []
+        if k is None and radius_km is None:
+            raise ValueError("k와 radius_km 중 하나는 지정해야 합니다.")
+
+        row = math.floor(lat / self.cell_deg)
+        col = int(self._column(lon))
+        min_row, max_row = self._rows[0], self._rows[-1]
+        # 항목이 있는 칸을 모두 덮는 고리 수 (이보다 바깥에는 항목이 없음)
+        row_span = max(abs(row - min_row), abs(row - max_row))
+        col_span = int(np.max(np.abs(self._offset(col, self._cols))))
+
+        ids = np.empty(0, dtype=np.int64)
+        distances = np.empty(0, dtype=np.float64)
+        ring = 0
+        while True:
+            cells = self._ring(row, col, ring)
+            if cells:
+                new_ids = np.concatenate(cells)
+                ids = np.concatenate([ids, new_ids])
+                distances = np.concatenate([distances, haversine_km(lat, lon, self.lats[new_ids], self.lons[new_ids])])
+            unseen_km = self._unseen_km(lat, row, ring, row_span, col_span)
+            if math.isinf(unseen_km) or (radius_km is not None and unseen_km > radius_km):
+                break
+            if k is not None and len(ids) >= k and np.partition(distances, k - 1)[k - 1] <= unseen_km:
+                break
+            ring += 1
+
+        if radius_km is not None:
+            within = distances <= radius_km
+            ids, distances = ids[within], distances[within]
+        order = np.argsort(distances, kind="stable")
+        if k is not None:
+            order = order[:k]
+        return [(self.records[ids[i]], float(distances[i])) for i in order]
+
+
+class GeoStore:
+    """위치 색인을 만들 학교 목록을 JSON 파일로 저장하고 불러옵니다."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def save(self, records: list) -> float:
+        """목록 전체를 원자적으로 교체하고 저장 시각을 반환합니다."""
+        synced_at = time.time()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(f"{self.path}.tmp", "w", encoding="utf-8") as f:
+            json.dump({"syncedAt": synced_at, "records": records}, f, ensure_ascii=False)
+        os.replace(f"{self.path}.tmp", self.path)
+        return synced_at
+
+    def load(self):
+        """저장된 목록을 (항목 목록, 저장 시각)으로 반환합니다. 없으면 ([], None)을 반환합니다."""
+        if not os.path.exists(self.path):
+            return [], None
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("records", []), data.get("syncedAt")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# 등급컷 계산 모듈
+# 00_sample.py(Streamlit 화면)와 여러 엑셀 파일을 한꺼번에 처리하는 CLI가 함께 사용한다.
+#
+#   python grade_cut.py 입시결과/ -o cuts.xlsx
+#   python grade_cut.py "2024/*.xlsx" "2025/*.xlsx" -o cuts.parquet --workers 8
+
+import argparse
+import glob
+import importlib.util
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+
+CUT_PERCENTILES = [50, 70, 80, 90]
+REQUIRED_COLUMNS = ['전형명', '모집단위', '등록여부', '산출등급']
+
+
+def excel_engine():
+    # python-calamine이 설치되어 있으면 훨씬 빠른 calamine 엔진 사용 (pip install python-calamine)
+    # 없으면 openpyxl (pandas가 read-only 모드로 읽음)
+    return 'calamine' if importlib.util.find_spec('python_calamine') else 'openpyxl'
+
+
+def read_admissions_excel(source):
+    # 필요한 앞의 네 컬럼만 읽음
+    df = pd.read_excel(source, engine=excel_engine(), usecols=range(len(REQUIRED_COLUMNS)))
+    df.columns = REQUIRED_COLUMNS
+
+    # 텍스트 컬럼은 문자열로, 산출등급은 숫자로 맞춰서 Parquet으로 저장할 수 있게 함
+    # 빈 칸은 'nan' 문자열이 아니라 결측(<NA>)으로 남겨 groupby에서 빠지게 함
+    for column in REQUIRED_COLUMNS[:3]:
+        df[column] = df[column].astype('string')
+    df['산출등급'] = pd.to_numeric(df['산출등급'], errors='coerce')
+    return df
+
+
+def compute_cut_table(df):
+    # 입학자 기준으로 모든 (전형명, 모집단위)의 컷을 한 번의 groupby로 계산
+    # quantile은 np.percentile과 같은 선형 보간을 사용하므로 percentile(n)과 결과가 같다
+    admitted = df[df['등록여부'] == '입학자']
+    grouped = admitted.groupby(['전형명', '모집단위'])['산출등급']
+
+    stats = grouped.agg(['min', 'mean', 'max'])
+    quantiles = grouped.quantile([n / 100 for n in CUT_PERCENTILES]).unstack()
+    quantiles.columns = ['상위_%s' % n for n in CUT_PERCENTILES]
+
+    return pd.concat([stats[['min', 'mean']], quantiles, stats[['max']]], axis=1)
+
+
+def find_workbooks(patterns):
+    # 디렉터리는 그 아래의 모든 xlsx, 나머지는 glob 패턴으로 보고 파일 목록을 만듦
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, '**', '*.xlsx'), recursive=True)
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        for path in sorted(matches):
+            # 엑셀이 열려 있을 때 생기는 잠금 파일(~$...)은 제외
+            if not os.path.basename(path).startswith('~$') and path not in paths:
+                paths.append(path)
+    return paths
+
+
+def process_workbook(path):
+    # 작업 프로세스에서 실행: (파일, 컷 표, 행 수, 소요 시간, 오류)를 돌려줌
+    started = time.perf_counter()
+    try:
+        df = read_admissions_excel(path)
+        table = compute_cut_table(df).reset_index()
+        return path, table, len(df), time.perf_counter() - started, None
+    except Exception as e:
+        return path, None, 0, time.perf_counter() - started, f'{type(e).__name__}: {e}'
+
+
+def compute_cuts_for_files(paths, workers=None, on_result=None):
+    # 여러 파일을 프로세스 풀로 나눠 계산하고 (합친 컷 표, 파일별 처리 결과)를 돌려줌
+    tables = {}
+    report = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(process_workbook, path) for path in paths]
+        for future in as_completed(futures):
+            path, table, rows, elapsed, error = future.result()
+            if table is not None:
+                tables[path] = table
+            result = {'파일': path, '행수': rows, '모집단위수': 0 if table is None else len(table),
+                      '소요시간(초)': round(elapsed, 3), '오류': error}
+            report.append(result)
+            if on_result is not None:
+                on_result(result)
+
+    # 완료 순서와 관계없이 입력 파일 순서로 합침
+    ordered = [tables[path].assign(파일=path) for path in paths if path in tables]
+    cuts = pd.concat(ordered, ignore_index=True) if ordered else pd.DataFrame()
+    if not cuts.empty:
+        cuts = cuts[['파일'] + [col for col in cuts.columns if col != '파일']]
+    report = pd.DataFrame(report).set_index('파일').reindex(paths).reset_index()
+    return cuts, report
+
+
+def write_output(cuts, report, output):
+    # xlsx는 '등급컷'/'처리결과' 두 시트로, parquet은 처리결과를 옆 파일(_report.parquet)로 저장
+    if output.endswith('.xlsx'):
+        with pd.ExcelWriter(output, engine='openpyxl') as writer:
+            cuts.to_excel(writer, index=False, sheet_name='등급컷')
+            report.to_excel(writer, index=False, sheet_name='처리결과')
+        return [output]
+
+    report_path = f'{os.path.splitext(output)[0]}_report.parquet'
+    cuts.to_parquet(output, index=False)
+    report.to_parquet(report_path, index=False)
+    return [output, report_path]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='여러 입시결과 엑셀 파일의 등급컷을 한 번에 계산합니다.')
+    parser.add_argument('inputs', nargs='+', help='엑셀 파일, 디렉터리 또는 glob 패턴')
+    parser.add_argument('-o', '--output', default='grade_cuts.xlsx', help='결과 파일 (.xlsx 또는 .parquet)')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='작업 프로세스 수 (기본값: CPU 코어 수)')
+    args = parser.parse_args(argv)
+
+    if not args.output.endswith(('.xlsx', '.parquet')):
+        parser.error('결과 파일은 .xlsx 또는 .parquet 이어야 합니다.')
+
+    paths = find_workbooks(args.inputs)
+    if not paths:
+        parser.error('처리할 xlsx 파일이 없습니다.')
+
+    print(f'{len(paths)}개 파일 처리 시작')
+    started = time.perf_counter()
+
+    def on_result(result):
+        status = f"실패 ({result['오류']})" if result['오류'] else f"{result['모집단위수']}개 모집단위"
+        print(f"  {result['파일']}: {status}, {result['소요시간(초)']}초")
+
+    cuts, report = compute_cuts_for_files(paths, workers=args.workers, on_result=on_result)
+    written = write_output(cuts, report, args.output)
+
+    failed = int(report['오류'].notna().sum())
+    print(f'완료: 성공 {len(paths) - failed}개, 실패 {failed}개, {time.perf_counter() - started:.2f}초')
+    print('저장: ' + ', '.join(written))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,13 +1,48 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from dotenv import load_dotenv
+from contextlib import asynccontextmanager
 import httpx
 import os
 import logging
 import json
-from typing import Optional
+import asyncio
+import math
+import random
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from typing import TYPE_CHECKING, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Windows에는 fcntl이 없으므로 워커마다 각자 동기화합니다.
+    fcntl = None
+
+from api_models import (
+    NEARBY_SCHOOL_COLUMNS, SCHOOL_INFO_COLUMNS, NearbyResponse, SchoolBatchRequest, SchoolBatchResponse,
+    SchoolInfoResponse, SchoolProfileResponse
+)
+from geo_index import GeoIndex, GeoStore, parse_coordinate
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry
+from resilience import CircuitBreaker, CircuitOpenError, TokenBucket, UpstreamGuard
+from response_cache import ResponseCache
+from school_store import SharedSnapshot, SnapshotStore, file_version, normalize_name
+from serializers import (
+    ARROW_FILE_MEDIA_TYPE, ARROW_MEDIA_TYPE, ARROW_MEDIA_TYPES, MSGPACK_MEDIA_TYPE, FastJSONResponse,
+    available_media_types, dumps_json, encode, negotiate
+)
+
+if TYPE_CHECKING:
+    # pandas를 쓰므로 실행 시에는 프로필을 처음 다룰 때 불러옵니다. (get_profile_store)
+    from profile_store import ProfileStore, ProfileTable
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
+# httpx/httpcore는 요청마다 전체 URL(API 키 포함)을 INFO로 남기므로 경고 이상만 기록합니다.
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logging.getLogger("httpcore").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 # 환경 변수 로드
@@ -15,17 +50,344 @@ load_dotenv()
 
 # API 키와 URL 확인
 API_KEY = os.getenv("API_KEY")
-BASE_URL = "https://open.neis.go.kr/hub/schoolInfo"
+BASE_URL = os.getenv("NEIS_BASE_URL", "https://open.neis.go.kr/hub/schoolInfo")
 
+# API 키가 없어도 서버는 시작하고 저장된 스냅샷으로 응답합니다. (업스트림 조회만 503)
 if not API_KEY:
-    raise RuntimeError("API_KEY가 환경 변수에 설정되어 있어야 합니다.")
+    logger.warning("API_KEY가 설정되지 않았습니다. 저장된 데이터로만 응답하고 업스트림 조회는 실패합니다.")
+
+# 업스트림 HTTP 클라이언트 설정 (커넥션 풀 / 타임아웃)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", str(HTTP_TIMEOUT)))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# 페이지 조회 설정 (NEIS는 페이지당 최대 1000건까지 허용)
+NEIS_MAX_PAGE_SIZE = 1000
+PAGE_FETCH_CONCURRENCY = int(os.getenv("PAGE_FETCH_CONCURRENCY", "5"))
+
+# 스트리밍 응답 형식 (한 줄에 학교 하나)
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# 교육청별 분할 조회 시 교육청 하나당 허용하는 최대 대기 시간(초)
+OFFICE_FETCH_TIMEOUT = float(os.getenv("OFFICE_FETCH_TIMEOUT", "15"))
+
+# 일괄 조회 설정 (요청당 최대 이름 수 / 동시에 조회할 이름 수)
+BATCH_MAX_NAMES = int(os.getenv("BATCH_MAX_NAMES", "500"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+# 학교 기본 정보 스냅샷 설정 (주기적으로 전체 목록을 받아 로컬에서 검색)
+SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", "true").lower() in ("1", "true", "yes")
+SNAPSHOT_DB_PATH = os.getenv("SNAPSHOT_DB_PATH", "data/school_snapshot.db")
+SNAPSHOT_REFRESH_INTERVAL = float(os.getenv("SNAPSHOT_REFRESH_INTERVAL", "86400"))
+SNAPSHOT_RETRY_INTERVAL = float(os.getenv("SNAPSHOT_RETRY_INTERVAL", "300"))
+
+# 워커들이 메모리 맵으로 함께 읽는 검색용 스냅샷 (Arrow IPC)
+SNAPSHOT_SHARED_PATH = os.getenv("SNAPSHOT_SHARED_PATH", "data/school_snapshot.arrow")
+
+snapshot_store = SnapshotStore(SNAPSHOT_DB_PATH)
+shared_snapshot = SharedSnapshot(SNAPSHOT_SHARED_PATH)
+
+# 다중 워커 설정
+# 업스트림 동기화는 잠금 파일을 잡은 워커 하나(리더)만 하고, 나머지 워커는 리더가 교체한 파일을 다시 엽니다.
+API_WORKERS = int(os.getenv("API_WORKERS", "1"))
+SYNC_LEADER_LOCK_PATH = os.getenv("SYNC_LEADER_LOCK_PATH", "data/sync_leader.lock")
+SHARED_STORE_POLL_INTERVAL = float(os.getenv("SHARED_STORE_POLL_INTERVAL", "5"))
+
+# 예열 설정: /ready는 아래 항목이 모두 메모리에 올라온 뒤에 200을 반환합니다. (쉼표로 구분)
+# snapshot: NEIS 고등학교 목록, geo: 최근 공시 연도 학교기본정보(학교급별), profiles: 최근 공시 연도 데이터셋 × 학교급
+WARMUP_COMPONENTS = [
+    name.strip() for name in os.getenv("WARMUP_COMPONENTS", "snapshot,geo,profiles").split(",") if name.strip()
+]
+
+# 학교알리미 설정 (대시보드와 같은 API_KEY, BASE_URL 사용)
+ALIMI_BASE_URL = os.getenv("BASE_URL")
+ALIMI_SCHOOL_TYPES = {"02": "초등학교", "03": "중학교", "04": "고등학교"}
+# 학교알리미 공시가 시작된 연도
+ALIMI_FIRST_YEAR = 2008
+# 올해 공시가 아직 없으면 몇 년 전까지 거슬러 올라가 찾을지
+ALIMI_YEAR_LOOKBACK = int(os.getenv("ALIMI_YEAR_LOOKBACK", "2"))
+
+# 학교 위치 색인 설정 (학교알리미 학교기본정보의 위도/경도로 만든 격자 색인)
+GEO_ENABLED = os.getenv("GEO_ENABLED", "true").lower() in ("1", "true", "yes")
+GEO_STORE_PATH = os.getenv("GEO_STORE_PATH", "data/school_locations.json")
+GEO_REFRESH_INTERVAL = float(os.getenv("GEO_REFRESH_INTERVAL", "604800"))
+GEO_RETRY_INTERVAL = float(os.getenv("GEO_RETRY_INTERVAL", "600"))
+GEO_CELL_DEG = float(os.getenv("GEO_CELL_DEG", "0.05"))
+NEARBY_MAX_K = 1000
+NEARBY_MAX_RADIUS_KM = 500
+
+geo_store = GeoStore(GEO_STORE_PATH)
+
+# 학교별 프로필 설정 (공시 연도마다 학교알리미 데이터셋 12종을 학교코드로 조인해 저장)
+PROFILE_PREFETCH = os.getenv("PROFILE_PREFETCH", "true").lower() in ("1", "true", "yes")
+PROFILE_STORE_DIR = os.getenv("PROFILE_STORE_DIR", "data/profiles")
+PROFILE_REFRESH_INTERVAL = float(os.getenv("PROFILE_REFRESH_INTERVAL", "86400"))
+PROFILE_RETRY_INTERVAL = float(os.getenv("PROFILE_RETRY_INTERVAL", "600"))
+PROFILE_CACHE_YEARS = int(os.getenv("PROFILE_CACHE_YEARS", "3"))
+PROFILE_FETCH_CONCURRENCY = int(os.getenv("PROFILE_FETCH_CONCURRENCY", "6"))
+
+_profile_store = None
+
+
+def get_profile_store() -> "ProfileStore":
+    """프로필 저장소를 반환합니다. profile_store 모듈(pandas)은 처음 호출할 때 불러옵니다."""
+    global _profile_store
+    if _profile_store is None:
+        from profile_store import ProfileStore
+        _profile_store = ProfileStore(PROFILE_STORE_DIR)
+    return _profile_store
+
+# 업스트림 응답 캐시 설정 ("데이터 없음"/부분 실패 응답은 NEGATIVE_TTL 적용)
+CACHE_TTL = float(os.getenv("CACHE_TTL", "300"))
+CACHE_NEGATIVE_TTL = float(os.getenv("CACHE_NEGATIVE_TTL", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+CACHE_STALE_TTL = float(os.getenv("CACHE_STALE_TTL", "3600"))
+
+response_cache = ResponseCache(CACHE_TTL, CACHE_NEGATIVE_TTL, CACHE_MAX_ENTRIES, CACHE_STALE_TTL)
+
+# 업스트림 보호 설정 (재시도, 헤지 요청, 호출 한도, 회로 차단기)
+UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "2"))
+UPSTREAM_RETRY_BACKOFF = float(os.getenv("UPSTREAM_RETRY_BACKOFF", "0.2"))
+UPSTREAM_RETRY_BACKOFF_MAX = float(os.getenv("UPSTREAM_RETRY_BACKOFF_MAX", "2"))
+UPSTREAM_HEDGE_PERCENTILE = float(os.getenv("UPSTREAM_HEDGE_PERCENTILE", "0"))
+UPSTREAM_RATE_LIMIT = float(os.getenv("UPSTREAM_RATE_LIMIT", "20"))
+UPSTREAM_RATE_BURST = float(os.getenv("UPSTREAM_RATE_BURST", "40"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RECOVERY_TIME = float(os.getenv("CIRCUIT_RECOVERY_TIME", "30"))
+# 호출 한도는 API 키 하나에 걸리므로 워커 프로세스마다 워커 수로 나눈 몫만 사용합니다.
+UPSTREAM_WORKER_RATE_LIMIT = UPSTREAM_RATE_LIMIT / max(1, API_WORKERS)
+UPSTREAM_WORKER_RATE_BURST = UPSTREAM_RATE_BURST / max(1, API_WORKERS)
+
+upstream_guard = UpstreamGuard(
+    TokenBucket(UPSTREAM_WORKER_RATE_LIMIT, UPSTREAM_WORKER_RATE_BURST),
+    CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RECOVERY_TIME),
+    max_retries=UPSTREAM_MAX_RETRIES,
+    backoff_base=UPSTREAM_RETRY_BACKOFF,
+    backoff_max=UPSTREAM_RETRY_BACKOFF_MAX,
+    hedge_percentile=UPSTREAM_HEDGE_PERCENTILE or None
+)
+
+# 학교알리미는 NEIS와 별개의 서비스이므로 호출 한도와 회로 차단기를 따로 둡니다.
+alimi_guard = UpstreamGuard(
+    TokenBucket(UPSTREAM_WORKER_RATE_LIMIT, UPSTREAM_WORKER_RATE_BURST),
+    CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RECOVERY_TIME),
+    max_retries=UPSTREAM_MAX_RETRIES,
+    backoff_base=UPSTREAM_RETRY_BACKOFF,
+    backoff_max=UPSTREAM_RETRY_BACKOFF_MAX
+)
+
+# 업스트림 응답 본문 로깅: DEBUG 레벨이면 항상, 아니면 LOG_PAYLOAD_SAMPLE_RATE 비율만 INFO로 기록
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0"))
+LOG_PAYLOAD_MAX_CHARS = 200
+
+# /metrics로 내보내는 Prometheus 메트릭
+metrics = MetricsRegistry()
+UPSTREAM_LATENCY = metrics.histogram(
+    "neis_upstream_request_seconds", "NEIS schoolInfo 페이지 요청 시간(초, 재시도와 호출 한도 대기 포함)"
+)
+UPSTREAM_PARSE_TIME = metrics.histogram(
+    "neis_upstream_parse_seconds", "NEIS 응답 JSON 파싱 시간(초)",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+)
+UPSTREAM_RESULTS = metrics.counter(
+    "neis_upstream_results_total", "NEIS 응답 결과별 건수 (success, no_data, error)", ("result",)
+)
+UPSTREAM_IN_FLIGHT = metrics.gauge(
+    "neis_upstream_requests_in_flight", "응답을 기다리는 NEIS 요청 수"
+)
+HANDLER_LATENCY = metrics.histogram(
+    "http_request_duration_seconds", "API 핸들러 처리 시간(초)", ("method", "route", "status")
+)
+HANDLER_IN_FLIGHT = metrics.gauge(
+    "http_requests_in_flight", "처리 중인 API 요청 수"
+)
+metrics.counter(
+    "neis_upstream_retries_total", "NEIS 재시도 횟수", function=lambda: upstream_guard.retries
+)
+metrics.counter(
+    "neis_upstream_hedged_requests_total", "보낸 헤지 요청 수와 헤지 요청이 먼저 응답한 수", ("result",),
+    function=lambda: {("sent",): upstream_guard.hedges, ("won",): upstream_guard.hedge_wins}
+)
+metrics.counter(
+    "neis_upstream_rate_limited_total", "호출 한도 때문에 대기한 요청 수",
+    function=lambda: upstream_guard.rate_limiter.waits
+)
+metrics.counter(
+    "neis_upstream_circuit_rejected_total", "회로 차단으로 보내지 않은 요청 수",
+    function=lambda: upstream_guard.breaker.rejected
+)
+metrics.gauge(
+    "neis_upstream_circuit_state", "회로 차단기 상태 (해당 상태이면 1)", ("state",),
+    function=lambda: {
+        (state,): int(upstream_guard.breaker.state == state)
+        for state in (CircuitBreaker.CLOSED, CircuitBreaker.OPEN, CircuitBreaker.HALF_OPEN)
+    }
+)
+metrics.gauge(
+    "response_cache_entries", "응답 캐시 항목 수", function=lambda: len(response_cache)
+)
+metrics.gauge(
+    "response_cache_inflight", "캐시 미스로 진행 중인 업스트림 로드 수",
+    function=lambda: response_cache.stats()["inflight"]
+)
+metrics.counter(
+    "response_cache_lookups_total", "응답 캐시 조회 결과별 건수 (hit, miss, coalesced)", ("result",),
+    function=lambda: {
+        ("hit",): response_cache.hits,
+        ("miss",): response_cache.misses,
+        ("coalesced",): response_cache.coalesced
+    }
+)
+metrics.gauge(
+    "school_geo_index_entries", "학교 위치 색인에 들어 있는 학교 수",
+    function=lambda: len(app.state.geo_index) if getattr(app.state, "geo_index", None) is not None else 0
+)
+
+
+def should_log_payload() -> bool:
+    """업스트림 응답 본문을 기록할지 결정합니다. 부하 상황에서 INFO 로그 비용을 줄이기 위해 표본만 기록합니다."""
+    if logger.isEnabledFor(logging.DEBUG):
+        return True
+    return LOG_PAYLOAD_SAMPLE_RATE > 0 and random.random() < LOG_PAYLOAD_SAMPLE_RATE
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """모든 핸들러가 공유하는 업스트림 HTTP 클라이언트를 생성합니다."""
+    http2 = HTTP2_ENABLED
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("h2 패키지가 설치되어 있지 않아 HTTP/2를 비활성화합니다.")
+            http2 = False
+
+    return httpx.AsyncClient(
+        verify=False,
+        http2=http2,
+        timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT, read=HTTP_READ_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 수명 동안 HTTP 클라이언트와 스냅샷 동기화 작업을 관리합니다."""
+    app.state.http_client = create_http_client()
+    logger.info(
+        f"HTTP 클라이언트 생성: max_connections={HTTP_MAX_CONNECTIONS}, "
+        f"max_keepalive={HTTP_MAX_KEEPALIVE_CONNECTIONS}, keepalive_expiry={HTTP_KEEPALIVE_EXPIRY}"
+    )
+
+    app.state.school_index = None
+    app.state.snapshot_synced_at = None
+    app.state.snapshot_lock = asyncio.Lock()
+    app.state.geo_index = None
+    app.state.geo_synced_at = None
+    app.state.geo_lock = asyncio.Lock()
+    app.state.profiles = OrderedDict()
+    app.state.profile_locks = {}
+    app.state.profile_latest_year = None
+    app.state.profile_synced_at = None
+    app.state.store_versions = {}
+    app.state.is_sync_leader = False
+    app.state.sync_leader_file = None
+    app.state.sync_tasks = []
+    app.state.started_at = time.time()
+    app.state.warmed_up = False
+
+    # 저장된 파일을 먼저 열어 두므로 새 워커는 동기화를 기다리지 않고 바로 응답합니다.
+    if SNAPSHOT_ENABLED:
+        await load_school_snapshot(app)
+    if GEO_ENABLED:
+        await load_geo_index(app)
+        if not ALIMI_BASE_URL:
+            logger.warning("BASE_URL(학교알리미)이 설정되지 않아 위치 색인을 동기화하지 않습니다.")
+    if PROFILE_PREFETCH:
+        await load_latest_profiles(app)
+
+    if acquire_sync_leadership(app):
+        start_sync_loops(app)
+    app.state.sync_tasks.append(asyncio.create_task(watch_shared_stores(app)))
+
+    try:
+        yield
+    finally:
+        for task in app.state.sync_tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        if app.state.sync_leader_file is not None:
+            app.state.sync_leader_file.close()
+        await app.state.http_client.aclose()
+        logger.info("HTTP 클라이언트를 종료했습니다.")
+
 
 app = FastAPI(
     title="School Info API",
     description="학교 정보 조회 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
+
+class RequestMetricsMiddleware:
+    """
+    라우트별 핸들러 처리 시간과 처리 중인 요청 수를 기록하는 ASGI 미들웨어
+    send만 감싸 응답 시작 시점에 상태 코드와 시간을 기록하므로 요청마다 태스크나 스트림을 더 만들지 않습니다.
+    (스트리밍 응답은 첫 응답까지의 시간)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        recorded = False
+
+        def record(status: int):
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            HANDLER_IN_FLIGHT.dec()
+            # 라우터가 scope에 매칭된 route를 넣어 둡니다.
+            route = scope.get("route")
+            HANDLER_LATENCY.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=route.path if route is not None else "unmatched",
+                status=status
+            )
+
+        async def send_with_metrics(message):
+            if message["type"] == "http.response.start":
+                record(message["status"])
+            await send(message)
+
+        HANDLER_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            # 응답을 시작하지 못하고 예외로 끝난 요청은 500으로 기록합니다.
+            record(500)
+
+
+app.add_middleware(RequestMetricsMiddleware)
+
+
 # 시도교육청 코드 목록
 ATPT_OFCDC_SC_CODES = [
     "B10",  # 서울특별시교육청
@@ -47,91 +409,1068 @@ ATPT_OFCDC_SC_CODES = [
     "T10",  # 제주특별자치도교육청
 ]
 
-@app.get("/api/school-info")
+async def fetch_school_page(client: httpx.AsyncClient, params: dict, page_index: int, page_size: int):
+    """NEIS schoolInfo 한 페이지를 조회하여 (전체 건수, 행 목록)을 반환합니다."""
+    require_api_key()
+    page_params = {**params, "pIndex": str(page_index), "pSize": str(page_size)}
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"API 요청: URL={BASE_URL}, 파라미터={page_params}")
+
+    started = time.perf_counter()
+    try:
+        with UPSTREAM_IN_FLIGHT.track_inprogress():
+            response = await upstream_guard.get(client, BASE_URL, params=page_params)
+    except CircuitOpenError:
+        # 요청을 보내지 않았으므로 결과/지연 시간에 넣지 않습니다. (neis_upstream_circuit_rejected_total)
+        raise
+    except Exception:
+        UPSTREAM_RESULTS.inc(result="error")
+        UPSTREAM_LATENCY.observe(time.perf_counter() - started)
+        raise
+    UPSTREAM_LATENCY.observe(time.perf_counter() - started)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"API 응답: 상태 코드={response.status_code}")
+    if should_log_payload():
+        logger.info(f"API 응답 내용: {response.text[:LOG_PAYLOAD_MAX_CHARS]}...")
+
+    if response.status_code != 200:
+        UPSTREAM_RESULTS.inc(result="error")
+        # 업스트림 4xx는 그대로 전달하고, 5xx는 게이트웨이 오류(502)로 응답합니다.
+        raise HTTPException(
+            status_code=response.status_code if response.status_code < 500 else 502,
+            detail=f"학교알리미 API 오류: {response.text[:LOG_PAYLOAD_MAX_CHARS]}"
+        )
+
+    try:
+        with UPSTREAM_PARSE_TIME.time():
+            data = response.json()
+    except json.JSONDecodeError as e:
+        UPSTREAM_RESULTS.inc(result="error")
+        logger.error(f"JSON 파싱 오류: {str(e)}")
+        raise HTTPException(
+            status_code=502,
+            detail="API 응답을 처리하는 중 오류가 발생했습니다."
+        )
+
+    # 에러 응답 처리
+    if "RESULT" in data:
+        error_msg = data["RESULT"]["MESSAGE"]
+        if "해당하는 데이터가 없습니다" in error_msg:
+            UPSTREAM_RESULTS.inc(result="no_data")
+            logger.debug("검색 결과가 없습니다.")
+            return 0, []
+        UPSTREAM_RESULTS.inc(result="error")
+        logger.error(f"API 오류: {error_msg}")
+        raise HTTPException(
+            status_code=502,
+            detail=f"학교알리미 API 오류: {error_msg}"
+        )
+
+    # 정상 응답 처리
+    if "schoolInfo" not in data:
+        UPSTREAM_RESULTS.inc(result="no_data")
+        logger.debug("검색 결과가 없습니다.")
+        return 0, []
+
+    UPSTREAM_RESULTS.inc(result="success")
+    head = data["schoolInfo"][0]["head"]
+    total_count = int(head[0]["list_total_count"])
+    return total_count, data["schoolInfo"][1]["row"]
+
+
+async def iter_school_pages(client: httpx.AsyncClient, params: dict, page_size: int = NEIS_MAX_PAGE_SIZE):
+    """
+    첫 페이지를 먼저 내보낸 뒤, list_total_count를 기준으로 나머지 페이지를 동시에 조회하여
+    페이지 순서대로 (전체 건수, 행 목록)을 내보냅니다.
+    """
+    total_count, rows = await fetch_school_page(client, params, 1, page_size)
+    yield total_count, rows
+
+    page_count = math.ceil(total_count / page_size)
+    if page_count <= 1:
+        return
+
+    semaphore = asyncio.Semaphore(PAGE_FETCH_CONCURRENCY)
+
+    async def fetch_page(page_index: int):
+        async with semaphore:
+            _, page_rows = await fetch_school_page(client, params, page_index, page_size)
+            return page_rows
+
+    tasks = [asyncio.ensure_future(fetch_page(i)) for i in range(2, page_count + 1)]
+    try:
+        for task in tasks:
+            yield total_count, await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def fetch_all_school_pages(client: httpx.AsyncClient, params: dict, page_size: int = NEIS_MAX_PAGE_SIZE):
+    """모든 페이지를 동시에 조회하여 순서대로 합칩니다."""
+    total_count, rows = 0, []
+    async for total_count, page_rows in iter_school_pages(client, params, page_size):
+        rows.extend(page_rows)
+    return total_count, rows
+
+
+def parse_office_codes(office) -> list:
+    """
+    office 파라미터("all" 또는 쉼표로 구분한 코드 목록, 또는 그 목록)를 교육청 코드 목록으로 변환합니다.
+    항목마다 따로 확인하며, 어느 항목이든 "all"이면 전체 교육청입니다.
+    """
+    items = office.split(",") if isinstance(office, str) else [
+        part for item in office for part in item.split(",")
+    ]
+    codes = []
+    for code in items:
+        code = code.strip().upper()
+        if code == "ALL":
+            return list(ATPT_OFCDC_SC_CODES)
+        if code and code not in codes:
+            codes.append(code)
+
+    invalid = [code for code in codes if code not in ATPT_OFCDC_SC_CODES]
+    if invalid or not codes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"알 수 없는 시도교육청 코드입니다: {', '.join(invalid) or ','.join(items)}"
+        )
+    return codes
+
+
+async def fetch_schools_by_office(client: httpx.AsyncClient, params: dict, office_codes: list):
+    """
+    교육청별로 동시에 조회한 뒤 학교 코드 기준으로 중복을 제거하여 합칩니다.
+    시간 초과나 오류가 난 교육청은 건너뛰고 errors에 기록합니다.
+    """
+    async def fetch_office(code: str):
+        office_params = {**params, "ATPT_OFCDC_SC_CODE": code}
+        _, rows = await asyncio.wait_for(
+            fetch_all_school_pages(client, office_params),
+            timeout=OFFICE_FETCH_TIMEOUT
+        )
+        return rows
+
+    results = await asyncio.gather(
+        *(fetch_office(code) for code in office_codes),
+        return_exceptions=True
+    )
+
+    rows = []
+    seen = set()
+    errors = []
+    for code, result in zip(office_codes, results):
+        if isinstance(result, BaseException):
+            if isinstance(result, asyncio.TimeoutError):
+                message = f"{OFFICE_FETCH_TIMEOUT}초 내에 응답이 없습니다."
+            elif isinstance(result, HTTPException):
+                message = result.detail
+            else:
+                message = str(result) or type(result).__name__
+            logger.warning(f"교육청 조회 실패: {code} - {message}")
+            errors.append({"office": code, "error": message})
+            continue
+
+        for row in result:
+            key = row.get("SD_SCHUL_CODE") or (row.get("ATPT_OFCDC_SC_CODE"), row.get("SCHUL_NM"))
+            if key in seen:
+                continue
+            seen.add(key)
+            rows.append(row)
+
+    return rows, errors
+
+
+async def stream_schools_by_office(client: httpx.AsyncClient, params: dict, office_codes: list):
+    """
+    교육청별 조회를 동시에 실행하면서 도착한 페이지부터 ("rows", 행 목록)을 내보냅니다.
+    마지막에는 실패한 교육청 목록을 ("errors", 오류 목록)으로 내보냅니다.
+    """
+    queue = asyncio.Queue()
+
+    async def consume_office(code: str):
+        office_params = {**params, "ATPT_OFCDC_SC_CODE": code}
+        async for _, rows in iter_school_pages(client, office_params):
+            await queue.put(("rows", code, rows))
+
+    async def pump(code: str):
+        try:
+            await asyncio.wait_for(consume_office(code), timeout=OFFICE_FETCH_TIMEOUT)
+        except asyncio.TimeoutError:
+            await queue.put(("error", code, f"{OFFICE_FETCH_TIMEOUT}초 내에 응답이 없습니다."))
+        except HTTPException as e:
+            await queue.put(("error", code, e.detail))
+        except Exception as e:
+            await queue.put(("error", code, str(e) or type(e).__name__))
+        finally:
+            await queue.put(("done", code, None))
+
+    tasks = [asyncio.ensure_future(pump(code)) for code in office_codes]
+    seen = set()
+    errors = []
+    remaining = len(tasks)
+    try:
+        while remaining:
+            kind, code, payload = await queue.get()
+            if kind == "done":
+                remaining -= 1
+            elif kind == "error":
+                logger.warning(f"교육청 조회 실패: {code} - {payload}")
+                errors.append({"office": code, "error": payload})
+            else:
+                rows = []
+                for row in payload:
+                    key = row.get("SD_SCHUL_CODE") or (row.get("ATPT_OFCDC_SC_CODE"), row.get("SCHUL_NM"))
+                    if key not in seen:
+                        seen.add(key)
+                        rows.append(row)
+                if rows:
+                    yield "rows", rows
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    yield "errors", errors
+
+
+def to_school_info(school: dict) -> dict:
+    """NEIS 응답 행을 API 응답 형식으로 변환합니다."""
+    return {
+        "schoolName": school.get("SCHUL_NM", ""),
+        "schoolType": school.get("SCHUL_KND_SC_NM", "고등학교"),
+        "location": f"{school.get('LCTN_SC_NM', '')} {school.get('ATPT_OFCDC_SC_NM', '')}",
+        "foundation": school.get("FOND_SC_NM", ""),
+        "studentCount": school.get("COEDU_SC_NM", "0"),
+        "teacherCount": school.get("HGHT_SC_NM", "0")
+    }
+
+
+def require_api_key():
+    """API 키 없이 업스트림을 조회하려 하면 503 오류를 발생시킵니다."""
+    if not API_KEY:
+        raise HTTPException(
+            status_code=503,
+            detail="API_KEY가 설정되지 않아 업스트림 API를 조회할 수 없습니다."
+        )
+
+
+def build_school_params(school_name: Optional[str] = None) -> dict:
+    """NEIS schoolInfo 기본 요청 파라미터를 만듭니다."""
+    params = {
+        "KEY": API_KEY,
+        "Type": "json",
+        "SCHUL_KND_SC_NM": "고등학교"
+    }
+
+    # 학교 이름이 있는 경우 검색 조건 추가
+    if school_name:
+        params["SCHUL_NM"] = school_name
+    return params
+
+
+async def load_school_snapshot(app: FastAPI):
+    """
+    공유 스냅샷 파일을 메모리 맵으로 열어 검색 인덱스로 씁니다.
+    공유 파일이 아직 없으면 SQLite에 저장된 스냅샷으로 만듭니다.
+    """
+    index, synced_at, version = await asyncio.to_thread(shared_snapshot.load)
+    if index is None:
+        rows, synced_at = await asyncio.to_thread(snapshot_store.load)
+        if not rows:
+            return
+        await asyncio.to_thread(shared_snapshot.save, rows, to_school_info, synced_at)
+        index, synced_at, version = await asyncio.to_thread(shared_snapshot.load)
+
+    app.state.store_versions["snapshot"] = version
+    if len(index):
+        app.state.school_index = index
+        app.state.snapshot_synced_at = synced_at
+        logger.info(f"저장된 스냅샷을 불러왔습니다: {len(index)}개 학교")
+
+
+async def sync_school_snapshot(app: FastAPI) -> int:
+    """NEIS에서 전체 고등학교 목록을 받아 스냅샷과 검색 인덱스를 교체합니다."""
+    async with app.state.snapshot_lock:
+        rows, errors = await fetch_schools_by_office(
+            app.state.http_client, build_school_params(), ATPT_OFCDC_SC_CODES
+        )
+        # 일부 교육청이 빠진 목록으로 기존 스냅샷을 덮어쓰지 않습니다.
+        if errors:
+            failed = ", ".join(error["office"] for error in errors)
+            raise RuntimeError(f"일부 교육청 조회에 실패하여 스냅샷을 갱신하지 않았습니다: {failed}")
+
+        synced_at = await asyncio.to_thread(snapshot_store.save, rows)
+        await asyncio.to_thread(shared_snapshot.save, rows, to_school_info, synced_at)
+        index, synced_at, version = await asyncio.to_thread(shared_snapshot.load)
+        app.state.store_versions["snapshot"] = version
+        app.state.school_index = index
+        app.state.snapshot_synced_at = synced_at
+        logger.info(f"스냅샷 동기화 완료: {len(rows)}개 학교")
+        return len(rows)
+
+
+async def run_sync_loop(app: FastAPI, name: str, sync, synced_at_attr: str,
+                        refresh_interval: float, retry_interval: float):
+    """
+    마지막 동기화 시각(app.state.<synced_at_attr>)으로부터 refresh_interval마다 sync(app)을 실행합니다.
+    실패하면 retry_interval 뒤 다시 시도합니다.
+    """
+    while True:
+        synced_at = getattr(app.state, synced_at_attr)
+        if synced_at is not None:
+            await asyncio.sleep(max(0.0, synced_at + refresh_interval - time.time()))
+        try:
+            await sync(app)
+        except Exception as e:
+            logger.error(f"{name} 동기화 실패: {str(e)}")
+            await asyncio.sleep(retry_interval)
+
+
+def acquire_sync_leadership(app: FastAPI) -> bool:
+    """
+    잠금 파일을 잡아 이 워커가 업스트림 동기화를 맡을 수 있으면 True를 반환합니다.
+    잠금은 프로세스가 끝나면 풀리므로 리더 워커가 죽으면 다른 워커가 이어받습니다.
+    fcntl이 없는 환경(Windows)에서는 항상 True입니다.
+    """
+    if app.state.is_sync_leader:
+        return True
+    if fcntl is None:
+        app.state.is_sync_leader = True
+        return True
+
+    directory = os.path.dirname(SYNC_LEADER_LOCK_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    lock_file = open(SYNC_LEADER_LOCK_PATH, "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    app.state.sync_leader_file = lock_file
+    app.state.is_sync_leader = True
+    logger.info(f"동기화 리더 워커가 되었습니다: pid={os.getpid()}")
+    return True
+
+
+def start_sync_loops(app: FastAPI):
+    """리더 워커에서 스냅샷 / 위치 색인 / 프로필 동기화 작업을 시작합니다."""
+    loops = []
+    if SNAPSHOT_ENABLED:
+        loops.append(("스냅샷", sync_school_snapshot, "snapshot_synced_at",
+                      SNAPSHOT_REFRESH_INTERVAL, SNAPSHOT_RETRY_INTERVAL))
+    if GEO_ENABLED and ALIMI_BASE_URL:
+        loops.append(("위치 색인", sync_geo_index, "geo_synced_at", GEO_REFRESH_INTERVAL, GEO_RETRY_INTERVAL))
+    if PROFILE_PREFETCH and ALIMI_BASE_URL:
+        loops.append(("학교 프로필", sync_latest_profiles, "profile_synced_at",
+                      PROFILE_REFRESH_INTERVAL, PROFILE_RETRY_INTERVAL))
+    for loop in loops:
+        app.state.sync_tasks.append(asyncio.create_task(run_sync_loop(app, *loop)))
+
+
+async def watch_shared_stores(app: FastAPI):
+    """
+    SHARED_STORE_POLL_INTERVAL마다 다른 워커가 교체한 파일(스냅샷, 위치 목록, 프로필)을 다시 엽니다.
+    (리더의 주기 동기화뿐 아니라 아무 워커에서나 실행된 /api/school-info/refresh도 반영됩니다.)
+    리더 워커가 종료되어 잠금이 풀리면 리더가 아니던 워커가 동기화를 이어받습니다.
+    """
+    watchers = []
+    if SNAPSHOT_ENABLED:
+        watchers.append(("snapshot", shared_snapshot.version, load_school_snapshot))
+    if GEO_ENABLED:
+        watchers.append(("geo", lambda: file_version(GEO_STORE_PATH), load_geo_index))
+    if PROFILE_PREFETCH:
+        watchers.append(("profiles", latest_profile_version, reload_latest_profiles))
+
+    while True:
+        await asyncio.sleep(SHARED_STORE_POLL_INTERVAL)
+        if not app.state.is_sync_leader and acquire_sync_leadership(app):
+            start_sync_loops(app)
+        for name, version, reload in watchers:
+            if await asyncio.to_thread(version) == app.state.store_versions.get(name):
+                continue
+            try:
+                await reload(app)
+            except Exception as e:
+                logger.error(f"공유 파일을 다시 열지 못했습니다({name}): {str(e)}")
+        if not app.state.warmed_up and warmup_status(app)["ready"]:
+            app.state.warmed_up = True
+            logger.info(f"예열 완료: 시작 후 {time.time() - app.state.started_at:.1f}초")
+
+
+def warmup_status(app: FastAPI) -> dict:
+    """
+    WARMUP_COMPONENTS 항목별 준비 상태를 반환합니다. 꺼져 있거나 동기화할 수 없는 항목
+    (학교알리미 BASE_URL이 없을 때의 geo, profiles)은 기다리지 않습니다.
+    """
+    latest_year = app.state.profile_latest_year
+    profile_entry = app.state.profiles.get(latest_year) if latest_year else None
+    components = {
+        "snapshot": (SNAPSHOT_ENABLED, app.state.school_index is not None,
+                     app.state.school_index, app.state.snapshot_synced_at),
+        "geo": (GEO_ENABLED and bool(ALIMI_BASE_URL), app.state.geo_index is not None,
+                app.state.geo_index, app.state.geo_synced_at),
+        "profiles": (PROFILE_PREFETCH and bool(ALIMI_BASE_URL), latest_year is not None,
+                     profile_entry[0] if profile_entry else None, app.state.profile_synced_at),
+    }
+
+    checks = {}
+    for name in WARMUP_COMPONENTS:
+        enabled, ready, index, synced_at = components.get(name, (False, False, None, None))
+        if enabled:
+            checks[name] = {
+                "ready": ready,
+                "count": len(index) if index is not None else None,
+                "syncedAt": synced_at
+            }
+    return {
+        "ready": all(check["ready"] for check in checks.values()),
+        "uptime": round(time.time() - app.state.started_at, 1),
+        "syncLeader": app.state.is_sync_leader,
+        "checks": checks
+    }
+
+
+def alimi_years() -> list:
+    """조회할 공시 연도 목록 (올해부터 ALIMI_YEAR_LOOKBACK년 전까지)"""
+    this_year = time.localtime().tm_year
+    return [str(year) for year in range(this_year, this_year - ALIMI_YEAR_LOOKBACK - 1, -1)]
+
+
+async def fetch_alimi_dataset(client: httpx.AsyncClient, api_type: str, school_type: str, year: str) -> list:
+    """학교알리미 공시 데이터(apiType × 학교급 × 공시 연도)를 조회합니다. 데이터가 없으면 빈 목록을 반환합니다."""
+    require_api_key()
+    params = {"apiKey": API_KEY, "apiType": api_type, "pbanYr": year, "schulKndCode": school_type}
+    response = await alimi_guard.get(client, ALIMI_BASE_URL, params=params)
+    if response.status_code != 200:
+        raise HTTPException(
+            status_code=response.status_code if response.status_code < 500 else 502,
+            detail=f"학교알리미 API 오류: {response.text[:LOG_PAYLOAD_MAX_CHARS]}"
+        )
+
+    try:
+        data = response.json()
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON 파싱 오류: {str(e)}")
+        raise HTTPException(
+            status_code=502,
+            detail="학교알리미 API 응답을 처리하는 중 오류가 발생했습니다."
+        )
+
+    # 실제 데이터는 'list' 키에 있음
+    if data.get("resultCode") == "success":
+        return data.get("list") or []
+    return []
+
+
+async def fetch_latest_alimi_dataset(client: httpx.AsyncClient, api_type: str, school_type: str):
+    """가장 최근 공시 연도의 데이터를 (연도, 행 목록)으로 반환합니다. 어느 연도에도 없으면 (None, [])"""
+    for year in alimi_years():
+        rows = await fetch_alimi_dataset(client, api_type, school_type, year)
+        if rows:
+            return year, rows
+    return None, []
+
+
+def to_geo_record(row: dict) -> dict:
+    """학교알리미 학교기본정보 행을 위치 색인 항목으로 변환합니다. 좌표가 없으면 lat/lon은 None"""
+    school_type = row.get("SCHUL_KND_SC_CODE", "")
+    return {
+        "schoolCode": row.get("SCHUL_CODE", ""),
+        "schoolName": row.get("SCHUL_NM", ""),
+        "schoolType": ALIMI_SCHOOL_TYPES.get(school_type, school_type),
+        "office": row.get("ATPT_OFCDC_ORG_NM", ""),
+        "address": row.get("SCHUL_RDNMA") or "",
+        "lat": parse_coordinate(row.get("LTTUD"), -90, 90),
+        "lon": parse_coordinate(row.get("LGTUD"), -180, 180)
+    }
+
+
+async def load_geo_index(app: FastAPI):
+    """디스크에 저장된 학교 위치 목록을 읽어 위치 색인을 만듭니다."""
+    app.state.store_versions["geo"] = file_version(GEO_STORE_PATH)
+    records, synced_at = await asyncio.to_thread(geo_store.load)
+    if records:
+        app.state.geo_index = await asyncio.to_thread(GeoIndex, records, cell_deg=GEO_CELL_DEG)
+        app.state.geo_synced_at = synced_at
+        logger.info(f"저장된 학교 위치를 불러왔습니다: {len(app.state.geo_index)}개 학교")
+
+
+async def sync_geo_index(app: FastAPI) -> int:
+    """학교알리미에서 초·중·고 학교기본정보를 받아 위치 목록과 색인을 교체합니다."""
+    async with app.state.geo_lock:
+        client = app.state.http_client
+        results = await asyncio.gather(
+            *(fetch_latest_alimi_dataset(client, "0", school_type) for school_type in ALIMI_SCHOOL_TYPES),
+            return_exceptions=True
+        )
+        # 일부 학교급이 빠진 목록으로 기존 색인을 덮어쓰지 않습니다.
+        failed = [
+            ALIMI_SCHOOL_TYPES[school_type]
+            for school_type, result in zip(ALIMI_SCHOOL_TYPES, results)
+            if isinstance(result, BaseException) or not result[1]
+        ]
+        if failed:
+            raise RuntimeError(f"일부 학교급 조회에 실패하여 위치 색인을 갱신하지 않았습니다: {', '.join(failed)}")
+
+        records = [
+            record
+            for _, rows in results
+            for record in map(to_geo_record, rows)
+            if record["lat"] is not None and record["lon"] is not None
+        ]
+        synced_at = await asyncio.to_thread(geo_store.save, records)
+        app.state.store_versions["geo"] = file_version(GEO_STORE_PATH)
+        app.state.geo_index = await asyncio.to_thread(GeoIndex, records, cell_deg=GEO_CELL_DEG)
+        app.state.geo_synced_at = synced_at
+        logger.info(f"위치 색인 동기화 완료: {len(records)}개 학교")
+        return len(records)
+
+
+def cache_profile_table(app: FastAPI, year: str, table: "ProfileTable", synced_at: float):
+    """프로필 테이블을 메모리에 보관합니다. PROFILE_CACHE_YEARS개 연도를 넘으면 오래 쓰지 않은 연도부터 버립니다."""
+    profiles = app.state.profiles
+    profiles[year] = (table, synced_at)
+    profiles.move_to_end(year)
+    while len(profiles) > PROFILE_CACHE_YEARS:
+        profiles.popitem(last=False)
+
+
+async def build_profile_table(app: FastAPI, year: str) -> "ProfileTable":
+    """공시 연도 하나의 데이터셋 12종 × 학교급 3종을 받아 학교코드로 조인합니다."""
+    from profile_store import ProfileTable
+    from school_schemas import API_TYPES
+
+    client = app.state.http_client
+    semaphore = asyncio.Semaphore(PROFILE_FETCH_CONCURRENCY)
+
+    async def fetch(api_type: str, school_type: str) -> list:
+        async with semaphore:
+            return await fetch_alimi_dataset(client, api_type, school_type, year)
+
+    jobs = [(api_type, school_type) for api_type in API_TYPES.values() for school_type in ALIMI_SCHOOL_TYPES]
+    results = await asyncio.gather(*(fetch(*job) for job in jobs), return_exceptions=True)
+
+    datasets = {}
+    failed = []
+    for (api_type, school_type), result in zip(jobs, results):
+        if isinstance(result, BaseException):
+            failed.append(f"{api_type}/{ALIMI_SCHOOL_TYPES[school_type]}")
+            continue
+        datasets.setdefault(api_type, []).extend(result)
+    # 일부 데이터셋이 빠진 테이블은 저장하지 않습니다.
+    if failed:
+        raise RuntimeError(f"일부 데이터셋 조회에 실패하여 {year}년 프로필을 만들지 않았습니다: {', '.join(failed)}")
+    return await asyncio.to_thread(ProfileTable.build, datasets)
+
+
+def lock_profile_year(profile_store, year: str):
+    """
+    공시 연도별 잠금 파일을 잡아 한 워커만 그 연도의 프로필을 만들게 합니다.
+    다른 워커가 잡고 있으면 풀릴 때까지 기다립니다. 닫으면 풀리는 파일을 반환하고, fcntl이 없으면 None입니다.
+    """
+    if fcntl is None:
+        return None
+    os.makedirs(profile_store.directory, exist_ok=True)
+    lock_file = open(f"{profile_store.path(year)}.lock", "a")
+    fcntl.flock(lock_file, fcntl.LOCK_EX)
+    return lock_file
+
+
+async def load_profile_table(app: FastAPI, year: str, refresh: bool = False):
+    """
+    메모리 → 디스크 → 학교알리미 순서로 공시 연도의 (프로필 테이블, 만든 시각)을 가져옵니다.
+    같은 연도를 동시에 요청하면 (다른 워커 프로세스까지) 한 번만 만듭니다. refresh가 True이면 학교알리미에서 다시 만듭니다.
+    """
+    entry = app.state.profiles.get(year)
+    if entry is not None and not refresh:
+        app.state.profiles.move_to_end(year)
+        return entry
+
+    async with app.state.profile_locks.setdefault(year, asyncio.Lock()):
+        entry = app.state.profiles.get(year)
+        if entry is not None and not refresh:
+            return entry
+
+        profile_store = await asyncio.to_thread(get_profile_store)
+        saved_version = file_version(profile_store.path(year))
+        # 다른 워커가 같은 연도를 만드는 중이면 끝날 때까지 기다렸다가 그 파일을 사용합니다.
+        lock_file = await asyncio.to_thread(lock_profile_year, profile_store, year)
+        try:
+            rebuilt = file_version(profile_store.path(year)) != saved_version
+            table, synced_at = (None, None) if refresh and not rebuilt else await asyncio.to_thread(profile_store.load, year)
+            if table is None:
+                if not ALIMI_BASE_URL:
+                    raise RuntimeError("BASE_URL(학교알리미)이 설정되지 않았습니다.")
+                table = await build_profile_table(app, year)
+                # 공시가 없는 연도는 저장하지 않고 메모리에만 둡니다. (올해 공시가 나오면 갱신 작업이 다시 만듦)
+                if len(table):
+                    synced_at = await asyncio.to_thread(profile_store.save, year, table)
+                else:
+                    synced_at = time.time()
+                logger.info(f"{year}년 학교 프로필 생성: {len(table)}개 학교")
+        finally:
+            if lock_file is not None:
+                lock_file.close()
+
+        cache_profile_table(app, year, table, synced_at)
+        return table, synced_at
+
+
+async def load_latest_profiles(app: FastAPI):
+    """디스크에 저장된 가장 최근 연도의 프로필 테이블을 불러옵니다."""
+    app.state.store_versions["profiles"] = await asyncio.to_thread(latest_profile_version)
+    years = await asyncio.to_thread(lambda: get_profile_store().years())
+    if not years:
+        return
+    table, synced_at = await load_profile_table(app, years[0])
+    app.state.profile_latest_year = years[0]
+    app.state.profile_synced_at = synced_at
+    logger.info(f"저장된 {years[0]}년 학교 프로필을 불러왔습니다: {len(table)}개 학교")
+
+
+def latest_profile_version():
+    """디스크에 저장된 가장 최근 연도 프로필 파일의 (연도, 파일 버전). 없으면 None"""
+    profile_store = get_profile_store()
+    years = profile_store.years()
+    return (years[0], file_version(profile_store.path(years[0]))) if years else None
+
+
+async def reload_latest_profiles(app: FastAPI):
+    """다른 워커가 저장한 가장 최근 연도의 프로필 테이블을 메모리 캐시와 상관없이 다시 읽습니다."""
+    version = await asyncio.to_thread(latest_profile_version)
+    app.state.store_versions["profiles"] = version
+    if version is None:
+        return
+    year = version[0]
+    table, synced_at = await asyncio.to_thread(get_profile_store().load, year)
+    if table is None:
+        return
+    cache_profile_table(app, year, table, synced_at)
+    app.state.profile_latest_year = year
+    app.state.profile_synced_at = synced_at
+    logger.info(f"{year}년 학교 프로필을 다시 불러왔습니다: {len(table)}개 학교")
+
+
+async def sync_latest_profiles(app: FastAPI) -> int:
+    """공시가 있는 가장 최근 연도의 프로필 테이블을 학교알리미에서 다시 만듭니다."""
+    for year in alimi_years():
+        table, synced_at = await load_profile_table(app, year, refresh=True)
+        if len(table):
+            app.state.profile_latest_year = year
+            app.state.profile_synced_at = synced_at
+            app.state.store_versions["profiles"] = await asyncio.to_thread(latest_profile_version)
+            return len(table)
+    raise RuntimeError(f"최근 {ALIMI_YEAR_LOOKBACK + 1}년 동안의 공시 데이터가 없습니다.")
+
+
+def to_ndjson(schools: list) -> bytes:
+    """변환된 학교 목록을 한 줄에 한 학교씩 NDJSON으로 직렬화합니다."""
+    return b"".join(dumps_json(school) + b"\n" for school in schools)
+
+
+async def stream_school_info(client: httpx.AsyncClient, params: dict, office_codes: Optional[list]):
+    """업스트림 페이지가 도착하는 대로 학교 목록을 NDJSON으로 내보냅니다."""
+    try:
+        if office_codes:
+            async for kind, payload in stream_schools_by_office(client, params, office_codes):
+                if kind == "rows":
+                    yield to_ndjson([to_school_info(school) for school in payload])
+                elif payload:
+                    yield dumps_json({"errors": payload}) + b"\n"
+            return
+
+        async for _, rows in iter_school_pages(client, params):
+            if rows:
+                yield to_ndjson([to_school_info(school) for school in rows])
+    except Exception as e:
+        # 응답 헤더가 이미 전송되었으므로 마지막 줄에 오류를 기록합니다.
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        logger.error(f"스트리밍 중 에러 발생: {detail}")
+        yield dumps_json({"error": detail}) + b"\n"
+
+
+def paginate(schools: list, page: Optional[int], page_size: int, response: dict) -> dict:
+    """변환된 전체 학교 목록을 page/page_size에 맞게 잘라 응답에 담습니다."""
+    response["totalCount"] = len(schools)
+    if page is not None:
+        schools = schools[(page - 1) * page_size:page * page_size]
+        response.update(page=page, pageSize=page_size)
+    response["schools"] = schools
+    return response
+
+
+# 조회 결과를 JSON 대신 보낼 수 있는 형식 (Accept 헤더로 선택)
+ALTERNATE_CONTENT = {
+    200: {
+        "content": {MSGPACK_MEDIA_TYPE: {}, ARROW_MEDIA_TYPE: {}, ARROW_FILE_MEDIA_TYPE: {}},
+        "description": "Accept 헤더에 따라 JSON, MessagePack, Arrow IPC"
+    }
+}
+
+
+def negotiate_response_type(request: Request) -> str:
+    """
+    Accept 헤더에 맞는 응답 형식을 고릅니다. 제공할 수 없으면 406 오류를 발생시키므로
+    조회(업스트림 호출) 전에 호출해 불필요한 요청을 보내지 않습니다.
+    """
+    media_type = negotiate(request.headers.get("accept"))
+    if media_type is None:
+        raise HTTPException(
+            status_code=406,
+            detail=f"지원하는 응답 형식: {', '.join(available_media_types())}"
+        )
+    return media_type
+
+
+def render_response(media_type: str, payload: dict, rows_key: str = "schools",
+                    columns: dict = SCHOOL_INFO_COLUMNS) -> Response:
+    """
+    negotiate_response_type으로 고른 형식으로 payload를 직렬화합니다.
+    Arrow IPC는 payload[rows_key] 목록을 columns({컬럼명: 타입}) 순서의 테이블로 보냅니다.
+    """
+    return Response(encode(payload, media_type, rows_key, columns), media_type=media_type)
+
+
+def to_http_exception(e: Exception) -> HTTPException:
+    """조회 중 발생한 예외를 클라이언트에 돌려줄 HTTPException으로 변환합니다."""
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, CircuitOpenError):
+        return HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
+    if isinstance(e, httpx.TimeoutException):
+        logger.error(f"업스트림 응답 시간 초과: {str(e)}")
+        return HTTPException(
+            status_code=504,
+            detail="학교알리미 API 응답 시간이 초과되었습니다."
+        )
+    if isinstance(e, httpx.HTTPError):
+        logger.error(f"업스트림 연결 오류: {str(e)}")
+        return HTTPException(
+            status_code=502,
+            detail=f"학교알리미 API에 연결할 수 없습니다: {str(e)}"
+        )
+    logger.error(f"에러 발생: {str(e)}")
+    return HTTPException(
+        status_code=500,
+        detail=f"서버 오류가 발생했습니다: {str(e)}"
+    )
+
+
+async def lookup_schools(
+    app: FastAPI,
+    school_name: Optional[str],
+    office_codes: Optional[list] = None,
+    match: str = "contains",
+    live: bool = False,
+    page: Optional[int] = None,
+    page_size: int = 100
+) -> dict:
+    """
+    학교 이름 하나를 조회합니다. 스냅샷이 준비되어 있으면 메모리 인덱스에서,
+    아니면 응답 캐시를 거쳐 NEIS에서 조회합니다.
+    """
+    # 스냅샷이 준비되어 있으면 메모리 인덱스에서 바로 응답
+    index = app.state.school_index
+    if index is not None and not live:
+        school_list = index.search(school_name, match=match, office_codes=office_codes)
+        return paginate(school_list, page, page_size, {
+            "source": "snapshot",
+            "syncedAt": app.state.snapshot_synced_at
+        })
+
+    # API 요청 파라미터 설정
+    school_name = school_name.strip() if school_name else None
+    params = build_school_params(school_name)
+
+    # API 요청 및 응답 처리 (공유 커넥션 풀 사용)
+    client = app.state.http_client
+
+    async def load_from_upstream() -> dict:
+        if office_codes:
+            school_list, errors = await fetch_schools_by_office(client, params, office_codes)
+            schools = [to_school_info(school) for school in school_list]
+            return paginate(schools, page, page_size, {"errors": errors})
+
+        if page is not None:
+            total_count, school_list = await fetch_school_page(client, params, page, page_size)
+            return {
+                "schools": [to_school_info(school) for school in school_list],
+                "totalCount": total_count,
+                "page": page,
+                "pageSize": page_size
+            }
+
+        total_count, school_list = await fetch_all_school_pages(client, params)
+        return {
+            "schools": [to_school_info(school) for school in school_list],
+            "totalCount": total_count
+        }
+
+    # 동일한 조건의 요청은 캐시를 공유하고, 동시 미스는 하나의 업스트림 요청으로 합칩니다.
+    cache_key = (
+        school_name,
+        tuple(sorted(office_codes)) if office_codes else None,
+        page,
+        page_size if page is not None or office_codes else None
+    )
+    try:
+        return await response_cache.get_or_load(
+            cache_key,
+            load_from_upstream,
+            is_negative=lambda response: not response["totalCount"] or bool(response.get("errors"))
+        )
+    except (CircuitOpenError, httpx.HTTPError, HTTPException) as e:
+        # 업스트림 장애(회로 차단, 타임아웃, 5xx)이면 만료된 캐시라도 있으면 응답합니다.
+        if isinstance(e, HTTPException) and e.status_code < 500:
+            raise
+        stale = response_cache.get_stale(cache_key)
+        if stale is None:
+            raise
+        logger.warning(f"업스트림 장애로 만료된 캐시를 응답합니다: {str(e)}")
+        return {**stale, "stale": True}
+
+
+@app.get("/api/school-info", response_model=SchoolInfoResponse, responses=ALTERNATE_CONTENT)
 async def get_school_info(
-    school_name: Optional[str] = Query(None, description="검색할 학교 이름 (부분 검색 가능)")
+    request: Request,
+    school_name: Optional[str] = Query(None, description="검색할 학교 이름 (부분 검색 가능)"),
+    page: Optional[int] = Query(None, ge=1, description="조회할 페이지 번호 (지정하지 않으면 전체 결과 반환)"),
+    page_size: int = Query(100, ge=1, le=NEIS_MAX_PAGE_SIZE, description="페이지당 학교 수"),
+    office: Optional[str] = Query(None, description="시도교육청별 분할 조회 (all 또는 B10,C10 형식의 코드 목록)"),
+    match: str = Query("contains", pattern="^(contains|prefix)$", description="이름 검색 방식 (스냅샷 조회 시 적용)"),
+    live: bool = Query(False, description="스냅샷 대신 NEIS를 직접 조회"),
+    stream: bool = Query(False, description="NDJSON 스트리밍 응답 (한 줄에 학교 하나)")
 ):
     """
     고등학교 기본 정보를 조회하는 API
     - school_name: 학교 이름으로 검색 (선택사항)
+    - page, page_size: 서버 측 페이지 조회 (선택사항, 생략 시 전체 결과를 동시 조회)
+    - office: 시도교육청별로 나누어 동시에 조회 (선택사항)
+    - match: contains(부분 검색) 또는 prefix(접두어 검색)
+    - live: 스냅샷이 준비되어 있어도 NEIS를 직접 조회 (선택사항)
+    - stream: 업스트림 페이지가 도착하는 대로 NDJSON으로 전송 (선택사항, page/캐시 미적용)
+    - Accept 헤더: application/json(기본), application/msgpack, application/vnd.apache.arrow.stream, application/vnd.apache.arrow.file
     """
+    office_codes = parse_office_codes(office) if office else None
+
+    if stream:
+        index = request.app.state.school_index
+        if index is not None and not live:
+            school_list = index.search(school_name, match=match, office_codes=office_codes)
+            return StreamingResponse(
+                iter([to_ndjson(school_list)]), media_type=NDJSON_MEDIA_TYPE
+            )
+        params = build_school_params(school_name.strip() if school_name else None)
+        return StreamingResponse(
+            stream_school_info(request.app.state.http_client, params, office_codes),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+
+    media_type = negotiate_response_type(request)
     try:
-        # API 요청 파라미터 설정
-        params = {
-            "KEY": API_KEY,
-            "Type": "json",
-            "pIndex": "1",
-            "pSize": "100",
-            "SCHUL_KND_SC_NM": "고등학교"
-        }
-        
-        # 학교 이름이 있는 경우 검색 조건 추가
-        if school_name:
-            params["SCHUL_NM"] = school_name
-
-        # API 요청 및 응답 처리
-        async with httpx.AsyncClient(verify=False) as client:
-            logger.info(f"API 요청: URL={BASE_URL}, 파라미터={params}")
-            response = await client.get(BASE_URL, params=params)
-            
-            logger.info(f"API 응답: 상태 코드={response.status_code}")
-            logger.info(f"API 응답 내용: {response.text[:200]}...")
-
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    
-                    # 에러 응답 처리
-                    if "RESULT" in data:
-                        error_msg = data["RESULT"]["MESSAGE"]
-                        if "해당하는 데이터가 없습니다" in error_msg:
-                            logger.info("검색 결과가 없습니다.")
-                            return {"schools": []}
-                        else:
-                            logger.error(f"API 오류: {error_msg}")
-                            raise HTTPException(
-                                status_code=500,
-                                detail=f"학교알리미 API 오류: {error_msg}"
-                            )
-                    
-                    # 정상 응답 처리
-                    if "schoolInfo" in data:
-                        school_list = data["schoolInfo"][1]["row"]
-                        schools = []
-                        for school in school_list:
-                            school_info = {
-                                "schoolName": school.get("SCHUL_NM", ""),
-                                "schoolType": school.get("SCHUL_KND_SC_NM", "고등학교"),
-                                "location": f"{school.get('LCTN_SC_NM', '')} {school.get('ATPT_OFCDC_SC_NM', '')}",
-                                "foundation": school.get("FOND_SC_NM", ""),
-                                "studentCount": school.get("COEDU_SC_NM", "0"),
-                                "teacherCount": school.get("HGHT_SC_NM", "0")
-                            }
-                            schools.append(school_info)
-                        return {"schools": schools}
-                    else:
-                        logger.info("검색 결과가 없습니다.")
-                        return {"schools": []}
-                        
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON 파싱 오류: {str(e)}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail="API 응답을 처리하는 중 오류가 발생했습니다."
-                    )
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"학교알리미 API 오류: {response.text}"
+        result = await lookup_schools(
+            request.app, school_name, office_codes, match=match, live=live, page=page, page_size=page_size
+        )
+    except Exception as e:
+        raise to_http_exception(e)
+    return render_response(media_type, result)
+
+
+@app.post("/api/school-info/batch", response_model=SchoolBatchResponse, responses=ALTERNATE_CONTENT)
+async def get_school_info_batch(request: Request, body: SchoolBatchRequest):
+    """
+    여러 학교 이름을 한 번에 조회하는 API
+    - 공백과 대소문자만 다른 이름은 한 번만 조회하고 결과를 함께 사용합니다.
+    - 이름별 조회는 BATCH_CONCURRENCY개까지 동시에 실행합니다.
+    - 일부 이름의 조회가 실패해도 나머지 결과는 그대로 반환하고, 실패한 이름에는 error와 status를 담습니다.
+    - Arrow IPC 응답은 모든 결과를 query 컬럼이 붙은 하나의 테이블로 보내고, 실패한 이름은 메타데이터에 담습니다.
+    """
+    media_type = negotiate_response_type(request)
+    if len(body.names) > BATCH_MAX_NAMES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"한 번에 조회할 수 있는 이름은 최대 {BATCH_MAX_NAMES}개입니다."
+        )
+    office_codes = parse_office_codes(body.offices) if body.offices else None
+
+    # 입력한 이름 그대로 → 정규화한 조회 키 (결과는 클라이언트가 보낸 문자열로 돌려줍니다)
+    keys = {}
+    # 정규화한 키마다 처음 나온 이름(공백 정리)으로 한 번만 조회
+    queries = {}
+    for name in body.names:
+        query = " ".join(name.split())
+        if not query or name in keys:
+            continue
+        keys[name] = normalize_name(query)
+        queries.setdefault(keys[name], query)
+    if not keys:
+        raise HTTPException(status_code=400, detail="조회할 학교 이름이 없습니다.")
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def resolve(name: str) -> dict:
+        async with semaphore:
+            try:
+                return await lookup_schools(
+                    request.app, name, office_codes, match=body.match, live=body.live
                 )
+            except Exception as e:
+                error = to_http_exception(e)
+                return {"error": error.detail, "status": error.status_code}
+
+    resolved = await asyncio.gather(*(resolve(name) for name in queries.values()))
+    results_by_key = dict(zip(queries, resolved))
 
+    results = {name: results_by_key[key] for name, key in keys.items()}
+    count = len(queries)
+    failed = sum(1 for result in resolved if "error" in result)
+
+    if media_type in ARROW_MEDIA_TYPES:
+        rows = [
+            {"query": name, **school}
+            for name, result in results.items()
+            for school in result.get("schools", [])
+        ]
+        errors = {name: result for name, result in results.items() if "error" in result}
+        return render_response(
+            media_type, {"rows": rows, "count": count, "failed": failed, "errors": errors},
+            rows_key="rows", columns={"query": "string", **SCHOOL_INFO_COLUMNS}
+        )
+    return render_response(media_type, {"results": results, "count": count, "failed": failed})
+
+
+@app.get("/api/schools/nearby", response_model=NearbyResponse, responses=ALTERNATE_CONTENT)
+async def get_nearby_schools(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90, description="위도"),
+    lon: float = Query(..., ge=-180, le=180, description="경도"),
+    radius: Optional[float] = Query(None, gt=0, le=NEARBY_MAX_RADIUS_KM, description="검색 반경(km)"),
+    k: int = Query(10, ge=1, le=NEARBY_MAX_K, description="최대 학교 수")
+):
+    """
+    지정한 위치에서 가까운 초·중·고등학교를 거리순으로 조회하는 API
+    - lat, lon: 검색 지점의 위도/경도
+    - radius: 이 거리(km) 안의 학교만 반환 (선택사항)
+    - k: 반환할 최대 학교 수
+    - Accept 헤더: application/json(기본), application/msgpack, application/vnd.apache.arrow.stream, application/vnd.apache.arrow.file
+    """
+    media_type = negotiate_response_type(request)
+    index = request.app.state.geo_index
+    if index is None:
+        raise HTTPException(
+            status_code=503,
+            detail="학교 위치 색인이 아직 준비되지 않았습니다. 잠시 후 다시 시도하세요."
+        )
+
+    schools = [
+        {**record, "distanceKm": round(distance, 3)}
+        for record, distance in index.nearby(lat, lon, k=k, radius_km=radius)
+    ]
+    return render_response(
+        media_type,
+        {"schools": schools, "count": len(schools), "syncedAt": request.app.state.geo_synced_at},
+        columns=NEARBY_SCHOOL_COLUMNS
+    )
+
+
+@app.get("/api/schools/{school_code}/profile", response_model=SchoolProfileResponse)
+async def get_school_profile(
+    request: Request,
+    school_code: str,
+    year: Optional[str] = Query(None, pattern=r"^\d{4}$", description="공시 연도 (생략하면 가장 최근 연도)")
+):
+    """
+    학교 한 곳의 학교알리미 공시 데이터 12종을 한 번에 조회하는 API
+    - school_code: 학교알리미 학교 코드 (SCHUL_CODE)
+    - year: 공시 연도 (선택사항). 처음 조회하는 연도는 데이터셋을 모두 받아 테이블을 만든 뒤 응답합니다.
+    """
+    year = year or request.app.state.profile_latest_year
+    if year is None:
+        raise HTTPException(
+            status_code=503,
+            detail="학교 프로필이 아직 준비되지 않았습니다. 잠시 후 다시 시도하거나 year를 지정하세요."
+        )
+    if not ALIMI_FIRST_YEAR <= int(year) <= time.localtime().tm_year:
+        raise HTTPException(
+            status_code=400,
+            detail=f"공시 연도는 {ALIMI_FIRST_YEAR}년부터 올해까지입니다."
+        )
+
+    try:
+        table, synced_at = await load_profile_table(request.app, year)
+    except RuntimeError as e:
+        logger.error(f"학교 프로필 생성 실패: {str(e)}")
+        raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
-        logger.error(f"에러 발생: {str(e)}")
+        raise to_http_exception(e)
+
+    profile = table.get(school_code.strip())
+    if profile is None:
         raise HTTPException(
-            status_code=500,
-            detail=f"서버 오류가 발생했습니다: {str(e)}"
+            status_code=404,
+            detail=f"{year}년 공시에 학교 코드 {school_code}인 학교가 없습니다."
         )
+    return FastJSONResponse({"schoolCode": school_code, "year": year, **profile, "syncedAt": synced_at})
+
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """업스트림 응답 캐시의 적중/미스 통계를 반환합니다."""
+    return response_cache.stats()
+
+
+@app.get("/ready", include_in_schema=False)
+async def get_readiness(request: Request):
+    """
+    로드밸런서용 준비 상태를 반환합니다.
+    예열할 데이터(WARMUP_COMPONENTS)가 모두 메모리에 올라왔으면 200, 아직이면 503입니다.
+    """
+    status = warmup_status(request.app)
+    return FastJSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus 텍스트 형식의 메트릭을 반환합니다."""
+    return PlainTextResponse(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.post("/api/school-info/refresh")
+async def refresh_school_snapshot(request: Request):
+    """NEIS에서 전체 고등학교 목록을 다시 받아 스냅샷을 즉시 갱신합니다."""
+    try:
+        count = await sync_school_snapshot(request.app)
+    except Exception as e:
+        logger.error(f"스냅샷 갱신 실패: {str(e)}")
+        raise HTTPException(
+            status_code=502,
+            detail=f"스냅샷 갱신에 실패했습니다: {str(e)}"
+        )
+    return {"count": count, "syncedAt": request.app.state.snapshot_synced_at}
 
 if __name__ == "__main__":
+    import argparse
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+
+    parser = argparse.ArgumentParser(description="학교 정보 조회 API 서버")
+    parser.add_argument("--host", default="0.0.0.0", help="바인딩할 주소")
+    parser.add_argument("--port", type=int, default=8000, help="포트")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=API_WORKERS,
+        help="워커 프로세스 수 (2 이상이면 자동 리로드 없이 운영 모드로 실행, 기본값: API_WORKERS)"
+    )
+    args = parser.parse_args()
+    # 워커 프로세스는 main을 다시 불러오므로 환경 변수로 워커 수를 넘겨 호출 한도를 나눠 갖게 합니다.
+    os.environ["API_WORKERS"] = str(args.workers)
+
+    if args.workers > 1:
+        uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+    else:
+        uvicorn.run("main:app", host=args.host, port=args.port, reload=True)
\ No newline at end of file
@@ -0,0 +1,174 @@
+import glob
+import os
+import re
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from school_schemas import API_TYPES, CATEGORY, COMMON_COLUMNS, INT, apply_schema, get_schema
+
+# 학교별 프로필 저장소
+# 한 공시 연도의 학교알리미 데이터셋 12종을 정보공시 학교코드(SCHUL_CODE)로 한 번 조인해
+# 학교 한 행 × (데이터셋:컬럼) 열의 넓은 테이블로 만들고, 학교코드 → 행 번호 색인으로 조회합니다.
+# 컬럼은 스키마 타입(int32, float32, category 등)으로 변환해 두므로 원본 문자열보다 훨씬 작습니다.
+
+# 학교 식별 정보(시도교육청, 학교명 등)를 담는 구역 이름
+SCHOOL_SECTION = "school"
+# 넓은 테이블의 컬럼 이름 구분자 ("성별 학생수:1학년 남학생수")
+SEPARATOR = ":"
+
+_FILE_PATTERN = re.compile(r"profiles_(\d{4})\.parquet$")
+
+
+def _column_reader(series: pd.Series):
+    """
+    행 번호로 값 하나를 꺼내는 함수를 만듭니다. 결측은 None, 날짜는 "YYYY-MM-DD" 문자열입니다.
+    pandas 확장 타입의 스칼라 조회는 느리므로 category는 코드 배열, 정수는 값/결측 배열로 바꿔 둡니다.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        categories = series.cat.categories.tolist()
+        return lambda i: categories[codes[i]] if codes[i] >= 0 else None
+    if pd.api.types.is_integer_dtype(series.dtype):
+        mask = series.isna().to_numpy()
+        values = series.to_numpy(dtype="int64", na_value=0)
+        return lambda i: None if mask[i] else int(values[i])
+    if pd.api.types.is_float_dtype(series.dtype):
+        values = series.to_numpy()
+        # float32는 str()을 거쳐야 7.6이 7.599999904632568로 바뀌지 않습니다.
+        to_float = (lambda value: float(str(value))) if values.dtype == np.float32 else float
+        return lambda i: None if np.isnan(values[i]) else to_float(values[i])
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        values = series.dt.strftime("%Y-%m-%d").to_numpy(dtype=object, na_value=None)
+        return values.__getitem__
+    values = series.to_numpy(dtype=object, na_value=None)
+    return values.__getitem__
+
+
+def _dataset_frame(api_type: str, rows: list) -> Optional[pd.DataFrame]:
+    """한 데이터셋의 행 목록을 학교코드 색인, 스키마 타입의 데이터프레임으로 변환합니다."""
+    if not rows:
+        return None
+    raw = pd.DataFrame(rows)
+    if "SCHUL_CODE" not in raw:
+        return None
+    # 같은 학교가 여러 번 나오면 (학교급 중복 공시 등) 처음 행을 사용합니다.
+    raw = raw.dropna(subset=["SCHUL_CODE"]).drop_duplicates("SCHUL_CODE").set_index("SCHUL_CODE")
+    df = apply_schema(raw, api_type)
+    # 다른 데이터셋과 조인하면 빈 칸이 생기므로 정수 컬럼은 결측을 허용하는 타입으로 바꿉니다.
+    schema = get_schema(api_type)
+    for column, (name, dtype) in schema.items():
+        if dtype == INT and name in df and df[name].dtype == INT:
+            df[name] = df[name].astype("Int32")
+    return df
+
+
+class ProfileTable:
+    """
+    한 공시 연도의 학교별 프로필 테이블
+    table은 학교코드 색인, "구역:컬럼" 이름의 컬럼으로 이루어진 데이터프레임입니다.
+    """
+
+    def __init__(self, table: pd.DataFrame):
+        self.table = table
+        self._positions = {code: position for position, code in enumerate(table.index)}
+        # 구역(학교 식별 정보, 데이터셋 이름)별 [(컬럼 이름, 값 조회 함수)]
+        self._sections = {}
+        for column in table.columns:
+            section, _, name = column.partition(SEPARATOR)
+            self._sections.setdefault(section, []).append((name, _column_reader(table[column])))
+
+    @classmethod
+    def build(cls, datasets: dict) -> "ProfileTable":
+        """
+        {apiType: 행 목록}을 학교코드로 조인합니다. 학교 식별 컬럼은 데이터셋마다 들어 있으므로
+        처음 나온 값(학교기본정보 우선)을 한 번만 두고, 나머지 컬럼은 데이터셋 이름을 붙여 구분합니다.
+        """
+        common_types = {name: dtype for name, dtype in COMMON_COLUMNS.values()}
+        school_frames = []
+        dataset_frames = []
+        # API_TYPES 순서(학교기본정보가 처음)대로 조인합니다.
+        for name, api_type in API_TYPES.items():
+            df = _dataset_frame(api_type, datasets.get(api_type))
+            if df is None:
+                continue
+            common = [column for column in df.columns if column in common_types]
+            school_frames.append(df[common])
+            dataset_frames.append(df.drop(columns=common).add_prefix(name + SEPARATOR))
+
+        if not school_frames:
+            return cls(pd.DataFrame(index=pd.Index([], name="SCHUL_CODE")))
+
+        school = pd.concat(school_frames)
+        school = school[~school.index.duplicated()]
+        # 데이터셋마다 범주가 달라 object로 바뀐 컬럼을 다시 category로 맞춥니다.
+        for column in school.columns:
+            if common_types[column] == CATEGORY and school[column].dtype != "category":
+                school[column] = school[column].astype("category")
+        school = school.add_prefix(SCHOOL_SECTION + SEPARATOR)
+
+        table = pd.concat([school] + dataset_frames, axis=1, join="outer")
+        table.index.name = "SCHUL_CODE"
+        return cls(table)
+
+    def __len__(self):
+        return len(self.table)
+
+    def __contains__(self, school_code: str):
+        return school_code in self._positions
+
+    def get(self, school_code: str) -> Optional[dict]:
+        """
+        학교 한 곳의 프로필을 {"school": {...}, "datasets": {데이터셋 이름: {...} 또는 None}}으로 반환합니다.
+        공시에 학교가 없는 데이터셋은 None입니다. 학교코드가 없으면 None을 반환합니다.
+        """
+        position = self._positions.get(school_code)
+        if position is None:
+            return None
+
+        sections = {}
+        for section, readers in self._sections.items():
+            values = {name: read(position) for name, read in readers}
+            if section == SCHOOL_SECTION or any(value is not None for value in values.values()):
+                sections[section] = values
+        return {
+            SCHOOL_SECTION: sections.get(SCHOOL_SECTION, {}),
+            "datasets": {name: sections.get(name) for name in API_TYPES}
+        }
+
+
+class ProfileStore:
+    """공시 연도별 프로필 테이블을 Parquet 파일로 저장하고 불러옵니다."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path(self, year: str) -> str:
+        return os.path.join(self.directory, f"profiles_{year}.parquet")
+
+    def years(self) -> list:
+        """저장된 공시 연도 목록 (최근 연도부터)"""
+        years = []
+        for path in glob.glob(os.path.join(self.directory, "profiles_*.parquet")):
+            match = _FILE_PATTERN.search(path)
+            if match:
+                years.append(match.group(1))
+        return sorted(years, reverse=True)
+
+    def save(self, year: str, profiles: ProfileTable) -> float:
+        """테이블을 원자적으로 교체하고 저장 시각을 반환합니다."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(year)
+        # 워커 프로세스마다 다른 임시 파일에 쓴 뒤 교체합니다.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        profiles.table.to_parquet(tmp_path, engine="pyarrow")
+        os.replace(tmp_path, path)
+        return os.path.getmtime(path)
+
+    def load(self, year: str):
+        """저장된 테이블을 (ProfileTable, 저장 시각)으로 반환합니다. 없으면 (None, None)을 반환합니다."""
+        path = self.path(year)
+        if not os.path.exists(path):
+            return None, None
+        return ProfileTable(pd.read_parquet(path, engine="pyarrow")), os.path.getmtime(path)
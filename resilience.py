@@ -0,0 +1,253 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Optional
+
+import httpx
+
+# 업스트림 호출 보호 장치
+# - TokenBucket: API 키 호출 한도에 맞춰 초당 요청 수를 제한합니다.
+# - CircuitBreaker: 연속 실패가 쌓이면 일정 시간 동안 요청을 바로 거절합니다.
+# - UpstreamGuard: 위 두 가지에 재시도(지터 백오프)와 헤지 요청을 더해 GET 요청을 보냅니다.
+
+# 재시도할 응답 상태 코드 (요청 한도 초과, 업스트림 일시 장애)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 업스트림 요청을 보내지 않았을 때 발생합니다."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"업스트림 장애로 요청을 차단 중입니다. {retry_after:.0f}초 후 다시 시도하세요.")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 토큰 버킷
+    토큰이 모자라면 차례가 올 때까지 기다립니다. rate가 0 이하이면 제한하지 않습니다.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self.waits = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """기다리지 않고 바로 쓸 수 있는 토큰이 있으면 하나 쓰고 True, 없으면 False를 반환합니다."""
+        if self.rate <= 0:
+            return True
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        self._refill()
+        # 토큰을 먼저 빌려 두고(음수 허용) 빚을 갚을 시간만큼 기다리므로 도착 순서대로 처리됩니다.
+        self._tokens -= 1
+        if self._tokens < 0:
+            self.waits += 1
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold번 쌓이면 회로를 열고 recovery_time초 동안 요청을 거절합니다.
+    이후 요청 하나만 시험 삼아 보내 성공하면 닫고, 실패하면 다시 엽니다.
+    failure_threshold가 0 이하이면 사용하지 않습니다.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, recovery_time: float):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.failures = 0
+        self.rejected = 0
+        self._opened_at = None
+        self._trial_inflight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at < self.recovery_time:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def before_request(self):
+        """요청을 보내도 되는지 확인합니다. 안 되면 CircuitOpenError를 발생시킵니다."""
+        if self.failure_threshold <= 0:
+            return
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN and not self._trial_inflight:
+            self._trial_inflight = True
+            return
+        self.rejected += 1
+        retry_after = self.recovery_time - (time.monotonic() - self._opened_at)
+        raise CircuitOpenError(max(1.0, retry_after))
+
+    def record_success(self):
+        self.failures = 0
+        self._opened_at = None
+        self._trial_inflight = False
+
+    def abandon(self):
+        """시험 요청이 결과 없이 취소되었을 때 다음 요청이 다시 시험할 수 있게 합니다."""
+        self._trial_inflight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_inflight or (0 < self.failure_threshold <= self.failures):
+            self._opened_at = time.monotonic()
+        self._trial_inflight = False
+
+
+class UpstreamGuard:
+    """
+    업스트림 GET 요청에 토큰 버킷, 회로 차단기, 재시도, 헤지 요청을 적용합니다.
+    - 재시도: 타임아웃/연결 오류와 RETRYABLE_STATUS_CODES 응답을 최대 max_retries번 다시 보냅니다.
+      대기 시간은 0 ~ backoff_base * 2^시도 사이의 무작위 값(full jitter)이며 backoff_max를 넘지 않습니다.
+    - 헤지: hedge_percentile이 있으면 최근 응답 시간의 해당 백분위수만큼 기다려도 응답이 없을 때
+      같은 요청을 하나 더 보내고 먼저 도착한 응답을 사용합니다.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: TokenBucket,
+        breaker: CircuitBreaker,
+        max_retries: int = 2,
+        backoff_base: float = 0.2,
+        backoff_max: float = 2.0,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_delay: float = 0.05,
+        hedge_min_samples: int = 20
+    ):
+        self.rate_limiter = rate_limiter
+        self.breaker = breaker
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_min_samples = hedge_min_samples
+        self._latencies = deque(maxlen=500)
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """헤지 요청을 보내기 전에 기다릴 시간. 헤지를 쓰지 않거나 표본이 부족하면 None"""
+        if self.hedge_percentile is None or len(self._latencies) < self.hedge_min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * self.hedge_percentile / 100))
+        return max(self.hedge_min_delay, latencies[index])
+
+    def backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(self.backoff_max, float(retry_after))
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def get(self, client: httpx.AsyncClient, url: str, params: Optional[dict] = None) -> httpx.Response:
+        """
+        재시도 후에도 실패하면 마지막 응답(재시도 대상 상태 코드)을 반환하거나 마지막 예외를 발생시킵니다.
+        재시도 대상이 아닌 응답(200, 4xx 등)은 바로 반환합니다.
+        """
+        self.breaker.before_request()
+        response, error = None, None
+        for attempt in range(self.max_retries + 1):
+            try:
+                response, error = await self._attempt(client, url, params), None
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                response, error = None, e
+            except asyncio.CancelledError:
+                self.breaker.abandon()
+                raise
+            except Exception:
+                # 예상하지 못한 오류(잘못된 URL, 디코딩 오류 등)도 실패로 기록해 시험 요청 자리를 비웁니다.
+                self.breaker.record_failure()
+                raise
+
+            if response is not None and response.status_code not in RETRYABLE_STATUS_CODES:
+                self.breaker.record_success()
+                return response
+
+            # 다른 요청 때문에 회로가 열렸으면 더 기다리지 않습니다.
+            if attempt == self.max_retries or self.breaker.state == CircuitBreaker.OPEN:
+                break
+            self.retries += 1
+            try:
+                await asyncio.sleep(self.backoff(attempt, response))
+            except asyncio.CancelledError:
+                self.breaker.abandon()
+                raise
+
+        self.breaker.record_failure()
+        if error is not None:
+            raise error
+        return response
+
+    async def _send(self, client: httpx.AsyncClient, url: str, params: Optional[dict]) -> httpx.Response:
+        """토큰을 받은 뒤 호출합니다. 응답 시간에는 토큰을 기다린 시간이 들어가지 않습니다."""
+        started = time.perf_counter()
+        response = await client.get(url, params=params)
+        if response.status_code not in RETRYABLE_STATUS_CODES:
+            self._latencies.append(time.perf_counter() - started)
+        return response
+
+    async def _attempt(self, client: httpx.AsyncClient, url: str, params: Optional[dict]) -> httpx.Response:
+        # 호출 한도 대기는 헤지 대기 시간에 넣지 않도록 첫 요청의 토큰을 먼저 받습니다.
+        await self.rate_limiter.acquire()
+        delay = self.hedge_delay()
+        if delay is None:
+            return await self._send(client, url, params)
+
+        primary = asyncio.ensure_future(self._send(client, url, params))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+
+            # 남는 토큰이 없으면 헤지 요청이 호출 한도를 더 압박하므로 첫 요청만 기다립니다.
+            if not self.rate_limiter.try_acquire():
+                return await primary
+
+            self.hedges += 1
+            hedge = asyncio.ensure_future(self._send(client, url, params))
+            tasks.append(hedge)
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # 먼저 끝난 응답을 쓰고 나머지 요청은 취소합니다. (호출한 쪽이 취소된 경우 포함)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
@@ -0,0 +1,110 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable, Optional
+
+
+class ResponseCache:
+    """
+    TTL + LRU 응답 캐시
+    - 최대 항목 수를 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다.
+    - "데이터 없음" 같은 부정 응답은 더 짧은 TTL로 저장합니다.
+    - 같은 키에 대한 동시 미스는 하나의 업스트림 요청을 함께 기다립니다 (single-flight).
+    - 만료된 항목도 stale_ttl 동안 보관하여 업스트림 장애 시 get_stale로 꺼내 쓸 수 있습니다.
+    """
+
+    def __init__(self, ttl: float, negative_ttl: float, max_entries: int, stale_ttl: float = 0):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable):
+        """만료되지 않은 캐시 값을 반환합니다. 없으면 None을 반환합니다."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        now = time.monotonic()
+        if expires_at <= now:
+            if expires_at + self.stale_ttl <= now:
+                del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get_stale(self, key: Hashable):
+        """만료되었더라도 stale_ttl 안에 있는 값을 반환합니다. 없으면 None을 반환합니다."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at + self.stale_ttl <= time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value, negative: bool = False):
+        ttl = self.negative_ttl if negative else self.ttl
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable],
+        is_negative: Optional[Callable[[object], bool]] = None
+    ):
+        """캐시에 값이 있으면 반환하고, 없으면 loader를 한 번만 실행하여 결과를 저장합니다."""
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(key, loader, is_negative))
+            # 기다리던 요청이 모두 취소된 뒤 실패해도 경고가 남지 않도록 예외를 회수합니다.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+
+        # 먼저 요청한 클라이언트가 연결을 끊어도 나머지 대기자의 요청은 계속 진행됩니다.
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable], is_negative):
+        try:
+            value = await loader()
+            self.set(key, value, negative=bool(is_negative and is_negative(value)))
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hitRatio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+# 지역별 집계(rollup)
+# 전국 학교 단위 데이터를 시도교육청 / 교육지원청 / 지역 / 설립구분별로 한 번 집계해 두고,
+# 대시보드는 수만 행의 원본 대신 이 집계표(수십~수백 행)로 차트와 표를 그립니다.
+
+# 집계 기준 컬럼 (스키마의 한글 컬럼명)
+ROLLUP_LEVELS = ['시도교육청', '교육지원청', '지역', '설립구분']
+
+# 합계/평균을 내지 않는 숫자 컬럼
+EXCLUDED_COLUMNS = {'위도', '경도', '연도'}
+
+# 교원 1인당 비율: (비율 이름, 분자 컬럼, 분모 컬럼)
+# 학교별 비율의 평균이 아니라 그룹 합계끼리 나누므로 학교 규모가 반영됩니다.
+TEACHER_RATIOS = [
+    ('교원 1인당 학생수', '전체 학생수', '교원수'),
+    ('수업교원 1인당 주당수업시수', '주당수업시수', '수업교원수'),
+]
+
+COUNT_COLUMN = '학교 수'
+
+
+def numeric_columns(df):
+    """합계/평균을 낼 숫자 컬럼 목록"""
+    return [
+        col for col in df.select_dtypes('number').columns
+        if col not in EXCLUDED_COLUMNS
+    ]
+
+
+def compute_rollup(df, level, extra_keys=()):
+    """
+    level(과 extra_keys)별 학교 수, 숫자 컬럼의 합계·평균, 교원 1인당 비율을 계산합니다.
+    extra_keys는 일괄 조회의 '연도', '학교급'처럼 집계 기준 앞에 붙일 컬럼입니다.
+    """
+    keys = [key for key in extra_keys if key in df] + [level]
+    numeric = numeric_columns(df)
+    grouped = df.groupby(keys, observed=True, sort=True)
+
+    parts = [grouped.size().rename(COUNT_COLUMN)]
+    if numeric:
+        # float32 합계는 정밀도가 부족하므로 float64로 더합니다.
+        sums = grouped[numeric].sum(min_count=1).astype('float64')
+        for name, numerator, denominator in TEACHER_RATIOS:
+            if numerator in sums and denominator in sums:
+                parts.append((sums[numerator] / sums[denominator].replace(0, np.nan)).round(2).rename(name))
+        parts.append(sums.add_suffix(' 합계'))
+        parts.append(grouped[numeric].mean().astype('float64').round(2).add_suffix(' 평균'))
+
+    return pd.concat(parts, axis=1).reset_index()
+
+
+def compute_rollups(df, levels=ROLLUP_LEVELS, extra_keys=()):
+    """데이터에 있는 집계 기준마다 집계표를 만들어 {기준: 집계표}로 반환합니다."""
+    return {
+        level: compute_rollup(df, level, extra_keys)
+        for level in levels
+        if level in df
+    }
+
+
+def summarize(df):
+    """숫자 컬럼의 기본 통계 (전체 행 대신 화면에 보낼 요약)"""
+    numeric = numeric_columns(df)
+    if not numeric:
+        return None
+    return df[numeric].astype('float64').describe().round(2)
+
+
+def filter_rows(df, query, columns):
+    """columns 중 하나라도 query를 포함하는 행만 남깁니다. (대소문자 무시)"""
+    if not query:
+        return df
+    mask = np.zeros(len(df), dtype=bool)
+    for col in columns:
+        if col in df:
+            mask |= df[col].astype(str).str.contains(query, case=False, regex=False).to_numpy()
+    return df[mask]
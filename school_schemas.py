@@ -0,0 +1,355 @@
+import glob
+import json
+import os
+import re
+
+import pandas as pd
+
+# 학교알리미 API 타입별 컬럼 스키마
+# API 타입 코드마다 컬럼별 (한글 이름, 변환할 타입)을 정의합니다.
+# 같은 원본 컬럼(COL_1 등)이 API 타입마다 다른 의미를 가지므로 반드시 API 타입과 함께 조회해야 합니다.
+
+# 학교알리미 API 타입 (화면 이름 → apiType 코드)
+API_TYPES = {
+    '학교기본정보': '0',               # 학교기본정보
+    '수업일수 및 수업시수 현황': '08',  # 수업일수 및 수업시수 현황
+    '자유학기제 운영': '04',          # 자유학기제 운영에 관한 사항
+    '학교 현황': '62',               # 학교 현황
+    '성별 학생수': '63',             # 성별 학생수
+    '학년별·학급별 학생수': '09',     # 학년별·학급별 학생수
+    '전·출입 및 학업중단 학생 수': '10', # 전·출입 및 학업중단 학생 수
+    '직위별 교원 현황': '22',         # 직위별 교원 현황
+    '자격종별 교원 현황': '64',       # 자격종별 교원 현황
+    '표시과목별 교원 현황': '24',      # 표시과목별 교원 현황
+    '학교폭력 예방교육 실적': '94',    # 대상별 학교폭력 예방교육 실적
+    '입학생 현황': '51'              # 입학생 현황
+}
+
+# 변환 타입
+INT = 'int32'        # 학생수, 교원수 등 정수 값 (결측이 있으면 nullable Int32)
+FLOAT = 'float32'    # 비율, 평균, 시간 등 실수 값
+COORD = 'float64'    # 위도/경도 (float32는 정밀도가 부족)
+CATEGORY = 'category'  # 교육청, 설립구분 등 반복되는 코드 값
+DATE = 'date'        # YYYYMMDD 형식 날짜
+TEXT = 'str'         # 변환하지 않는 문자열
+
+# 모든 API 타입에 공통으로 들어있는 학교 식별 컬럼
+COMMON_COLUMNS = {
+    'ATPT_OFCDC_ORG_NM': ('시도교육청', CATEGORY),
+    'ATPT_OFCDC_ORG_CODE': ('시도교육청코드', CATEGORY),
+    'JU_ORG_NM': ('교육지원청', CATEGORY),
+    'JU_ORG_CODE': ('교육지원청코드', CATEGORY),
+    'ADRCD_NM': ('지역', CATEGORY),
+    'ADRCD_CD': ('지역코드', CATEGORY),
+    'LCTN_SC_CODE': ('소재지구분코드', CATEGORY),
+    'SCHUL_CODE': ('정보공시 학교코드', TEXT),
+    'SCHUL_NM': ('학교명', TEXT),
+    'SCHUL_KND_SC_CODE': ('학교급코드', CATEGORY),
+    'FOND_SC_CODE': ('설립구분', CATEGORY),
+    'HS_KND_SC_NM': ('학교특성', CATEGORY),
+    'BNHH_YN': ('분교여부', CATEGORY),
+    'SCHUL_FOND_TYP_CODE': ('설립유형', CATEGORY),
+    'DGHT_SC_CODE': ('주야구분', CATEGORY),
+    'SCHUL_CRSE_SC_VALUE': ('학교과정구분값(2-3-4)', CATEGORY),
+    'SCHUL_CRSE_SC_VALUE_NM': ('학교과정구분명(초-중-고)', CATEGORY),
+    'PBAN_EXCP_YN': ('제외여부', CATEGORY),
+    'PBAN_EXCP_RSN': ('제외사유', TEXT),
+}
+
+
+def _grade_columns(prefix, label, grades, suffix=''):
+    """COL_1, COL_2 ... 처럼 학년별로 반복되는 정수 컬럼을 만듭니다."""
+    return {f'{prefix}{g}{suffix}': (label.format(g), INT) for g in grades}
+
+
+SCHEMAS = {
+    # 학교기본정보
+    '0': {
+        'FOAS_MEMRD': ('개교기념일', TEXT),
+        'FOND_YMD': ('설립일', DATE),
+        'ADRCD_ID': ('법정동코드', TEXT),
+        'ADRES_BRKDN': ('주소내역', TEXT),
+        'DTLAD_BRKDN': ('상세주소내역', TEXT),
+        'ZIP_CODE': ('우편번호', TEXT),
+        'SCHUL_RDNZC': ('학교도로명 우편번호', TEXT),
+        'SCHUL_RDNMA': ('학교도로명 주소', TEXT),
+        'SCHUL_RDNDA': ('학교도로명 상세주소', TEXT),
+        'LTTUD': ('위도', COORD),
+        'LGTUD': ('경도', COORD),
+        'USER_TELNO': ('전화번호', TEXT),
+        'USER_TELNO_SW': ('전화번호(교무실)', TEXT),
+        'USER_TELNO_GA': ('전화번호(행정실)', TEXT),
+        'PERC_FAXNO': ('팩스번호', TEXT),
+        'HMPG_ADRES': ('홈페이지 주소', TEXT),
+        'COEDU_SC_CODE': ('남녀공학 구분', CATEGORY),
+        'ABSCH_YN': ('폐교여부', CATEGORY),
+        'ABSCH_YMD': ('폐교일자', DATE),
+        'CLOSE_YN': ('휴교여부', CATEGORY),
+    },
+
+    # 수업일수 및 수업시수 현황
+    '08': {
+        **_grade_columns('COL_', '{}학년', range(1, 7)),
+        'PER_STUDAY_DAY': ('주당평균수업시수(교사 1인당)', FLOAT),
+        'WEEK_TOT_ITRT_HR_FGR': ('주당수업시수', FLOAT),
+        'ITRT_TCR_TOT_FGR': ('수업교원수', INT),
+        'SCHUL_CRSE_SC_CODE_P': ('학교과정구분(초등)', CATEGORY),
+        **_grade_columns('COL_', '{}학년(초등)', range(1, 7), '_P'),
+        'SCHUL_CRSE_SC_CODE_M': ('학교과정구분(중등)', CATEGORY),
+        **_grade_columns('COL_', '{}학년(중등)', range(1, 4), '_M'),
+        'SCHUL_CRSE_SC_CODE_H': ('학교과정구분(고등)', CATEGORY),
+        **_grade_columns('COL_', '{}학년(고등)', range(1, 4), '_H'),
+    },
+
+    # 자유학기제 운영
+    '04': {
+        'SCHUL_CRSE_SC_CODE': ('학교과정구분코드', CATEGORY),
+        'FREE_SEM_DGST': ('자유학기 요약', TEXT),
+        'FREE_SEM_DETAIL': ('자유학기 상세내용', TEXT),
+    },
+
+    # 학교 현황
+    '62': {
+        **_grade_columns('COL_', '{}학년', range(1, 9)),
+        'COL_SUM': ('학년별 합계', INT),
+        'COL_FGR_SUM': ('전체 합계', INT),
+        'AVG_FGR_SUM': ('평균', FLOAT),
+        'SP_SUM': ('특수학급 합계', INT),
+        'SP_FGR_SUM': ('특수학급 전체 합계', INT),
+    },
+
+    # 성별 학생수
+    '63': {
+        **_grade_columns('COL_M', '{}학년 남학생수', range(1, 9)),
+        'COL_MSUM': ('남학생 총계', INT),
+        **_grade_columns('COL_W', '{}학년 여학생수', range(1, 9)),
+        'COL_WSUM': ('여학생 총계', INT),
+        'SUM': ('전체 학생수', INT),
+    },
+
+    # 학년별·학급별 학생수
+    '09': {
+        **_grade_columns('COL_', '{}학년 학생수', range(1, 9)),
+        'COL_SUM': ('전체 학생수', INT),
+        **_grade_columns('COL_C', '{}학년 학급수', range(1, 9)),
+        'COL_C_SUM': ('전체 학급수', INT),
+        'TEACH_CNT': ('교원수', INT),
+        'TEACH_CAL': ('교원 1인당 학생수', FLOAT),
+    },
+
+    # 전·출입 및 학업중단 학생 수
+    '10': {
+        **{
+            f'COL_2{g}{kind}': (f'초등부{g}학년 {label}', INT)
+            for g in range(1, 7)
+            for kind, label in (('1', '전입학생수'), ('2', '전출학생수'))
+        },
+        'MVIN_SUM': ('전입학생수(계)', INT),
+        'MVT_SUM': ('전출학생수(계)', INT),
+        'STDNT_SUM': ('전체학생수(계)', INT),
+    },
+
+    # 직위별 교원 현황
+    '22': {
+        'COL_1': ('교장', INT),
+        'COL_2': ('교감', INT),
+        'COL_3': ('수석교사', INT),
+        'COL_4': ('보직교사', INT),
+        'COL_5': ('교사', INT),
+        'COL_6': ('특수교사', INT),
+        'COL_7': ('전문상담교사', INT),
+        'COL_8': ('사서교사', INT),
+        'COL_9': ('실기교사', INT),
+        'COL_10': ('보건교사', INT),
+        'COL_11': ('영양교사', INT),
+        'COL_13': ('기간제교사', INT),
+        'COL_14': ('강사', INT),
+        'COL_15': ('기타', INT),
+    },
+
+    # 자격종별 교원 현황
+    '64': {
+        'COL_1': ('정교사(1급)', INT),
+        'COL_2': ('정교사(2급)', INT),
+        'COL_3': ('준교사', INT),
+        'COL_4': ('전문상담교사(1급)', INT),
+        'COL_5': ('전문상담교사(2급)', INT),
+        'COL_6': ('사서교사(1급)', INT),
+        'COL_7': ('사서교사(2급)', INT),
+        'COL_8': ('실기교사', INT),
+        'COL_9': ('보건교사(1급)', INT),
+        'COL_10': ('보건교사(2급)', INT),
+        'COL_11': ('영양교사(1급)', INT),
+        'COL_19': ('영양교사(2급)', INT),
+        'COL_20': ('특수학교(1급)', INT),
+        'COL_21': ('특수학교(2급)', INT),
+    },
+
+    # 표시과목별 교원 현황 (과목 컬럼은 아직 정의되지 않아 원본 이름을 유지)
+    '24': {},
+
+    # 학교폭력 예방교육 실적
+    '94': {
+        'SEM_SC_CODE': ('학기구분코드', CATEGORY),
+        'SEM_SC_NM': ('학기구분명', CATEGORY),
+        'TOT_AVG_TM': ('총 평균시간', FLOAT),
+        'FRL_CURR_ITRT_TM': ('정규교과 시간', FLOAT),
+        'NN_FRL_CURR_ITRT_TM': ('비정규교과 시간', FLOAT),
+        'PTPT_NMPR_FGR1': ('1학기 참여인원', INT),
+        'PTPT_NMPR_FGR2': ('2학기 참여인원', INT),
+        'PTPT_NMPR_PER1': ('1학기 참여율', FLOAT),
+        'PTPT_NMPR_PER2': ('2학기 참여율', FLOAT),
+    },
+
+    # 입학생 현황
+    '51': {
+        'BEAGE_BOY_FGR': ('적정연령 남학생수', INT),
+        'BEAGE_GIR_FGR': ('적정연령 여학생수', INT),
+        'ELPD_ETRC_BOY_FGR': ('조기입학 남학생수', INT),
+        'ELPD_ETRC_GIR_FGR': ('조기입학 여학생수', INT),
+        'HEST_AWA_LTAGE_BOY_FGR': ('취학유예 남학생수', INT),
+        'HEST_AWA_LTAGE_GIR_FGR': ('취학유예 여학생수', INT),
+        'TOT_SUM': ('전체 합계', INT),
+        'TOTAL_1': ('1학기 전체', INT),
+        'TOTAL_2': ('2학기 전체', INT),
+    },
+}
+
+
+def get_schema(api_type):
+    """공통 컬럼과 API 타입별 컬럼을 합친 스키마를 반환합니다."""
+    return {**COMMON_COLUMNS, **SCHEMAS.get(api_type, {})}
+
+
+def _to_numeric(series):
+    """천 단위 구분 쉼표를 제거하고 숫자로 변환합니다. 변환할 수 없는 값은 NaN이 됩니다."""
+    if series.dtype == object or pd.api.types.is_string_dtype(series):
+        series = series.astype(str).str.replace(',', '', regex=False).str.strip()
+    return pd.to_numeric(series, errors='coerce')
+
+
+def convert_column(series, dtype):
+    """컬럼 하나를 스키마 타입으로 한 번에(벡터 연산으로) 변환합니다."""
+    if dtype == INT:
+        numeric = _to_numeric(series)
+        # 소수점 값이 섞여 있으면 정수로 바꾸지 않고 실수로 보관합니다.
+        if not (numeric.dropna() % 1 == 0).all():
+            return numeric.astype(FLOAT)
+        return numeric.astype('Int32' if numeric.isna().any() else INT)
+    if dtype in (FLOAT, COORD):
+        return _to_numeric(series).astype(dtype)
+    if dtype == CATEGORY:
+        return series.astype('category')
+    if dtype == DATE:
+        return pd.to_datetime(series, format='%Y%m%d', errors='coerce')
+    return series
+
+
+def apply_schema(df, api_type):
+    """API 타입 스키마에 맞춰 컬럼 타입을 변환하고 컬럼명을 한글로 바꿉니다."""
+    if df is None or df.empty:
+        return df
+
+    schema = get_schema(api_type)
+    converted = {}
+    for col in df.columns:
+        if col in schema:
+            converted[col] = convert_column(df[col], schema[col][1])
+        else:
+            converted[col] = df[col]  # 스키마에 없는 컬럼은 그대로 유지
+
+    result = pd.DataFrame(converted, index=df.index)
+    return result.rename(columns={col: schema[col][0] for col in df.columns if col in schema})
+
+
+# 스키마 레지스트리 (test_api.py의 스키마 탐색 결과를 버전별 JSON으로 저장)
+SCHEMA_REGISTRY_DIR = os.getenv('SCHEMA_REGISTRY_DIR', 'schema_registry')
+_REGISTRY_FILE_PATTERN = re.compile(r'schema_v(\d+)\.json$')
+
+
+def list_registry_versions(directory=SCHEMA_REGISTRY_DIR):
+    """저장된 레지스트리 (버전, 경로) 목록을 버전 순으로 반환합니다."""
+    versions = []
+    for path in glob.glob(os.path.join(directory, 'schema_v*.json')):
+        match = _REGISTRY_FILE_PATTERN.search(path)
+        if match:
+            versions.append((int(match.group(1)), path))
+    return sorted(versions)
+
+
+def read_registry(directory=SCHEMA_REGISTRY_DIR, version=None):
+    """지정한 버전(없으면 최신) 레지스트리를 읽습니다. 레지스트리가 없으면 None을 반환합니다."""
+    versions = dict(list_registry_versions(directory))
+    if not versions:
+        return None
+    path = versions.get(version) if version is not None else versions[max(versions)]
+    if path is None:
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_registry(api_types, directory=SCHEMA_REGISTRY_DIR):
+    """탐색 결과를 다음 버전 레지스트리 파일로 저장하고 (버전, 경로)를 반환합니다."""
+    versions = list_registry_versions(directory)
+    version = versions[-1][0] + 1 if versions else 1
+    path = os.path.join(directory, f'schema_v{version:04d}.json')
+
+    os.makedirs(directory, exist_ok=True)
+    registry = {
+        'version': version,
+        'createdAt': pd.Timestamp.now(tz='Asia/Seoul').isoformat(timespec='seconds'),
+        'apiTypes': api_types,
+    }
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(registry, f, ensure_ascii=False, indent=2)
+    os.replace(f'{path}.tmp', path)
+    return version, path
+
+
+def _observed_dtype(column):
+    """응답 값에서 추정한 타입. targetDtype이 없는 이전 형식 항목은 dtype이 변환 타입이므로 None"""
+    return column['dtype'] if 'targetDtype' in column else None
+
+
+def diff_registry(old, new):
+    """
+    두 레지스트리의 API 타입별 컬럼 추가/삭제/타입 변경을 비교합니다.
+    타입 변경은 응답 값에서 추정한 타입(dtype)으로 비교합니다. (변환 타입은 코드가 정하므로 바뀌지 않음)
+    """
+    changes = {}
+    old_types = (old or {}).get('apiTypes', {})
+    for api_type, entry in new.get('apiTypes', {}).items():
+        old_columns = old_types.get(api_type, {}).get('columns', {})
+        new_columns = entry.get('columns', {})
+        change = {
+            'added': sorted(set(new_columns) - set(old_columns)),
+            'removed': sorted(set(old_columns) - set(new_columns)),
+            'retyped': sorted(
+                col for col in set(old_columns) & set(new_columns)
+                if None not in (_observed_dtype(old_columns[col]), _observed_dtype(new_columns[col]))
+                and _observed_dtype(old_columns[col]) != _observed_dtype(new_columns[col])
+            ),
+        }
+        if old is not None and any(change.values()):
+            changes[api_type] = change
+    return changes
+
+
+def load_registry(directory=SCHEMA_REGISTRY_DIR):
+    """
+    최신 레지스트리를 읽어 SCHEMAS에 반영하고 버전을 반환합니다.
+    레지스트리가 없으면 코드에 정의된 스키마를 그대로 쓰고 None을 반환합니다.
+    """
+    registry = read_registry(directory)
+    if registry is None:
+        return None
+
+    for api_type, entry in registry.get('apiTypes', {}).items():
+        columns = entry.get('columns', {})
+        if columns:
+            SCHEMAS[api_type] = {
+                name: (column.get('label') or name, column.get('targetDtype', column['dtype']))
+                for name, column in columns.items()
+            }
+    return registry.get('version')
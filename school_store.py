@@ -0,0 +1,314 @@
+import glob
+import json
+import os
+import sqlite3
+import time
+from typing import Callable, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+def normalize_name(name: str) -> str:
+    """검색용으로 학교 이름을 정규화합니다 (공백 제거, 소문자 변환)."""
+    return "".join((name or "").split()).lower()
+
+
+def file_version(path: str):
+    """다른 프로세스가 파일을 교체했는지 비교할 값 (i-node, 수정 시각, 크기). 파일이 없으면 None"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class SnapshotStore:
+    """학교 기본 정보 스냅샷을 SQLite 파일에 저장하고 불러옵니다."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS schools ("
+            "sd_schul_code TEXT PRIMARY KEY, atpt_ofcdc_sc_code TEXT, schul_nm TEXT, payload TEXT NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        return conn
+
+    def save(self, rows: list) -> float:
+        """스냅샷 전체를 하나의 트랜잭션으로 교체하고 동기화 시각을 반환합니다."""
+        synced_at = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM schools")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO schools VALUES (?, ?, ?, ?)",
+                    (
+                        (
+                            row.get("SD_SCHUL_CODE"),
+                            row.get("ATPT_OFCDC_SC_CODE"),
+                            row.get("SCHUL_NM"),
+                            json.dumps(row, ensure_ascii=False),
+                        )
+                        for row in rows
+                    ),
+                )
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('synced_at', ?)", (str(synced_at),))
+        finally:
+            conn.close()
+        return synced_at
+
+    def load(self):
+        """저장된 스냅샷을 (행 목록, 동기화 시각)으로 반환합니다. 없으면 ([], None)을 반환합니다."""
+        if not os.path.exists(self.path):
+            return [], None
+
+        conn = self._connect()
+        try:
+            rows = [json.loads(payload) for (payload,) in conn.execute("SELECT payload FROM schools ORDER BY rowid")]
+            meta = conn.execute("SELECT value FROM meta WHERE key = 'synced_at'").fetchone()
+        finally:
+            conn.close()
+        return rows, float(meta[0]) if meta else None
+
+
+# 공유 스냅샷 (다중 워커용)
+# 검색에 쓰는 응답 형식 레코드와 정규화한 이름, 교육청 코드, 이름순 정렬 순서를 압축하지 않은 Arrow IPC 파일 하나에 저장하고,
+# 이름의 1·2음절 n-gram 역색인(n-gram → 행 번호 목록)은 옆의 색인 파일({path}.grams-{토큰})에 따로 저장합니다.
+# 워커들은 두 파일을 메모리 맵으로 열어 복사 없이 검색하므로 워커 수가 늘어도 스냅샷은 페이지 캐시에 한 벌만 올라갑니다.
+# 갱신은 색인 파일을 먼저 쓰고 스냅샷을 임시 파일로 쓴 뒤 os.replace로 교체합니다. 스냅샷 메타데이터의 토큰으로 짝이 맞는 색인을 찾고,
+# 이미 열어 둔 워커는 이전 파일을 그대로 읽다가 다음에 다시 엽니다.
+
+# 레코드 컬럼과 겹치지 않도록 검색용 컬럼 이름에는 밑줄을 붙입니다.
+_NAME_COLUMN = "_name"
+_OFFICE_COLUMN = "_office"
+_ORDER_COLUMN = "_order"
+_SEARCH_COLUMNS = [_NAME_COLUMN, _OFFICE_COLUMN, _ORDER_COLUMN]
+_SYNCED_AT_KEY = b"synced_at"
+_GRAMS_KEY = b"grams"
+
+# 짝이 바뀐 이전 색인 파일은 이 시간(초)이 지나면 지웁니다. (아직 이전 스냅샷을 여는 중인 워커를 위해 잠시 남겨 둠)
+GRAMS_KEEP_SECONDS = 60
+
+# Windows는 메모리 맵으로 열린 파일을 교체할 수 없으므로 POSIX에서만 메모리 맵을 사용합니다.
+MEMORY_MAP = os.name == "posix"
+
+
+def _gram_key(gram: str) -> int:
+    """1·2음절 n-gram을 정수 하나로 바꿉니다. (첫 글자 코드 << 21 | 둘째 글자 코드, 1-gram은 둘째가 0)"""
+    key = ord(gram[0]) << 21
+    return key | ord(gram[1]) if len(gram) > 1 else key
+
+
+def build_grams(names: list) -> pa.Table:
+    """
+    정규화한 이름 목록의 n-gram 역색인 테이블을 만듭니다.
+    key(n-gram 정수, 오름차순)와 rows(행 번호 목록, 오름차순) 컬럼이므로 list 배열의 offsets / values가 그대로 역색인입니다.
+    한글은 음절 단위로 n-gram을 만들기 때문에 별도 형태소 분석 없이 부분 검색이 됩니다.
+    """
+    postings = {}
+    for row_id, name in enumerate(names):
+        grams = set(name)
+        grams.update(name[i:i + 2] for i in range(len(name) - 1))
+        for gram in grams:
+            postings.setdefault(_gram_key(gram), []).append(row_id)
+    keys = sorted(postings)
+    return pa.table({
+        "key": pa.array(keys, pa.uint64()),
+        "rows": pa.array([postings[key] for key in keys], pa.list_(pa.int32())),
+    })
+
+
+def _single_chunk(column: pa.ChunkedArray) -> pa.Array:
+    """청크가 하나면 복사하지 않고 그대로 꺼냅니다."""
+    return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+
+
+class MappedSchoolIndex:
+    """
+    공유 스냅샷 파일을 연 Arrow 테이블에 대한 학교 이름 검색
+    - 부분 검색: n-gram 역색인으로 후보를 좁힌 뒤 후보 이름만 Arrow 연산으로 실제 포함 여부를 확인합니다.
+    - 접두어 검색: 이름순 정렬 순서(_order)에서 이진 탐색합니다.
+    색인 배열은 파일을 메모리 맵으로 연 그대로 numpy로 읽습니다.
+    검색 결과는 스냅샷 순서의 응답 형식 레코드이며, 반환하는 행만 변환해 워커 안에 보관해 두고 다시 씁니다.
+    """
+
+    def __init__(self, table: pa.Table, grams: Optional[pa.Table] = None):
+        self.table = table
+        self._records = table.drop_columns(_SEARCH_COLUMNS)
+        self._names = _single_chunk(table.column(_NAME_COLUMN))
+        self._offices = _single_chunk(table.column(_OFFICE_COLUMN))
+        self._order = _single_chunk(table.column(_ORDER_COLUMN)).to_numpy()
+        if grams is None:
+            # 짝이 맞는 색인 파일이 없으면(갱신 중 경합 등) 이 워커에서 만듭니다.
+            grams = build_grams(self._names.to_pylist())
+        rows = _single_chunk(grams.column("rows"))
+        self._gram_keys = _single_chunk(grams.column("key")).to_numpy()
+        self._gram_offsets = rows.offsets.to_numpy()
+        self._gram_rows = rows.values.to_numpy()
+        self._converted = [None] * table.num_rows
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def _posting(self, gram: str) -> np.ndarray:
+        key = _gram_key(gram)
+        position = int(np.searchsorted(self._gram_keys, key))
+        if position == len(self._gram_keys) or self._gram_keys[position] != key:
+            return self._gram_rows[:0]
+        return self._gram_rows[self._gram_offsets[position]:self._gram_offsets[position + 1]]
+
+    def _contains(self, query: str) -> np.ndarray:
+        if len(query) == 1:
+            return self._posting(query)
+
+        postings = sorted((self._posting(query[i:i + 2]) for i in range(len(query) - 1)), key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+        if len(query) == 2 or not len(candidates):
+            return candidates
+        matched = pc.match_substring(self._names.take(pa.array(candidates)), query)
+        return candidates[matched.to_numpy(zero_copy_only=False)]
+
+    def _prefix(self, query: str) -> np.ndarray:
+        def bisect(target: str) -> int:
+            lo, hi = 0, len(self._order)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._names[int(self._order[mid])].as_py() < target:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return lo
+
+        return np.sort(self._order[bisect(query):bisect(query + "\uffff")])
+
+    def _to_records(self, row_ids) -> list:
+        converted = self._converted
+        missing = [row_id for row_id in row_ids if converted[row_id] is None]
+        if missing:
+            for row_id, record in zip(missing, self._records.take(pa.array(missing, pa.int64())).to_pylist()):
+                converted[row_id] = record
+        return [converted[row_id] for row_id in row_ids]
+
+    def search(self, query: Optional[str] = None, match: str = "contains", office_codes: Optional[list] = None) -> list:
+        """학교 이름으로 검색합니다. query가 없으면 전체 목록을 반환합니다."""
+        query = normalize_name(query)
+        if not query:
+            row_ids = None
+        elif match == "prefix":
+            row_ids = self._prefix(query)
+        else:
+            row_ids = self._contains(query)
+
+        if office_codes:
+            value_set = pa.array(list(office_codes), pa.string())
+            if row_ids is None:
+                in_offices = pc.is_in(self._offices, value_set=value_set)
+                row_ids = np.flatnonzero(in_offices.to_numpy(zero_copy_only=False))
+            elif len(row_ids):
+                in_offices = pc.is_in(self._offices.take(pa.array(row_ids)), value_set=value_set)
+                row_ids = row_ids[in_offices.to_numpy(zero_copy_only=False)]
+
+        if row_ids is None:
+            row_ids = range(len(self))
+        return self._to_records([int(row_id) for row_id in row_ids])
+
+
+class SharedSnapshot:
+    """여러 워커 프로세스가 함께 읽는 스냅샷 파일 (Arrow IPC)"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def version(self):
+        return file_version(self.path)
+
+    def grams_path(self, token: str) -> str:
+        return f"{self.path}.grams-{token}"
+
+    def save(self, rows: list, to_record: Callable[[dict], dict], synced_at: Optional[float] = None) -> float:
+        """
+        행 목록을 응답 형식 레코드로 바꿔 파일을 원자적으로 교체하고 동기화 시각을 반환합니다.
+        n-gram 색인 파일을 먼저 쓰고, 스냅샷 메타데이터에 그 색인 파일의 토큰을 기록합니다.
+        """
+        synced_at = time.time() if synced_at is None else synced_at
+        names = [normalize_name(row.get("SCHUL_NM", "")) for row in rows]
+        # 워커마다, 저장할 때마다 다른 토큰이므로 동시에 저장해도 서로의 색인 파일을 덮어쓰지 않습니다.
+        token = f"{os.getpid()}-{time.time_ns()}"
+
+        table = pa.Table.from_pylist([to_record(row) for row in rows])
+        table = table.append_column(
+            _NAME_COLUMN, pa.array(names, pa.string())
+        ).append_column(
+            _OFFICE_COLUMN, pa.array([row.get("ATPT_OFCDC_SC_CODE") for row in rows], pa.string())
+        ).append_column(
+            _ORDER_COLUMN, pa.array(sorted(range(len(names)), key=names.__getitem__), pa.int32())
+        )
+        table = table.replace_schema_metadata({
+            _SYNCED_AT_KEY: str(synced_at).encode(),
+            _GRAMS_KEY: token.encode(),
+        })
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 메모리 맵으로 바로 읽을 수 있도록 압축하지 않습니다. 임시 파일 이름은 워커마다 다르게 합니다.
+        _write_ipc(build_grams(names), self.grams_path(token))
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        _write_ipc(table, tmp_path)
+        os.replace(tmp_path, self.path)
+        self._remove_stale_grams(token)
+        return synced_at
+
+    def _remove_stale_grams(self, token: str):
+        """현재 스냅샷과 짝이 아닌 오래된 색인 파일을 지웁니다."""
+        current = self.grams_path(token)
+        for path in glob.glob(f"{glob.escape(self.path)}.grams-*"):
+            try:
+                if path != current and time.time() - os.path.getmtime(path) > GRAMS_KEEP_SECONDS:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def load(self):
+        """파일을 열어 (MappedSchoolIndex, 동기화 시각, 파일 버전)으로 반환합니다. 없으면 (None, None, None)을 반환합니다."""
+        version = self.version()
+        if version is None:
+            return None, None, None
+        table = _read_ipc(self.path)
+        if _ORDER_COLUMN not in table.column_names:
+            # 정렬 순서 컬럼이 없는 이전 형식 파일은 없는 것으로 보고 다시 만들게 합니다.
+            return None, None, None
+        metadata = table.schema.metadata or {}
+        synced_at = float(metadata[_SYNCED_AT_KEY]) if _SYNCED_AT_KEY in metadata else None
+        grams = None
+        if _GRAMS_KEY in metadata:
+            try:
+                grams = _read_ipc(self.grams_path(metadata[_GRAMS_KEY].decode()))
+            except FileNotFoundError:
+                pass
+        return MappedSchoolIndex(table, grams), synced_at, version
+
+
+def _write_ipc(table: pa.Table, path: str):
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _read_ipc(path: str) -> pa.Table:
+    source = pa.memory_map(path, "r") if MEMORY_MAP else pa.OSFile(path, "rb")
+    with source:
+        return pa.ipc.open_file(source).read_all()
@@ -0,0 +1,121 @@
+import io
+import json
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+
+# 응답 직렬화와 Accept 헤더 기반 형식 선택
+# - JSON: orjson이 있으면 사용하고, 없으면 표준 json 모듈을 사용합니다.
+# - MessagePack: msgpack 패키지가 설치된 경우에만 제공합니다. (pip install msgpack)
+# - Arrow IPC 스트림/파일: 목록을 컬럼형 테이블로 보내고 나머지 필드는 스키마 메타데이터에 담습니다.
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_FILE_MEDIA_TYPE = "application/vnd.apache.arrow.file"
+ARROW_MEDIA_TYPES = (ARROW_MEDIA_TYPE, ARROW_FILE_MEDIA_TYPE)
+
+# 클라이언트가 보내는 다른 이름 → 표준 MIME 타입
+MEDIA_TYPE_ALIASES = {
+    "*/*": JSON_MEDIA_TYPE,
+    "application/*": JSON_MEDIA_TYPE,
+    JSON_MEDIA_TYPE: JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE: MSGPACK_MEDIA_TYPE,
+    "application/x-msgpack": MSGPACK_MEDIA_TYPE,
+    "application/vnd.msgpack": MSGPACK_MEDIA_TYPE,
+    ARROW_MEDIA_TYPE: ARROW_MEDIA_TYPE,
+    ARROW_FILE_MEDIA_TYPE: ARROW_FILE_MEDIA_TYPE,
+}
+
+
+def dumps_json(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson으로 직렬화하는 JSON 응답 (orjson이 없으면 표준 json)"""
+
+    def render(self, content) -> bytes:
+        return dumps_json(content)
+
+
+def available_media_types() -> list:
+    media_types = [JSON_MEDIA_TYPE, ARROW_MEDIA_TYPE, ARROW_FILE_MEDIA_TYPE]
+    if msgpack is not None:
+        media_types.append(MSGPACK_MEDIA_TYPE)
+    return media_types
+
+
+def negotiate(accept: Optional[str]) -> Optional[str]:
+    """
+    Accept 헤더에서 제공할 수 있는 형식 중 우선순위(q)가 가장 높은 MIME 타입을 고릅니다.
+    헤더가 없으면 JSON, 제공할 수 있는 형식이 하나도 없으면 None을 반환합니다.
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+
+    candidates = []
+    for order, part in enumerate(accept.split(",")):
+        media_type, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        candidates.append((-quality, order, media_type.strip().lower()))
+
+    for negative_quality, _, media_type in sorted(candidates):
+        if negative_quality >= 0:
+            break
+        resolved = MEDIA_TYPE_ALIASES.get(media_type)
+        if resolved in available_media_types():
+            return resolved
+    return None
+
+
+def to_arrow_ipc(rows: list, columns: dict, metadata: dict, file_format: bool = False) -> bytes:
+    """
+    행 목록을 Arrow IPC 스트림(file_format이 True이면 pa.ipc.open_file로 읽는 파일 형식)으로 직렬화합니다. columns는 {컬럼명: Arrow 타입 이름("string", "double" 등)}이며,
+    목록 외의 응답 필드(totalCount 등)는 스키마 메타데이터 "response"에 JSON으로 담습니다.
+    """
+    import pyarrow as pa
+
+    table = pa.table(
+        {
+            column: pa.array([row.get(column) for row in rows], type=pa.type_for_alias(type_name))
+            for column, type_name in columns.items()
+        },
+        metadata={"response": dumps_json(metadata)}
+    )
+    sink = io.BytesIO()
+    new_writer = pa.ipc.new_file if file_format else pa.ipc.new_stream
+    with new_writer(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def encode(payload: dict, media_type: str, rows_key: str, columns: dict) -> bytes:
+    """payload를 media_type 형식으로 직렬화합니다. Arrow는 payload[rows_key] 목록을 테이블로 만듭니다."""
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(payload, use_bin_type=True)
+    if media_type in ARROW_MEDIA_TYPES:
+        metadata = {key: value for key, value in payload.items() if key != rows_key}
+        return to_arrow_ipc(
+            payload.get(rows_key) or [], columns, metadata, file_format=media_type == ARROW_FILE_MEDIA_TYPE
+        )
+    return dumps_json(payload)
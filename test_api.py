@@ -1,11 +1,12 @@
-import requests
-import json
+import asyncio
+import argparse
+import time
+import httpx
 from dotenv import load_dotenv
 import os
-import urllib3
+import sys
 
-# SSL 경고 메시지 비활성화
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from school_schemas import API_TYPES, FLOAT, INT, TEXT, diff_registry, get_schema, read_registry, write_registry
 
 # .env 파일 로드
 load_dotenv()
@@ -14,49 +15,198 @@ load_dotenv()
 API_KEY = os.getenv('API_KEY')
 BASE_URL = os.getenv('BASE_URL')
 
-# API 타입 정의
-API_TYPES = {
-    '학교기본정보': '0',
-    '수업일수 및 수업시수 현황': '08',
-    '자유학기제 운영': '04',
-    '학교 현황': '62',
-    '성별 학생수': '63',
-    '학년별·학급별 학생수': '09',
-    '전·출입 및 학업중단 학생 수': '10',
-    '직위별 교원 현황': '22',
-    '자격종별 교원 현황': '64',
-    '표시과목별 교원 현황': '24',
-    '학교폭력 예방교육 실적': '94',
-    '입학생 현황': '51'
+# 학교급 코드 정의
+SCHOOL_TYPES = {
+    '초등학교': '02',
+    '중학교': '03',
+    '고등학교': '04'
 }
 
-def test_api(api_type, school_type='02', year='2024'):
-    """각 API의 응답을 테스트하고 컬럼 정보를 출력합니다."""
-    url = f"{BASE_URL}?apiKey={API_KEY}&apiType={api_type}&pbanYr={year}&schulKndCode={school_type}"
-    
+YEARS = [str(year) for year in range(2024, 2019, -1)]
+
+
+class RateLimiter:
+    """초당 요청 수를 제한합니다. 요청 사이 간격을 일정하게 벌립니다."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+            self._next_at = max(now, self._next_at) + self.interval
+
+
+# 추정 타입의 넓이 순서: 정수 < 실수 < 문자열 (두 타입이 섞이면 넓은 쪽으로 봅니다)
+DTYPE_RANK = {INT: 0, FLOAT: 1, TEXT: 2}
+
+
+def value_dtype(value):
+    """응답 값 하나의 타입(int32/float32/str)을 추정합니다. 빈 값은 None입니다."""
+    if value in (None, ''):
+        return None
+    value = str(value).replace(',', '').strip()
+    if not value:
+        return None
+    # 앞자리 0이 있는 숫자(우편번호, 코드 등)는 문자열로 봅니다.
+    if len(value) > 1 and value.startswith('0') and not value.startswith('0.'):
+        return TEXT
     try:
-        response = requests.get(url, verify=False)
-        if response.status_code == 200:
+        number = float(value)
+    except ValueError:
+        return TEXT
+    return INT if number.is_integer() else FLOAT
+
+
+def widen_dtype(current, dtype):
+    """지금까지 본 타입과 새 타입 중 넓은 쪽을 반환합니다. None은 아직 값을 보지 못한 상태입니다."""
+    if current is None:
+        return dtype
+    if dtype is None:
+        return current
+    return max(current, dtype, key=DTYPE_RANK.get)
+
+
+async def probe_api(client, limiter, semaphore, api_type, school_type, year):
+    """API 한 조합을 호출하여 컬럼, 행 수, 응답 시간을 기록합니다."""
+    url = f"{BASE_URL}?apiKey={API_KEY}&apiType={api_type}&pbanYr={year}&schulKndCode={school_type}"
+    result = {'apiType': api_type, 'schoolType': school_type, 'year': year,
+              'status': 'ok', 'rows': 0, 'latencyMs': None, 'dtypes': {}}
+
+    async with semaphore:
+        await limiter.wait()
+        started = time.perf_counter()
+        try:
+            response = await client.get(url)
+            result['latencyMs'] = round((time.perf_counter() - started) * 1000, 1)
+            if response.status_code != 200:
+                result['status'] = f"응답 오류 {response.status_code}"
+                return result
+
             data = response.json()
-            if data.get('resultCode') == 'success' and 'list' in data and data['list']:
-                print(f"\n=== API 타입: {api_type} ===")
-                # 첫 번째 항목의 모든 키를 출력
-                sample_item = data['list'][0]
-                print("\n컬럼 목록:")
-                for key in sample_item.keys():
-                    print(f"'{key}': '',")
+            if data.get('resultCode') == 'success' and data.get('list'):
+                rows = data['list']
+                result['rows'] = len(rows)
+                # 값은 남기지 않고 컬럼별로 지금까지 본 가장 넓은 타입만 갱신합니다.
+                dtypes = result['dtypes']
+                for row in rows:
+                    for key, value in row.items():
+                        dtypes[key] = widen_dtype(dtypes.get(key), value_dtype(value))
             else:
-                print(f"\nAPI 타입 {api_type}: 데이터 없음")
-        else:
-            print(f"\nAPI 타입 {api_type}: 응답 오류 {response.status_code}")
-    except Exception as e:
-        print(f"\nAPI 타입 {api_type}: 오류 발생 - {str(e)}")
+                result['status'] = '데이터 없음'
+        except Exception as e:
+            result['latencyMs'] = round((time.perf_counter() - started) * 1000, 1)
+            result['status'] = f"오류 발생 - {str(e)}"
+    return result
+
+
+def build_registry_entry(api_name, api_type, results):
+    """
+    한 API 타입의 탐색 결과를 레지스트리 항목(컬럼, 타입, 행 수, 응답 시간)으로 정리합니다.
+    dtype은 응답 값에서 추정한 타입이고, targetDtype은 변환할 타입입니다.
+    코드에 정의된 스키마(한글 이름, 타입)가 있으면 그 타입을, 새 컬럼은 추정한 타입을 씁니다.
+    """
+    dtypes = {}
+    for result in results:
+        for key, dtype in result['dtypes'].items():
+            dtypes[key] = widen_dtype(dtypes.get(key), dtype)
+
+    known = get_schema(api_type)
+    columns = {}
+    for key, dtype in dtypes.items():
+        dtype = dtype or TEXT
+        label, target = known.get(key, (None, dtype))
+        columns[key] = {'label': label, 'dtype': dtype, 'targetDtype': target}
+
+    latencies = sorted(r['latencyMs'] for r in results if r['latencyMs'] is not None)
+    return {
+        'name': api_name,
+        'columns': columns,
+        'latencyMs': {
+            'p50': latencies[len(latencies) // 2] if latencies else None,
+            'max': latencies[-1] if latencies else None,
+        },
+        'probes': [{k: v for k, v in r.items() if k != 'dtypes'} for r in results],
+    }
+
+
+async def run_probe(api_types, school_types, years, concurrency, rate):
+    """모든 (API 타입 × 학교급 × 연도) 조합을 동시에 탐색합니다."""
+    limiter = RateLimiter(rate)
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(verify=False, timeout=60) as client:
+        tasks = [
+            probe_api(client, limiter, semaphore, api_type, school_type, year)
+            for api_type in api_types.values()
+            for school_type in school_types
+            for year in years
+        ]
+        results = []
+        for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+            result = await task
+            results.append(result)
+            print(f"[{done}/{len(tasks)}] {result['apiType']} / {result['schoolType']} / {result['year']}: "
+                  f"{result['status']}, {result['rows']}행, {result['latencyMs']}ms")
+
+    return {
+        api_type: build_registry_entry(api_name, api_type, [r for r in results if r['apiType'] == api_type])
+        for api_name, api_type in api_types.items()
+    }
+
 
 def main():
-    print("=== API 응답 테스트 시작 ===")
-    for api_name, api_type in API_TYPES.items():
-        print(f"\n테스트 중: {api_name} ({api_type})")
-        test_api(api_type)
+    parser = argparse.ArgumentParser(description='학교알리미 API 스키마를 동시에 탐색하여 스키마 레지스트리에 기록합니다.')
+    parser.add_argument('--api-types', default=','.join(API_TYPES.values()), help='쉼표로 구분한 API 타입 코드')
+    parser.add_argument('--school-types', default=','.join(SCHOOL_TYPES.values()), help='쉼표로 구분한 학교급 코드')
+    parser.add_argument('--years', default=','.join(YEARS), help='쉼표로 구분한 공시 연도')
+    parser.add_argument('--concurrency', type=int, default=8, help='동시에 보낼 최대 요청 수')
+    parser.add_argument('--rate', type=float, default=5.0, help='초당 최대 요청 수')
+    args = parser.parse_args()
+
+    selected = args.api_types.split(',')
+    api_types = {name: code for name, code in API_TYPES.items() if code in selected}
+
+    print("=== API 스키마 탐색 시작 ===")
+    entries = asyncio.run(run_probe(
+        api_types, args.school_types.split(','), args.years.split(','), args.concurrency, args.rate
+    ))
+
+    # 모든 조합이 실패해 컬럼을 하나도 얻지 못한 API 타입은 스키마가 바뀐 것이 아니라 탐색 실패이므로
+    # 레지스트리와 변경 비교에서 빼고 따로 알립니다.
+    failed = {api_type: entry for api_type, entry in entries.items() if not entry['columns']}
+    entries = {api_type: entry for api_type, entry in entries.items() if entry['columns']}
+
+    # 이번에 탐색하지 않았거나 탐색에 실패한 API 타입은 이전 버전 내용을 그대로 이어받습니다.
+    previous = read_registry()
+    if entries:
+        merged = {**(previous or {}).get('apiTypes', {}), **entries}
+        version, path = write_registry(merged)
+        print(f"\n스키마 레지스트리 저장: v{version} ({path})")
+    else:
+        print("\n탐색에 성공한 API 타입이 없어 스키마 레지스트리를 저장하지 않았습니다.")
+
+    for api_type, entry in entries.items():
+        print(f"  {entry['name']} ({api_type}): 컬럼 {len(entry['columns'])}개, "
+              f"p50 {entry['latencyMs']['p50']}ms, max {entry['latencyMs']['max']}ms")
+
+    if failed:
+        print("\n=== 탐색 실패 (이전 버전 유지) ===")
+        for api_type, entry in failed.items():
+            statuses = sorted({probe['status'] for probe in entry['probes']})
+            print(f"{entry['name']} ({api_type}): {', '.join(statuses)}")
+
+    changes = diff_registry(previous, {'apiTypes': entries})
+    if changes:
+        print("\n=== 스키마 변경 감지 ===")
+        for api_type, change in changes.items():
+            print(f"{api_type}: 추가 {change['added']}, 삭제 {change['removed']}, 타입 변경 {change['retyped']}")
+    elif previous is not None and entries:
+        print("\n이전 버전과 스키마 변경 없음")
+    return 1 if failed else 0
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from geo_index import GeoIndex, haversine_km
+
+
+def brute_force(records, lat, lon, k=None, radius_km=None):
+    """모든 항목까지 거리를 재서 가까운 순서로 자른 정답 (번호, 거리)"""
+    lats = np.array([record['lat'] for record in records])
+    lons = np.array([record['lon'] for record in records])
+    distances = haversine_km(lat, lon, lats, lons)
+    order = np.argsort(distances, kind='stable')
+    if radius_km is not None:
+        order = order[distances[order] <= radius_km]
+    if k is not None:
+        order = order[:k]
+    return [(int(i), float(distances[i])) for i in order]
+
+
+def assert_matches(index, records, lat, lon, k=None, radius_km=None):
+    expected = brute_force(records, lat, lon, k, radius_km)
+    found = [(record['id'], distance) for record, distance in index.nearby(lat, lon, k=k, radius_km=radius_km)]
+    # 같은 거리의 항목은 순서가 다를 수 있으므로 거리는 순서대로, 번호는 집합으로 비교합니다.
+    assert [distance for _, distance in found] == pytest.approx([distance for _, distance in expected])
+    assert {i for i, _ in found} == {i for i, _ in expected}
+
+
+def make_records(lats, lons):
+    return [{'id': i, 'lat': float(lat), 'lon': float(lon)} for i, (lat, lon) in enumerate(zip(lats, lons))]
+
+
+def test_matches_brute_force_for_korean_schools():
+    rng = np.random.default_rng(0)
+    records = make_records(rng.uniform(33, 38.6, 3000), rng.uniform(124.5, 131, 3000))
+    index = GeoIndex(records)
+    for lat, lon in zip(rng.uniform(32, 39.5, 40), rng.uniform(123, 132, 40)):
+        assert_matches(index, records, lat, lon, k=10)
+        assert_matches(index, records, lat, lon, k=10, radius_km=5)
+        assert_matches(index, records, lat, lon, k=None, radius_km=20)
+
+
+def test_matches_brute_force_across_the_antimeridian():
+    rng = np.random.default_rng(1)
+    lons = np.concatenate([rng.uniform(179.5, 180, 200), rng.uniform(-180, -179.5, 200)])
+    records = make_records(rng.uniform(-17, -16, 400), lons)
+    index = GeoIndex(records)
+    for lat, lon in [(-16.5, 179.999), (-16.5, -179.999), (-16.2, 180.0), (-16.9, -179.7)]:
+        assert_matches(index, records, lat, lon, k=5)
+        assert_matches(index, records, lat, lon, k=None, radius_km=30)
+
+
+def test_matches_brute_force_near_the_poles():
+    rng = np.random.default_rng(2)
+    records = make_records(
+        np.concatenate([rng.uniform(89.5, 89.99, 300), rng.uniform(-89.99, -89.5, 300)]),
+        rng.uniform(-180, 180, 600),
+    )
+    index = GeoIndex(records)
+    for lat, lon in [(89.9, 0.0), (89.99, 179.0), (89.6, -90.0), (-89.95, 45.0)]:
+        assert_matches(index, records, lat, lon, k=7)
+        assert_matches(index, records, lat, lon, k=None, radius_km=25)
+
+
+def test_k_larger_than_number_of_points_returns_everything():
+    records = make_records([37.5, 35.1, 33.5], [127.0, 129.0, 126.5])
+    index = GeoIndex(records)
+    assert_matches(index, records, 36.0, 128.0, k=10)
+    assert len(index.nearby(36.0, 128.0, k=10)) == 3
+    assert len(index.nearby(36.0, 128.0, k=10, radius_km=150)) == 1
+
+
+def test_skips_records_without_coordinates():
+    index = GeoIndex([{'lat': '37.5', 'lon': '127.0'}, {'lat': '', 'lon': '127.0'}, {'lat': 0, 'lon': 0}])
+    assert len(index) == 1
+    assert GeoIndex([]).nearby(37.5, 127.0) == []
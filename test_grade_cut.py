@@ -0,0 +1,23 @@
+import pandas as pd
+
+from grade_cut import compute_cut_table, read_admissions_excel
+
+
+def test_blank_admission_type_is_missing_not_nan_group(tmp_path):
+    # 전형명이 빈 칸인 행이 'nan'이라는 전형으로 묶이지 않아야 함
+    path = tmp_path / 'admissions.xlsx'
+    pd.DataFrame({
+        '전형명': ['학생부교과', '학생부교과', None, '학생부종합'],
+        '모집단위': ['국어교육과', '국어교육과', '국어교육과', 101],
+        '등록여부': ['입학자', '입학자', '입학자', '입학자'],
+        '산출등급': [1.5, 2.5, 9.0, 3.0],
+    }).to_excel(path, index=False)
+
+    df = read_admissions_excel(path)
+    assert df['전형명'].isna().sum() == 1
+    assert 'nan' not in set(df['전형명'].dropna())
+    assert df['모집단위'].tolist() == ['국어교육과', '국어교육과', '국어교육과', '101']
+
+    table = compute_cut_table(df)
+    assert sorted(table.index.get_level_values('전형명')) == ['학생부교과', '학생부종합']
+    assert table.loc[('학생부교과', '국어교육과'), 'max'] == 2.5
@@ -0,0 +1,80 @@
+from profile_store import ProfileStore, ProfileTable
+from school_schemas import API_TYPES
+
+BASIC = '학교기본정보'
+HOURS = '수업일수 및 수업시수 현황'
+
+
+def basic_row(code, name, **values):
+    return {'SCHUL_CODE': code, 'SCHUL_NM': name, 'ATPT_OFCDC_ORG_NM': '서울특별시교육청', **values}
+
+
+def hours_row(code, name, **values):
+    return {'SCHUL_CODE': code, 'SCHUL_NM': name, 'ATPT_OFCDC_ORG_NM': '부산광역시교육청', **values}
+
+
+def build():
+    return ProfileTable.build({
+        API_TYPES[BASIC]: [
+            basic_row('A', '가초등학교', LTTUD='37.5', FOND_YMD='19700301'),
+            basic_row('B', '나중학교', LTTUD='', FOND_YMD='', USER_TELNO='02-123-4567'),
+            basic_row('A', '중복된 행', LTTUD='0.0'),
+        ],
+        API_TYPES[HOURS]: [
+            hours_row('A', '다른 이름', COL_1='190', PER_STUDAY_DAY='7.6'),
+            hours_row('C', '다초등학교', COL_1='', PER_STUDAY_DAY='20.1'),
+        ],
+    })
+
+
+def test_join_keeps_one_row_per_school():
+    profiles = build()
+    assert len(profiles) == 3
+    assert 'C' in profiles and 'Z' not in profiles
+    assert profiles.get('Z') is None
+
+
+def test_school_section_prefers_basic_info_and_dataset_values_are_typed():
+    profile = build().get('A')
+    # 학교 식별 정보는 학교기본정보의 처음 행을 사용합니다.
+    assert profile['school']['학교명'] == '가초등학교'
+    assert profile['school']['시도교육청'] == '서울특별시교육청'
+    assert profile['datasets'][BASIC]['위도'] == 37.5
+    assert profile['datasets'][BASIC]['설립일'] == '1970-03-01'
+    assert profile['datasets'][HOURS]['1학년'] == 190
+    assert profile['datasets'][HOURS]['주당평균수업시수(교사 1인당)'] == 7.6
+
+
+def test_missing_dataset_is_null_not_empty_values():
+    profiles = build()
+    basic_only = profiles.get('B')
+    assert basic_only['datasets'][HOURS] is None
+    assert basic_only['datasets'][BASIC]['위도'] is None
+    assert basic_only['datasets'][BASIC]['전화번호'] == '02-123-4567'
+    # 모든 데이터셋 이름이 응답에 들어 있어야 합니다.
+    assert set(basic_only['datasets']) == set(API_TYPES)
+    assert all(basic_only['datasets'][name] is None for name in API_TYPES if name != BASIC)
+
+    hours_only = profiles.get('C')
+    assert hours_only['school']['학교명'] == '다초등학교'
+    assert hours_only['datasets'][BASIC] is None
+    assert hours_only['datasets'][HOURS]['1학년'] is None
+
+
+def test_empty_build_has_no_schools():
+    profiles = ProfileTable.build({})
+    assert len(profiles) == 0
+    assert profiles.get('A') is None
+
+
+def test_store_round_trip(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    assert store.load('2024') == (None, None)
+    store.save('2023', build())
+    store.save('2024', build())
+    assert store.years() == ['2024', '2023']
+
+    loaded, saved_at = store.load('2024')
+    assert saved_at is not None
+    for code in ('A', 'B', 'C'):
+        assert loaded.get(code) == build().get(code)
@@ -0,0 +1,175 @@
+import asyncio
+
+import httpx
+import pytest
+
+import resilience
+from resilience import CircuitBreaker, CircuitOpenError, TokenBucket, UpstreamGuard
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resilience.time, 'monotonic', clock)
+    return clock
+
+
+def make_client(handler):
+    """handler(요청 번호)를 await해 응답을 만드는 httpx 클라이언트"""
+    calls = []
+
+    async def transport(request):
+        calls.append(request)
+        return await handler(len(calls))
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(transport)), calls
+
+
+def test_breaker_opens_then_allows_one_half_open_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=30)
+    breaker.before_request()
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    clock.now += 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_request()
+    # 시험 요청이 진행 중이면 나머지는 거절합니다.
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    assert breaker.rejected == 2
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_request()
+
+
+def test_breaker_failed_trial_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=10)
+    breaker.record_failure()
+    clock.now += 10
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 10
+    breaker.before_request()
+
+
+def test_backoff_is_capped_and_honours_retry_after():
+    guard = UpstreamGuard(TokenBucket(0, 1), CircuitBreaker(0, 0), backoff_base=0.5, backoff_max=2.0)
+    for attempt in range(6):
+        assert 0 <= guard.backoff(attempt, None) <= min(2.0, 0.5 * 2 ** attempt)
+    assert guard.backoff(0, httpx.Response(429, headers={'Retry-After': '1'})) == 1.0
+    assert guard.backoff(0, httpx.Response(429, headers={'Retry-After': '60'})) == 2.0
+
+
+def test_get_retries_retryable_status_then_succeeds():
+    async def handler(call):
+        return httpx.Response(503 if call < 3 else 200)
+
+    async def run():
+        client, calls = make_client(handler)
+        guard = UpstreamGuard(TokenBucket(0, 1), CircuitBreaker(5, 30), max_retries=2, backoff_base=0.001)
+        async with client:
+            response = await guard.get(client, 'http://upstream/')
+        return response, calls, guard
+
+    response, calls, guard = asyncio.run(run())
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert guard.retries == 2
+    assert guard.breaker.failures == 0
+
+
+def test_get_returns_last_retryable_response_and_records_failure():
+    async def handler(call):
+        return httpx.Response(502)
+
+    async def run():
+        client, calls = make_client(handler)
+        guard = UpstreamGuard(TokenBucket(0, 1), CircuitBreaker(5, 30), max_retries=1, backoff_base=0.001)
+        async with client:
+            response = await guard.get(client, 'http://upstream/')
+        return response, calls, guard
+
+    response, calls, guard = asyncio.run(run())
+    assert response.status_code == 502
+    assert len(calls) == 2
+    assert guard.breaker.failures == 1
+
+
+def hedging_guard(limiter):
+    guard = UpstreamGuard(
+        limiter, CircuitBreaker(0, 0), max_retries=0,
+        hedge_percentile=50, hedge_min_delay=0.02, hedge_min_samples=5
+    )
+    # 최근 응답 시간이 모두 0.02초였던 것으로 채워 둡니다.
+    guard._latencies.extend([0.02] * 5)
+    return guard
+
+
+def test_hedge_fires_when_primary_is_slow():
+    async def handler(call):
+        await asyncio.sleep(1.0 if call == 1 else 0.0)
+        return httpx.Response(200, text=str(call))
+
+    async def run():
+        client, calls = make_client(handler)
+        guard = hedging_guard(TokenBucket(0, 1))
+        async with client:
+            response = await guard.get(client, 'http://upstream/')
+        return response, calls, guard
+
+    response, calls, guard = asyncio.run(run())
+    assert response.text == '2'
+    assert len(calls) == 2
+    assert (guard.hedges, guard.hedge_wins) == (1, 1)
+
+
+def test_hedge_is_skipped_when_limiter_has_no_spare_token():
+    async def handler(call):
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, text=str(call))
+
+    async def run():
+        client, calls = make_client(handler)
+        # 토큰이 하나뿐이라 첫 요청이 쓰고 나면 헤지할 토큰이 없습니다.
+        guard = hedging_guard(TokenBucket(1, 1))
+        async with client:
+            response = await guard.get(client, 'http://upstream/')
+        return response, calls, guard
+
+    response, calls, guard = asyncio.run(run())
+    assert response.text == '1'
+    assert len(calls) == 1
+    assert guard.hedges == 0
+
+
+def test_rate_limit_wait_does_not_count_towards_hedge_delay():
+    async def handler(call):
+        return httpx.Response(200)
+
+    async def run():
+        client, calls = make_client(handler)
+        # 초당 20개, 버킷 1개: 두 번째 요청부터 0.05초씩 토큰을 기다립니다. (헤지 대기 0.02초보다 김)
+        guard = hedging_guard(TokenBucket(20, 1))
+        async with client:
+            await asyncio.gather(*(guard.get(client, 'http://upstream/') for _ in range(4)))
+        return calls, guard
+
+    calls, guard = asyncio.run(run())
+    assert len(calls) == 4
+    assert guard.hedges == 0
+    assert guard.rate_limiter.waits == 3
@@ -0,0 +1,131 @@
+import asyncio
+import types
+
+import pytest
+
+import response_cache
+from response_cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """response_cache가 보는 시계만 바꿉니다. (이벤트 루프의 시계는 그대로)"""
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(response_cache, 'time', types.SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+class CountingFetcher:
+    """호출 횟수를 세고, release될 때까지 응답을 미루는 가짜 업스트림"""
+
+    def __init__(self, value='value', error=None):
+        self.value = value
+        self.error = error
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def test_concurrent_misses_share_one_fetch():
+    async def run():
+        cache = ResponseCache(ttl=60, negative_ttl=5, max_entries=10)
+        fetcher = CountingFetcher()
+        waiters = [asyncio.ensure_future(cache.get_or_load('key', fetcher)) for _ in range(10)]
+        await asyncio.sleep(0)
+        fetcher.release.set()
+        values = await asyncio.gather(*waiters)
+        # 저장된 뒤의 조회는 캐시 적중입니다.
+        values.append(await cache.get_or_load('key', fetcher))
+        return cache, fetcher, values
+
+    cache, fetcher, values = asyncio.run(run())
+    assert fetcher.calls == 1
+    assert values == ['value'] * 11
+    assert (cache.misses, cache.coalesced, cache.hits) == (1, 9, 1)
+    assert cache.stats()['inflight'] == 0
+
+
+def test_failed_fetch_is_shared_and_not_cached():
+    async def run():
+        cache = ResponseCache(ttl=60, negative_ttl=5, max_entries=10)
+        fetcher = CountingFetcher(error=RuntimeError('upstream down'))
+        waiters = [asyncio.ensure_future(cache.get_or_load('key', fetcher)) for _ in range(3)]
+        await asyncio.sleep(0)
+        fetcher.release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        return cache, fetcher, results
+
+    cache, fetcher, results = asyncio.run(run())
+    assert fetcher.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(cache) == 0
+
+
+def test_cancelled_waiter_does_not_cancel_shared_fetch():
+    async def run():
+        cache = ResponseCache(ttl=60, negative_ttl=5, max_entries=10)
+        fetcher = CountingFetcher()
+        first = asyncio.ensure_future(cache.get_or_load('key', fetcher))
+        second = asyncio.ensure_future(cache.get_or_load('key', fetcher))
+        await asyncio.sleep(0)
+        first.cancel()
+        fetcher.release.set()
+        return fetcher, await second, cache.get('key')
+
+    fetcher, value, cached = asyncio.run(run())
+    assert fetcher.calls == 1
+    assert value == cached == 'value'
+
+
+def test_negative_results_use_shorter_ttl(clock):
+    async def load(value):
+        return value
+
+    async def run():
+        cache = ResponseCache(ttl=60, negative_ttl=5, max_entries=10)
+        is_negative = lambda value: value == []
+        await cache.get_or_load('empty', lambda: load([]), is_negative)
+        await cache.get_or_load('found', lambda: load(['school']), is_negative)
+        return cache
+
+    cache = asyncio.run(run())
+    clock.now += 5
+    assert cache.get('empty') is None
+    assert cache.get('found') == ['school']
+    clock.now += 55
+    assert cache.get('found') is None
+
+
+def test_lru_evicts_least_recently_used(clock):
+    cache = ResponseCache(ttl=60, negative_ttl=5, max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # a를 최근에 쓴 항목으로
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert len(cache) == 2
+
+
+def test_stale_value_is_kept_for_stale_ttl(clock):
+    cache = ResponseCache(ttl=10, negative_ttl=5, max_entries=10, stale_ttl=30)
+    cache.set('key', 'old')
+    clock.now += 10
+    assert cache.get('key') is None
+    assert cache.get_stale('key') == 'old'
+    clock.now += 30
+    assert cache.get_stale('key') is None
+    assert len(cache) == 0
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ResponseCache(ttl=0, negative_ttl=0, max_entries=10)
+    cache.set('key', 'value')
+    assert cache.get('key') is None
+    assert len(cache) == 0
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from rollups import COUNT_COLUMN, compute_rollup, compute_rollups, filter_rows, summarize
+
+
+def schools():
+    return pd.DataFrame({
+        '시도교육청': pd.Categorical(['서울', '서울', '부산', '부산'], categories=['서울', '부산', '대구']),
+        '설립구분': ['공립', '사립', '공립', '공립'],
+        '연도': [2024, 2024, 2024, 2024],
+        '위도': [37.5, 37.6, 35.1, 35.2],
+        '전체 학생수': pd.array([1000, 100, 300, 0], dtype='int32'),
+        '교원수': pd.array([50, 20, 0, 0], dtype='int32'),
+        '주당수업시수': np.array([18.5, np.nan, np.nan, np.nan], dtype='float32'),
+        '수업교원수': pd.array([10, 0, 0, 0], dtype='int32'),
+    })
+
+
+def row(rollup, **keys):
+    mask = np.ones(len(rollup), dtype=bool)
+    for column, value in keys.items():
+        mask &= (rollup[column] == value).to_numpy()
+    assert mask.sum() == 1
+    return rollup[mask].iloc[0]
+
+
+def test_ratio_is_ratio_of_sums_not_mean_of_ratios():
+    seoul = row(compute_rollup(schools(), '시도교육청'), 시도교육청='서울')
+    # 학교별 비율의 평균은 (20 + 5) / 2 = 12.5 이지만 그룹 합계의 비율은 1100 / 70 입니다.
+    assert seoul['교원 1인당 학생수'] == round(1100 / 70, 2)
+    assert seoul[COUNT_COLUMN] == 2
+    assert seoul['전체 학생수 합계'] == 1100
+    assert seoul['전체 학생수 평균'] == 550
+
+
+def test_zero_denominator_and_all_missing_values_give_nan():
+    busan = row(compute_rollup(schools(), '시도교육청'), 시도교육청='부산')
+    assert np.isnan(busan['교원 1인당 학생수'])
+    assert np.isnan(busan['주당수업시수 합계'])
+    assert np.isnan(busan['수업교원 1인당 주당수업시수'])
+
+
+def test_unobserved_categories_and_excluded_columns_are_dropped():
+    rollup = compute_rollup(schools(), '시도교육청')
+    assert sorted(rollup['시도교육청']) == ['부산', '서울']
+    assert not any(column.startswith(('위도', '연도')) for column in rollup.columns)
+    assert rollup['주당수업시수 합계'].dtype == 'float64'
+
+
+def test_extra_keys_split_groups():
+    df = pd.concat([schools(), schools().assign(연도=2023, **{'전체 학생수': 0})])
+    rollup = compute_rollup(df, '시도교육청', extra_keys=('연도', '학교급'))
+    assert list(rollup.columns[:2]) == ['연도', '시도교육청']
+    assert row(rollup, 연도=2024, 시도교육청='서울')['교원 1인당 학생수'] == round(1100 / 70, 2)
+    assert row(rollup, 연도=2023, 시도교육청='서울')['교원 1인당 학생수'] == 0
+
+
+def test_compute_rollups_skips_missing_levels():
+    rollups = compute_rollups(schools())
+    assert set(rollups) == {'시도교육청', '설립구분'}
+    assert row(rollups['설립구분'], 설립구분='공립')[COUNT_COLUMN] == 3
+
+
+def test_summarize_and_filter_rows():
+    assert summarize(schools()[['위도', '연도']]) is None
+    assert summarize(schools()).loc['count', '전체 학생수'] == 4
+    assert len(filter_rows(schools(), '서울', ['시도교육청', '없는 컬럼'])) == 2
+    assert len(filter_rows(schools(), '', ['시도교육청'])) == 4
@@ -0,0 +1,70 @@
+import json
+
+import pyarrow as pa
+import pytest
+
+import serializers
+from serializers import (
+    ARROW_FILE_MEDIA_TYPE,
+    ARROW_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    encode,
+    negotiate,
+)
+
+
+@pytest.fixture
+def without_msgpack(monkeypatch):
+    monkeypatch.setattr(serializers, 'msgpack', None)
+
+
+@pytest.mark.parametrize('accept', [None, '', '*/*', 'application/*', 'text/html, */*;q=0.1'])
+def test_missing_or_wildcard_accept_means_json(accept):
+    assert negotiate(accept) == JSON_MEDIA_TYPE
+
+
+def test_highest_quality_wins_and_ties_keep_header_order():
+    assert negotiate('application/json;q=0.5, application/vnd.apache.arrow.stream') == ARROW_MEDIA_TYPE
+    assert negotiate('application/vnd.apache.arrow.file, application/json') == ARROW_FILE_MEDIA_TYPE
+    assert negotiate('Application/JSON ; q=0.9, application/vnd.apache.arrow.file;q=0.8') == JSON_MEDIA_TYPE
+
+
+def test_q_zero_and_unknown_types_are_not_acceptable():
+    assert negotiate('application/json;q=0') is None
+    assert negotiate('text/html, application/xml') is None
+    assert negotiate('application/json;q=abc') is None
+    assert negotiate('application/json;q=0, */*') == JSON_MEDIA_TYPE
+
+
+def test_msgpack_aliases_resolve_when_installed(monkeypatch):
+    monkeypatch.setattr(serializers, 'msgpack', object())
+    for accept in ('application/msgpack', 'application/x-msgpack', 'application/vnd.msgpack'):
+        assert negotiate(accept) == MSGPACK_MEDIA_TYPE
+
+
+def test_msgpack_falls_back_to_next_choice_when_not_installed(without_msgpack):
+    assert MSGPACK_MEDIA_TYPE not in serializers.available_media_types()
+    assert negotiate('application/msgpack, application/json;q=0.5') == JSON_MEDIA_TYPE
+    # 대체할 형식이 없으면 406으로 응답하도록 None을 반환합니다.
+    assert negotiate('application/x-msgpack') is None
+
+
+def test_msgpack_round_trip():
+    msgpack = pytest.importorskip('msgpack')
+    payload = {'totalCount': 1, 'schools': [{'name': '서울고등학교', 'lat': 37.5}]}
+    assert msgpack.unpackb(encode(payload, MSGPACK_MEDIA_TYPE, 'schools', {}), raw=False) == payload
+
+
+@pytest.mark.parametrize('media_type', [ARROW_MEDIA_TYPE, ARROW_FILE_MEDIA_TYPE])
+def test_arrow_keeps_rows_as_columns_and_other_fields_as_metadata(media_type):
+    payload = {'totalCount': 2, 'schools': [{'name': '가', 'lat': 37.5}, {'name': '나', 'lat': None}]}
+    body = encode(payload, media_type, 'schools', {'name': 'string', 'lat': 'double'})
+    reader = pa.ipc.open_file(body) if media_type == ARROW_FILE_MEDIA_TYPE else pa.ipc.open_stream(body)
+    table = reader.read_all()
+    assert table.to_pylist() == payload['schools']
+    assert json.loads(table.schema.metadata[b'response']) == {'totalCount': 2}
+
+
+def test_json_encoding_keeps_korean_text():
+    assert json.loads(encode({'name': '서울고등학교'}, JSON_MEDIA_TYPE, 'schools', {})) == {'name': '서울고등학교'}
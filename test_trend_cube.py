@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+from trend_cube import (
+    COUNT_COLUMN,
+    DELTA_SUFFIX,
+    RATE_SUFFIX,
+    SCHOOL_KEY,
+    YEAR_COLUMN,
+    TrendCube,
+    region_trend,
+    school_trend,
+    year_over_year,
+)
+
+
+def values(rows):
+    """[(학교코드, 연도, 학생수)] → (학교코드, 연도) 색인의 값 표"""
+    df = pd.DataFrame(rows, columns=[SCHOOL_KEY, YEAR_COLUMN, '학생수'])
+    return df.set_index([SCHOOL_KEY, YEAR_COLUMN])
+
+
+def test_delta_against_previous_year():
+    result = year_over_year(values([('A', 2021, 100), ('A', 2022, 120), ('A', 2023, 90)]), SCHOOL_KEY)
+    assert np.isnan(result.loc[('A', 2021), '학생수' + DELTA_SUFFIX])
+    assert result.loc[('A', 2022), '학생수' + DELTA_SUFFIX] == 20
+    assert result.loc[('A', 2022), '학생수' + RATE_SUFFIX] == 20.0
+    assert result.loc[('A', 2023), '학생수' + DELTA_SUFFIX] == -30
+    assert result.loc[('A', 2023), '학생수' + RATE_SUFFIX] == -25.0
+
+
+def test_missing_year_gives_no_delta_instead_of_two_year_delta():
+    # 2022년이 통째로 없으면 2023년의 전년 값도 없습니다. (2021년과 비교하지 않음)
+    result = year_over_year(values([('A', 2021, 100), ('A', 2023, 150)]), SCHOOL_KEY)
+    assert list(result.index) == [('A', 2021), ('A', 2023)]
+    assert result.loc[('A', 2023), '학생수'] == 150
+    assert np.isnan(result.loc[('A', 2023), '학생수' + DELTA_SUFFIX])
+    assert np.isnan(result.loc[('A', 2023), '학생수' + RATE_SUFFIX])
+
+
+def test_school_missing_from_one_year_does_not_borrow_other_schools():
+    result = year_over_year(values([
+        ('A', 2021, 100), ('A', 2022, 110), ('A', 2023, 120),
+        ('B', 2021, 50), ('B', 2023, 70),
+    ]), SCHOOL_KEY)
+    assert len(result) == 5
+    assert np.isnan(result.loc[('B', 2023), '학생수' + DELTA_SUFFIX])
+    assert result.loc[('A', 2023), '학생수' + DELTA_SUFFIX] == 10
+
+
+def test_zero_or_missing_previous_value_has_no_rate():
+    result = year_over_year(values([('A', 2021, 0), ('A', 2022, 10), ('A', 2023, None), ('A', 2024, 5)]), SCHOOL_KEY)
+    assert result.loc[('A', 2022), '학생수' + DELTA_SUFFIX] == 10
+    assert np.isnan(result.loc[('A', 2022), '학생수' + RATE_SUFFIX])
+    assert np.isnan(result.loc[('A', 2024), '학생수' + DELTA_SUFFIX])
+
+
+def test_school_trend_sums_duplicates_and_uses_latest_labels():
+    df = pd.DataFrame({
+        SCHOOL_KEY: ['A', 'A', 'A', 'B'],
+        YEAR_COLUMN: [2022, 2023, 2023, 2023],
+        '학교명': ['옛 이름', '새 이름', '새 이름', '나학교'],
+        '학생수': [100, 60, 50, 30],
+    })
+    result = school_trend(df, ['학생수'], labels=('학교명', '없는 컬럼'))
+    assert list(result.columns[:3]) == [SCHOOL_KEY, '학교명', YEAR_COLUMN]
+    latest = result[(result[SCHOOL_KEY] == 'A') & (result[YEAR_COLUMN] == 2023)].iloc[0]
+    assert (latest['학교명'], latest['학생수'], latest['학생수' + DELTA_SUFFIX]) == ('새 이름', 110, 10)
+
+
+def test_region_trend_counts_schools_across_missing_year():
+    df = pd.DataFrame({
+        '시도교육청': ['서울', '서울', '서울', '부산'],
+        YEAR_COLUMN: [2021, 2021, 2023, 2022],
+        '학생수': [10, 20, 40, 5],
+    })
+    result = region_trend(df, '시도교육청', ['학생수']).set_index(['시도교육청', YEAR_COLUMN])
+    assert result.loc[('서울', 2021), COUNT_COLUMN] == 2
+    assert np.isnan(result.loc[('서울', 2023), COUNT_COLUMN + DELTA_SUFFIX])
+    assert np.isnan(result.loc[('서울', 2023), '학생수' + DELTA_SUFFIX])
+    assert len(result) == 3
+
+
+def test_cube_downloads_only_missing_partitions(tmp_path):
+    cube = TrendCube(str(tmp_path), current_year_ttl=3600)
+    calls = []
+
+    def download(api_type, school_type, year):
+        calls.append((school_type, year))
+        return pd.DataFrame({'SCHUL_CODE': ['A', 'B'], 'COL_1': ['10', str(year)], 'COL_2': ['1', '2']})
+
+    results = cube.update('08', ['02'], [2021, 2022], download)
+    assert sorted(result['상태'] for result in results) == ['완료', '완료']
+    assert cube.update('08', ['02'], [2021, 2022, 2023], download) and calls[-1] == ('02', 2023)
+    assert len(calls) == 3
+
+    df = cube.read('08', ['02'], [2021, 2022, 2023, 2024], columns=['1학년', YEAR_COLUMN])
+    assert set(df.columns) == {'1학년', YEAR_COLUMN, '학교급코드'}
+    assert sorted(df[YEAR_COLUMN].unique()) == [2021, 2022, 2023]
+    assert df['1학년'].max() == 2023
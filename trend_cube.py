@@ -0,0 +1,180 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from school_schemas import apply_schema, get_schema
+
+# 다년도 추세 큐브
+# 데이터셋(apiType)마다 공시 연도 × 학교급 파티션을 원본 그대로 Parquet 파일로 쌓아 둡니다.
+#   {directory}/{apiType}/pbanYr={연도}/schulKndCode={학교급코드}.parquet
+# 지난 연도 공시는 바뀌지 않으므로 한 번 받은 파티션은 다시 받지 않고(추가 전용), 올해 파티션만 TTL이 지나면 갱신합니다.
+# 추세는 필요한 컬럼만 읽어 (학교 또는 지역 × 연도 × 항목) 배열을 만들고 전년 대비 증감을 한 번에 계산합니다.
+
+YEAR_COLUMN = '연도'
+SCHOOL_TYPE_COLUMN = '학교급코드'
+SCHOOL_KEY = '정보공시 학교코드'
+COUNT_COLUMN = '학교 수'
+
+# 전년 대비 컬럼 이름 접미사
+DELTA_SUFFIX = ' 증감'
+RATE_SUFFIX = ' 증감률(%)'
+
+
+class TrendCube:
+    """데이터셋별 공시 연도 파티션 저장소"""
+
+    def __init__(self, directory: str, current_year_ttl: int):
+        self.directory = directory
+        self.current_year_ttl = current_year_ttl
+
+    def path(self, api_type: str, school_type: str, year) -> str:
+        return os.path.join(self.directory, api_type, f"pbanYr={year}", f"schulKndCode={school_type}.parquet")
+
+    def is_fresh(self, year, saved_at: float) -> bool:
+        """지난 연도 파티션은 항상 유효하고, 올해 파티션은 current_year_ttl 동안만 유효합니다."""
+        if int(year) < datetime.now().year:
+            return True
+        return time.time() - saved_at < self.current_year_ttl
+
+    def has_fresh(self, api_type: str, school_type: str, year) -> bool:
+        path = self.path(api_type, school_type, year)
+        return os.path.exists(path) and self.is_fresh(year, os.path.getmtime(path))
+
+    def stale_partitions(self, api_type: str, school_types, years) -> list:
+        """새로 받아야 하는 (연도, 학교급코드) 목록 (파일이 없거나 TTL이 지난 올해 파티션)"""
+        return [
+            (year, school_type)
+            for year in years
+            for school_type in school_types
+            if not self.has_fresh(api_type, school_type, year)
+        ]
+
+    def write(self, api_type: str, school_type: str, year, raw_df: pd.DataFrame) -> None:
+        """파티션 하나를 저장합니다. 쓰는 도중 읽히지 않도록 임시 파일을 교체합니다."""
+        path = self.path(api_type, school_type, year)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        raw_df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def update(self, api_type: str, school_types, years, download, max_workers=8, refresh=False, on_progress=None) -> list:
+        """
+        받아야 하는 파티션만 download(api_type, school_type, year)로 받아 저장합니다.
+        refresh가 True이면 모든 파티션을 다시 받습니다. 파티션별 결과 목록을 반환합니다.
+        download는 실패 시 RuntimeError를 발생시켜야 합니다.
+        """
+        jobs = (
+            [(year, school_type) for year in years for school_type in school_types]
+            if refresh else self.stale_partitions(api_type, school_types, years)
+        )
+        results = []
+        if not jobs:
+            return results
+
+        def fetch(year, school_type):
+            raw_df = download(api_type, school_type, year)
+            self.write(api_type, school_type, year, raw_df)
+            return len(raw_df)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(fetch, year, school_type): (year, school_type) for year, school_type in jobs}
+            for future in as_completed(futures):
+                year, school_type = futures[future]
+                result = {YEAR_COLUMN: year, SCHOOL_TYPE_COLUMN: school_type, '상태': '완료', '건수': 0}
+                try:
+                    result['건수'] = future.result()
+                except (RuntimeError, OSError) as e:
+                    result['상태'] = f"실패: {str(e)}"
+                results.append(result)
+                if on_progress is not None:
+                    on_progress(len(results), len(jobs), result)
+        return results
+
+    def read(self, api_type: str, school_types, years, columns=None) -> pd.DataFrame:
+        """
+        저장된 파티션을 하나의 데이터프레임으로 읽고 스키마 타입과 한글 컬럼명으로 변환합니다.
+        columns(한글 컬럼명)를 주면 그 컬럼만 파일에서 읽습니다. '연도', '학교급코드' 컬럼이 붙습니다.
+        """
+        raw_columns = None
+        if columns is not None:
+            names = {name: column for column, (name, _) in get_schema(api_type).items()}
+            raw_columns = {names.get(column, column) for column in columns}
+
+        frames = []
+        for year in years:
+            for school_type in school_types:
+                path = self.path(api_type, school_type, year)
+                if not os.path.exists(path):
+                    continue
+                if raw_columns is None:
+                    df = pd.read_parquet(path)
+                else:
+                    # 연도마다 공시 항목이 다를 수 있으므로 파일에 있는 컬럼만 읽습니다.
+                    available = [column for column in pq.read_schema(path).names if column in raw_columns]
+                    df = pd.read_parquet(path, columns=available)
+                frames.append(df.assign(**{YEAR_COLUMN: int(year), SCHOOL_TYPE_COLUMN: school_type}))
+
+        if not frames:
+            return pd.DataFrame()
+        # 원본을 먼저 합친 뒤 스키마 변환은 한 번만 합니다.
+        return apply_schema(pd.concat(frames, ignore_index=True), api_type)
+
+
+def year_over_year(values: pd.DataFrame, key: str) -> pd.DataFrame:
+    """
+    (key, 연도) 색인의 항목 값 표에 전년 대비 증감과 증감률 컬럼을 붙여 반환합니다.
+    연도 축은 처음~마지막 연도를 빠짐없이 채워 계산하므로 전년 자료가 없는 해의 증감은 결측입니다.
+    """
+    metrics = list(values.columns)
+    keys = values.index.get_level_values(key).unique()
+    present_years = values.index.get_level_values(YEAR_COLUMN).unique()
+    years = list(range(int(present_years.min()), int(present_years.max()) + 1)) if len(present_years) else []
+
+    # (key × 항목 × 연도) 배열: 연도 축으로 한 칸 밀어 빼면 전년 대비 증감입니다.
+    full_index = pd.MultiIndex.from_product([keys, years], names=[key, YEAR_COLUMN])
+    cube = values.reindex(full_index).to_numpy(dtype='float64').reshape(len(keys), len(years), len(metrics))
+    delta = np.full_like(cube, np.nan)
+    delta[:, 1:, :] = cube[:, 1:, :] - cube[:, :-1, :]
+    rate = np.full_like(cube, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        previous = cube[:, :-1, :]
+        rate[:, 1:, :] = np.where(previous != 0, delta[:, 1:, :] / previous * 100, np.nan)
+
+    flat = lambda array: array.reshape(len(keys) * len(years), len(metrics))
+    parts = {}
+    for position, metric in enumerate(metrics):
+        parts[metric] = flat(cube)[:, position]
+        parts[metric + DELTA_SUFFIX] = flat(delta)[:, position]
+        parts[metric + RATE_SUFFIX] = np.round(flat(rate)[:, position], 2)
+    result = pd.DataFrame(parts, index=full_index)
+    # 채워 넣은 (key, 연도) 중 원래 없던 행은 빼고 돌려줍니다.
+    return result[result.index.isin(values.index)]
+
+
+def school_trend(df: pd.DataFrame, metrics: list, labels=()) -> pd.DataFrame:
+    """학교별 연도별 항목 값과 전년 대비 증감. labels(학교명 등)는 가장 최근 연도 값으로 붙입니다."""
+    # 한 해에 같은 학교가 여러 번 나오면(학교급 중복 공시 등) 합산합니다.
+    values = df.groupby([SCHOOL_KEY, YEAR_COLUMN], observed=True)[metrics].sum(min_count=1)
+    result = year_over_year(values, SCHOOL_KEY).reset_index()
+    labels = [label for label in labels if label in df]
+    if labels:
+        latest = df.sort_values(YEAR_COLUMN).drop_duplicates(SCHOOL_KEY, keep='last').set_index(SCHOOL_KEY)[labels]
+        result = result.join(latest, on=SCHOOL_KEY)
+        result = result[[SCHOOL_KEY] + labels + [col for col in result.columns if col not in labels and col != SCHOOL_KEY]]
+    return result
+
+
+def region_trend(df: pd.DataFrame, level: str, metrics: list) -> pd.DataFrame:
+    """level(시도교육청 등)별 연도별 학교 수·항목 합계와 전년 대비 증감"""
+    grouped = df.groupby([level, YEAR_COLUMN], observed=True)
+    values = pd.concat([
+        grouped.size().rename(COUNT_COLUMN).astype('float64'),
+        grouped[metrics].sum(min_count=1).astype('float64'),
+    ], axis=1)
+    return year_over_year(values, level).reset_index()